@@ -0,0 +1,63 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Time and memory of arn string parsing: ARN objects, parse_arn and parse_arns.
+
+Usage: PYTHONPATH=. python benchmarks/bench_arn_parser.py [--count 200000] [--repeat 3]
+"""
+import argparse
+import timeit
+import tracemalloc
+
+from skew.arn import ARN
+from skew.arn.parser import parse_arn, parse_arns
+
+
+def _arns(count):
+    """Return instance, role and topic arns of 10 accounts."""
+    arns = []
+    for i in range(count):
+        account = "1234567890%02d" % (i % 10)
+        kind = i % 4
+        if kind < 2:
+            arns.append("arn:aws:ec2:us-east-1:%s:instance/i-%017x" % (account, i))
+        elif kind == 2:
+            arns.append("arn:aws:iam::%s:role/service-role/role-%d" % (account, i))
+        else:
+            arns.append("arn:aws:sns:eu-west-1:%s:topic-%d" % (account, i))
+    return arns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    arns = _arns(args.count)
+    runs = (
+        ("ARN", lambda: [ARN(arn) for arn in arns]),
+        ("parse_arn", lambda: [parse_arn(arn) for arn in arns]),
+        ("parse_arns", lambda: parse_arns(arns)),
+    )
+    for name, run in runs:
+        best = min(timeit.repeat(stmt=run, number=1, repeat=args.repeat))
+        tracemalloc.start()
+        result = run()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del result
+        print("%-10s %8.1f ms %8.1f MB" % (name, best * 1000, memory / 2 ** 20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Session and client creation, with and without the shared botocore loader.
+
+Usage: PYTHONPATH=. python benchmarks/bench_client_creation.py [--count 50] [--service ec2]
+"""
+import argparse
+import time
+
+import boto3
+
+from skew.boto.utility import get_session
+
+CREDENTIALS = {"aws_access_key_id": "AKIDEXAMPLE", "aws_secret_access_key": "secret"}
+
+
+def _legacy_session(region_name):
+    """Previous implementation: each session has its own loader."""
+    return boto3.Session(region_name=region_name, **CREDENTIALS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--service", default="ec2")
+    args = parser.parse_args()
+
+    for name, factory in (
+        ("legacy", _legacy_session),
+        ("shared", lambda region_name: get_session(region_name=region_name, aws_creds=CREDENTIALS)),
+    ):
+        start = time.process_time()
+        for _ in range(args.count):
+            factory("us-east-1").client(args.service)
+        elapsed = time.process_time() - start
+        print("%-8s %8.2f ms cpu per session and %s client" % (name, elapsed * 1000 / args.count, args.service))
+
+
+if __name__ == "__main__":
+    main()
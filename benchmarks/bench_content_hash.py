@@ -0,0 +1,54 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Dump and content hash of EC2 and IAM resources, in one or two passes.
+
+Usage: PYTHONPATH=. python benchmarks/bench_content_hash.py [--count 2000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from benchmarks.payloads import ec2_instances, iam_roles
+from skew.resources.json_dump import content_hash, json_dump, json_dump_hash
+
+
+def _two_passes(items):
+    for item in items:
+        json_dump(item, serializer="json")
+        content_hash(item, volatile=["LaunchTime"])
+
+
+def _one_pass(items):
+    for item in items:
+        json_dump_hash(item, serializer="json", volatile=["LaunchTime"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, factory in (("ec2 instances", ec2_instances), ("iam roles", iam_roles)):
+        items = factory(args.count)
+        runs = (
+            ("dump only", lambda: [json_dump(item, serializer="json") for item in items]),
+            ("two passes", lambda: _two_passes(items)),
+            ("one pass", lambda: _one_pass(items)),
+        )
+        for name, run in runs:
+            best = min(timeit.repeat(stmt=run, number=1, repeat=args.repeat))
+            print("%-14s %-10s %8.1f ms" % (label, name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Memory and blast radius time of a relation graph, arrays against dict of lists.
+
+Usage: PYTHONPATH=. python benchmarks/bench_graph.py [--instances 200000]
+"""
+import argparse
+import time
+import tracemalloc
+from collections import deque
+
+from skew.graph import RelationGraph
+
+PREFIX = "arn:aws:ec2:us-east-1:123456789012:"
+
+
+def _nodes(instances):
+    """Yield (arn, type, id, relations): vpcs, subnets, security groups, instances with 5 relations each."""
+    vpcs, subnets, groups = max(instances // 10000, 1), max(instances // 1000, 1), max(instances // 500, 1)
+    for i in range(vpcs):
+        yield f"{PREFIX}vpc/vpc-{i}", "vpc", f"vpc-{i}", []
+    for i in range(subnets):
+        yield f"{PREFIX}subnet/subnet-{i}", "subnet", f"subnet-{i}", [("ec2", "vpc", f"vpc-{i % vpcs}")]
+    for i in range(groups):
+        yield f"{PREFIX}security-group/sg-{i}", "security-group", f"sg-{i}", [("ec2", "vpc", f"vpc-{i % vpcs}")]
+    for i in range(instances):
+        relations = [
+            ("ec2", "vpc", f"vpc-{i % vpcs}"),
+            ("ec2", "subnet", f"subnet-{i % subnets}"),
+            ("ec2", "security-group", f"sg-{i % groups}"),
+            ("ec2", "security-group", f"sg-{(i + 1) % groups}"),
+            ("ec2", "image", "ami-unknown"),
+        ]
+        yield f"{PREFIX}instance/i-{i}", "instance", f"i-{i}", relations
+
+
+def _dict_graph(nodes):
+    """Return outgoing and incoming arns of each arn."""
+    ids, outgoing, incoming = {}, {}, {}
+    for arn, resource_type, identifier, relations in nodes:
+        ids[(resource_type, identifier)] = arn
+        outgoing[arn] = relations
+    for arn, relations in outgoing.items():
+        targets = []
+        for _, resource_type, identifier in relations:
+            target = ids.get((resource_type, identifier))
+            if target is not None:
+                targets.append(target)
+                incoming.setdefault(target, []).append(arn)
+        outgoing[arn] = targets
+    return outgoing, incoming
+
+
+def _dict_reachable(graph, arn):
+    incoming = graph[1]
+    visited, queue = {arn}, deque([arn])
+    while queue:
+        for source in incoming.get(queue.popleft(), ()):
+            if source not in visited:
+                visited.add(source)
+                queue.append(source)
+    return len(visited) - 1
+
+
+def _array_graph(nodes):
+    graph = RelationGraph()
+    for arn, resource_type, identifier, relations in nodes:
+        graph.add_node(arn, "ec2", resource_type, identifier, relations)
+    graph.build()
+    return graph
+
+
+def _measure(label, build, query):
+    start = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - start
+    del graph
+    tracemalloc.start()
+    graph = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    reached = query(graph)
+    print(
+        "%-14s build %8.0f ms  memory %7.1f MB  blast radius %6.1f ms (%d resources)"
+        % (label, elapsed * 1000, memory / 2 ** 20, (time.perf_counter() - start) * 1000, reached)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=200000)
+    args = parser.parse_args()
+
+    vpc = f"{PREFIX}vpc/vpc-0"
+    # node arns are kept by both graphs, they are not measured
+    nodes = list(_nodes(args.instances))
+    _measure("dict of lists", lambda: _dict_graph(nodes), lambda graph: _dict_reachable(graph, vpc))
+    _measure("arrays", lambda: _array_graph(nodes), lambda graph: len(graph.reachable(vpc)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Startup time of ``import skew``, ``skew --help`` and the first scan import.
+
+Each statement runs in a fresh interpreter, the baseline is an empty one.
+
+Usage: PYTHONPATH=. python benchmarks/bench_import.py [--repeat 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+STATEMENTS = (
+    ("python", "pass"),
+    ("import skew", "import skew"),
+    ("skew --help", "import sys; sys.argv = ['skew', '--help']; from skew.cli import main; main()"),
+    ("import skew.arn", "import skew.arn"),
+)
+
+
+def _run(statement: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", statement],
+        check=False,
+        stdout=subprocess.DEVNULL,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, statement in STATEMENTS:
+        best = min(_run(statement) for _ in range(args.repeat))
+        print("%-16s %8.1f ms" % (label, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
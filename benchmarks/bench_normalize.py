@@ -0,0 +1,68 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Key normalization of json_dump on large EC2 and IAM payloads.
+
+Usage: PYTHONPATH=. python benchmarks/bench_normalize.py [--count 2000] [--repeat 5]
+"""
+import argparse
+import re
+import timeit
+
+from benchmarks.payloads import ec2_instances, iam_roles
+from skew.resources.json_dump import _normalize
+
+_pattern_1 = re.compile("(.)([A-Z][a-z]+)")
+_pattern_2 = re.compile("([a-z0-9])([A-Z])")
+
+
+def _legacy_camel_to_snake(name):
+    name = _pattern_1.sub(r"\1_\2", name)
+    return _pattern_2.sub(r"\1_\2", name).lower()
+
+
+def _legacy_normalize(data):
+    """Previous implementation: two regex per key, recursive, lists modified in place."""
+    new_data = dict(map(lambda item: (_legacy_camel_to_snake(item[0]), item[1]), data.items()))
+    for key, value in new_data.items():
+        if isinstance(value, dict):
+            new_data[key] = _legacy_normalize(value)
+        if isinstance(value, list):
+            for i in range(len(value)):
+                if isinstance(value[i], dict):
+                    value[i] = _legacy_normalize(value[i])
+    return new_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, factory in (("ec2 instances", ec2_instances), ("iam roles", iam_roles)):
+        payload = {"Items": factory(args.count)}
+        for name, normalize in (("legacy", _legacy_normalize), ("normalize", _normalize)):
+            # legacy modifies its input, give it a fresh payload each time
+            best = min(
+                timeit.repeat(
+                    stmt=lambda: normalize(payload),
+                    setup=lambda: payload.update(Items=factory(args.count)),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print("%-14s %-10s %8.1f ms" % (label, name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
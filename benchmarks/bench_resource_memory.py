@@ -0,0 +1,92 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Memory used by resource objects.
+
+Usage: PYTHONPATH=. python benchmarks/bench_resource_memory.py [--count 1000000]
+
+Data dictionaries are shared by all objects, so only the resource object
+overhead is measured, with the attributes built by ``ec2.Instance``.  The per instance cloudwatch client of the previous
+layout is not built (it was a whole boto3 client), so the real gain is larger.
+"""
+import argparse
+import gc
+import tracemalloc
+
+from skew.resources.aws.ec2 import Instance
+from skew.resources.compact import CompactResource
+
+
+class FakeClient(object):
+    service_name = "ec2"
+    region_name = "us-east-1"
+    account_id = "123456789012"
+
+
+class DictResource(object):
+    """Previous layout: a __dict__ with a cloudwatch client per instance."""
+
+    def __init__(self, client, data, query=None):
+        self._client = client
+        self._data = data
+        self._id = data["InstanceId"]
+        self._metrics = None
+        self._name = None
+        self._date = None
+        self._arn = None
+        # ec2.Instance reads its tags when it is built
+        self._tags = {}
+        self._cloudwatch = object()
+        self._query = query
+        self._fields = None
+        self.filtered_data = None
+        self._extra_attribute_loaded = False
+        self._hydrated = False
+
+
+def measure(label, count, factory):
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("%-16s %8.1f MB %6.1f bytes/resource" % (label, current / 2 ** 20, current / count))
+    del objects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000000)
+    count = parser.parse_args().count
+
+    client = FakeClient()
+    data = {"InstanceId": "i-0123456789abcdef0"}
+    print("%d resources" % count)
+    measure("dict resource", count, lambda i: DictResource(client, data))
+    measure("slotted resource", count, lambda i: Instance(client, data))
+    measure(
+        "compact resource",
+        count,
+        lambda i: CompactResource(
+            "arn:aws:ec2:us-east-1:123456789012:instance/i-0123456789abcdef0",
+            "ec2",
+            "us-east-1",
+            "123456789012",
+            "instance",
+            "i-0123456789abcdef0",
+            data=data,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
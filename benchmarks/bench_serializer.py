@@ -0,0 +1,42 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Serialization of json_dump serializers on large EC2 and IAM payloads.
+
+Usage: PYTHONPATH=. python benchmarks/bench_serializer.py [--count 2000] [--repeat 5]
+"""
+import argparse
+import timeit
+
+from benchmarks.payloads import ec2_instances, iam_roles
+from skew.resources.json_dump import _SERIALIZERS, json_dump
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, factory in (("ec2 instances", ec2_instances), ("iam roles", iam_roles)):
+        payload = {"Items": factory(args.count)}
+        for name in sorted(_SERIALIZERS):
+            best = min(
+                timeit.repeat(
+                    stmt=lambda: json_dump(payload, normalize=False, serializer=name), number=1, repeat=args.repeat
+                )
+            )
+            print("%-14s %-8s %8.1f ms" % (label, name, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Synthetic AWS payloads shaped like describe_instances and IAM authorization details."""
+import datetime
+
+__all__ = ["ec2_instances", "iam_roles"]
+
+_NOW = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def ec2_instances(count):
+    """Return ``count`` instances like ``describe_instances`` ones."""
+    return [
+        {
+            "AmiLaunchIndex": 0,
+            "ImageId": "ami-0123456789abcdef0",
+            "InstanceId": "i-%017x" % i,
+            "InstanceType": "m5.large",
+            "LaunchTime": _NOW,
+            "Monitoring": {"State": "disabled"},
+            "Placement": {"AvailabilityZone": "us-east-1a", "GroupName": "", "Tenancy": "default"},
+            "PrivateDnsName": "ip-10-0-0-%d.ec2.internal" % (i % 255),
+            "PrivateIpAddress": "10.0.0.%d" % (i % 255),
+            "State": {"Code": 16, "Name": "running"},
+            "SubnetId": "subnet-0123456789abcdef0",
+            "VpcId": "vpc-0123456789abcdef0",
+            "BlockDeviceMappings": [
+                {
+                    "DeviceName": "/dev/xvda",
+                    "Ebs": {
+                        "AttachTime": _NOW,
+                        "DeleteOnTermination": True,
+                        "Status": "attached",
+                        "VolumeId": "vol-%017x" % i,
+                    },
+                }
+            ],
+            "NetworkInterfaces": [
+                {
+                    "Attachment": {"AttachmentId": "eni-attach-%x" % i, "DeviceIndex": 0, "Status": "attached"},
+                    "Groups": [{"GroupName": "web", "GroupId": "sg-0123456789abcdef0"}],
+                    "Ipv6Addresses": [],
+                    "MacAddress": "0a:00:00:00:00:00",
+                    "NetworkInterfaceId": "eni-%017x" % i,
+                    "PrivateIpAddresses": [{"Primary": True, "PrivateIpAddress": "10.0.0.%d" % (i % 255)}],
+                    "SourceDestCheck": True,
+                }
+            ],
+            "SecurityGroups": [{"GroupName": "web", "GroupId": "sg-0123456789abcdef0"}],
+            "Tags": [{"Key": "Name", "Value": "web-%d" % i}, {"Key": "Env", "Value": "prod"}],
+            "CpuOptions": {"CoreCount": 1, "ThreadsPerCore": 2},
+            "MetadataOptions": {"State": "applied", "HttpTokens": "optional", "HttpEndpoint": "enabled"},
+        }
+        for i in range(count)
+    ]
+
+
+def iam_roles(count):
+    """Return ``count`` roles like ``get_account_authorization_details`` ones."""
+    return [
+        {
+            "Path": "/",
+            "RoleName": "role-%d" % i,
+            "RoleId": "AROA%016d" % i,
+            "Arn": "arn:aws:iam::123456789012:role/role-%d" % i,
+            "CreateDate": _NOW,
+            "AssumeRolePolicyDocument": {
+                "Version": "2012-10-17",
+                "Statement": [
+                    {"Effect": "Allow", "Principal": {"Service": "ec2.amazonaws.com"}, "Action": "sts:AssumeRole"}
+                ],
+            },
+            "InstanceProfileList": [],
+            "RolePolicyList": [
+                {
+                    "PolicyName": "inline-%d" % i,
+                    "PolicyDocument": {
+                        "Version": "2012-10-17",
+                        "Statement": [
+                            {"Effect": "Allow", "Action": ["s3:GetObject", "s3:ListBucket"], "Resource": "*"}
+                        ],
+                    },
+                }
+            ],
+            "AttachedManagedPolicies": [
+                {"PolicyName": "ReadOnlyAccess", "PolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess"}
+            ],
+            "Tags": [{"Key": "team", "Value": "payments"}],
+            "RoleLastUsed": {"LastUsedDate": _NOW, "Region": "us-east-1"},
+        }
+        for i in range(count)
+    ]
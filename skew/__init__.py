@@ -10,25 +10,65 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
-"""skew module."""
+"""A flat address space for all your AWS resources.
 
-from pkg_resources import DistributionNotFound, get_distribution
-
-from skew.arn import ARN
-from skew.boto import get_all_activated_regions, get_caller_identity_account_id
+Importing skew is cheap: boto3, yaml and the resource classes are only
+imported when they are used (first ``scan``), and ``__version__`` is read
+from the package metadata on first access, so that short lived command
+line runs do not pay for them (see ``benchmarks/bench_import.py``).
+"""
+import sys
 
 __all__ = [
     "__version__",
     "get_all_activated_regions",
     "get_caller_identity_account_id",
     "scan",
+    "scan_many",
 ]
 
 
-try:
-    __version__ = get_distribution('skew').version
-except DistributionNotFound:  # pragma: no cover
-    __version__ = '(local)'
+def _get_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # pragma: no cover
+        # python < 3.8
+        from pkg_resources import DistributionNotFound as PackageNotFoundError, get_distribution
+
+        def version(name):
+            return get_distribution(name).version
+
+    try:
+        return version("skew")
+    except PackageNotFoundError:  # pragma: no cover
+        return "(local)"
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__
+    __version__ = _get_version()
+
+
+def __getattr__(name):
+    if name == "__version__":
+        version = _get_version()
+        globals()["__version__"] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_all_activated_regions():
+    """Return a list of enabled region of caller account (see ``skew.boto``)."""
+    from skew.boto import get_all_activated_regions as _get_all_activated_regions
+
+    return _get_all_activated_regions()
+
+
+def get_caller_identity_account_id():
+    """Return aws identity of the caller (see ``skew.boto``)."""
+    from skew.boto import get_caller_identity_account_id as _get_caller_identity_account_id
+
+    return _get_caller_identity_account_id()
 
 
 def scan(sku, **kwargs):
@@ -49,4 +89,16 @@ def scan(sku, **kwargs):
     but since there is currently only one (ARN) let's not over-complicate
     things.
     """
+    from skew.arn import ARN
+
     return ARN(sku, **kwargs)
+
+
+def scan_many(skus, **kwargs):
+    """Scan several SKUs, enumerating each (account, region, service, type) once.
+
+    Return ``ScanResult`` (pattern, resource, query data) of each SKU (see ``skew.arn.multi``).
+    """
+    from skew.arn.multi import scan_many as _scan_many
+
+    return _scan_many(skus, **kwargs)
@@ -13,7 +13,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Define arn utilities."""
-from .arn import ARN
+"""Define arn utilities.
+
+``ARN`` is imported on first access: ``skew.arn.parser`` can be imported
+without boto3 and yaml.
+"""
+import sys
 
 __all__ = ["ARN"]
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__
+    from .arn import ARN
+
+
+def __getattr__(name):
+    if name == "ARN":
+        from .arn import ARN
+
+        return ARN
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -13,8 +13,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Account module."""
-from skew.config import get_accounts
+"""Account module.
+
+Accounts come from the skew configuration, which is only loaded when the
+arn is enumerated (or completed).
+
+Regions which are not enabled for an account (opt-in regions not activated)
+are skipped, unless ``scan(..., check_regions=False)``.
+"""
+from skew.awsclient import get_awsclient
+from skew.boto import get_default_region
+from skew.boto.regions import get_enabled_regions
+from skew.config import get_accounts, prefetch_credentials
 
 from .component import LOG, ARNComponent
 
@@ -24,16 +34,31 @@ __all__ = ["Account"]
 class Account(ARNComponent):
     """Account definition."""
 
-    def __init__(self, pattern, arn):
-        super(Account, self).__init__(pattern, arn)
-        self._accounts = get_accounts()
-
     def choices(self, context=None):
-        return list(self._accounts.keys())
+        # configuration is loaded on first use: building an arn does not need it
+        return list(get_accounts().keys())
+
+    @staticmethod
+    def _region_enabled(account, region, **kwargs):
+        regions = get_enabled_regions(
+            account,
+            lambda: get_awsclient(
+                **{**kwargs, "service_name": "ec2", "region_name": get_default_region(), "account_id": account}
+            ),
+        )
+        # regions which can not be listed are all scanned
+        return regions is None or region in regions
 
     def enumerate(self, context, **kwargs):
         LOG.debug("Account.enumerate %s", context)
-        for match in self.matches(context):
+        matches = list(self.matches(context))
+        # assume roles of all accounts at once
+        prefetch_credentials(matches)
+        region = context[3] if len(context) > 3 else None
+        for match in matches:
+            if region and kwargs.get("check_regions", True) and not self._region_enabled(match, region, **kwargs):
+                LOG.debug("Account.enumerate skip %s: region %s is not enabled", match, region)
+                continue
             context.append(match)
             for resource in self._arn.resource.enumerate(context, **kwargs):
                 yield resource
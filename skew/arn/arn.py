@@ -15,10 +15,10 @@
 # limitations under the License.
 """Arn module."""
 import logging
+from itertools import zip_longest
 from typing import Optional
 
-import jmespath
-from six.moves import zip_longest
+from skew.boto.query import compile_query
 
 from .account import Account
 from .provider import Provider
@@ -90,7 +90,7 @@ class ARN(object):
     def _build_components_from_string(self, arn_string):
         if "|" in arn_string:
             arn_string, query = arn_string.split("|")
-            self.query = jmespath.compile(query)
+            self.query = compile_query(query)
         pairs = zip_longest(self.ComponentClasses, arn_string.split(":", 5), fillvalue="*")
         return [c(n, self) for c, n in pairs]
 
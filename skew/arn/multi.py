@@ -0,0 +1,128 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Scan of several arn patterns.
+
+The work units (provider, service, region, account and resource type) of
+all patterns are expanded first, without any api call, and merged: each
+unit is enumerated once, and its resources are routed to every pattern which
+covers the unit and selects them (resource id pattern), with the data of the
+pattern query.
+
+A unit is enumerated with the resource id of its patterns when they all
+have the same one (so that it is pushed down to the api as ``scan`` does),
+with ``*`` otherwise.
+"""
+from collections import OrderedDict, namedtuple
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from skew.boto.query import search
+from skew.config import prefetch_credentials
+
+from .account import Account
+from .arn import ARN
+from .component import LOG
+
+__all__ = ["ScanResult", "WorkUnit", "work_units", "scan_many"]
+
+# pattern: scanned arn string, resource: shared by the patterns which select it,
+# data: result of the pattern query (None without query)
+ScanResult = namedtuple("ScanResult", ["pattern", "resource", "data"])
+
+WorkUnit = namedtuple("WorkUnit", ["provider", "service", "region", "account", "resource_type"])
+
+
+def work_units(arn: ARN) -> Iterator[WorkUnit]:
+    """Yield work units of an arn (no api call, regions enabled for accounts are not checked)."""
+    context: List[str] = []
+    for scheme in arn.scheme.matches(context):
+        context.append(scheme)
+        for provider in arn.provider.matches(context):
+            context.append(provider)
+            for service in arn.service.matches(context):
+                context.append(service)
+                for region in arn.region.matches(context):
+                    context.append(region)
+                    for account in arn.account.matches(context):
+                        context.append(account)
+                        for resource_type in arn.resource.matches(context):
+                            yield WorkUnit(provider, service, region, account, resource_type)
+                        context.pop()
+                    context.pop()
+                context.pop()
+            context.pop()
+        context.pop()
+
+
+def _selects(resource_id, resource) -> bool:
+    return resource_id in (None, "", "*") or fnmatchcase(str(resource.id), resource_id)
+
+
+def scan_many(patterns: Sequence[str], **kwargs) -> Iterator[ScanResult]:
+    """Scan several arn patterns, enumerating each work unit once.
+
+    Parameters:
+        patterns (Sequence[str]): arn patterns, with an optional query (``arn:...|query``)
+        kwargs: scan parameters (see ``skew.scan``), shared by all patterns
+
+    Returns:
+        (Iterator[ScanResult]): resources of each pattern, a resource selected by several
+            patterns is yielded once per pattern
+    """
+    arns = [ARN(pattern, **kwargs) for pattern in patterns]
+    # unit: [(pattern index, resource id)]
+    units: Dict[WorkUnit, List[Tuple[int, str]]] = OrderedDict()
+    for index, arn in enumerate(arns):
+        _, resource_id = arn.resource._split_resource(arn.resource.pattern)
+        for unit in work_units(arn):
+            units.setdefault(unit, []).append((index, resource_id))
+    LOG.debug("scan_many: %d patterns, %d work units", len(arns), len(units))
+
+    # assume roles of all accounts at once
+    prefetch_credentials(list(OrderedDict.fromkeys(unit.account for unit in units)))
+    enabled: Dict[Tuple[str, str], bool] = {}
+    for unit, selections in units.items():
+        if unit.region and kwargs.get("check_regions", True):
+            scope = (unit.account, unit.region)
+            if scope not in enabled:
+                enabled[scope] = Account._region_enabled(unit.account, unit.region, **kwargs)
+            if not enabled[scope]:
+                LOG.debug("scan_many skip %s: region is not enabled", unit)
+                continue
+        selections = [(patterns[index], arns[index], resource_id) for index, resource_id in selections]
+        yield from _scan_unit(unit, selections, **kwargs)
+
+
+def _scan_unit(unit: WorkUnit, selections: List[Tuple[str, ARN, str]], **kwargs) -> Iterator[ScanResult]:
+    resource_ids = {resource_id for _, _, resource_id in selections}
+    shared_id = resource_ids.pop() if len(resource_ids) == 1 else "*"
+    queries = {id(arn.query): arn.query for _, arn, _ in selections}
+    shared_query = next(iter(queries.values())) if len(queries) == 1 else None
+
+    # enumeration arn of the unit, with the query of its patterns if they share it
+    resource = f"{unit.resource_type}/{shared_id}" if unit.resource_type != "*" else shared_id
+    unit_arn = ARN(f"arn:{unit.provider}:{unit.service}:{unit.region}:{unit.account}:{resource}", **kwargs)
+    unit_arn.query = shared_query
+    context = ["arn", unit.provider, unit.service, unit.region, unit.account]
+    for item in unit_arn.resource.enumerate_type(context, unit.resource_type, shared_id, **kwargs):
+        for pattern, arn, resource_id in selections:
+            if shared_id == "*" and not _selects(resource_id, item):
+                continue
+            if arn.query is None:
+                data = None
+            elif arn.query is shared_query:
+                data = item.filtered_data
+            else:
+                data = search(arn.query, item.data)
+            yield ScanResult(pattern, item, data)
@@ -0,0 +1,165 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Negative result cache.
+
+A scan is made of work units: one resource type of a service, in a region
+of an account.  With ``scan(..., negative_cache=True)``, units which return
+no resource, or fail because access is denied or the region is not enabled,
+are recorded, and skipped by the next scans until their entry expires.
+
+Entries are appended to a journal file (``<skew cache dir>/negative.jsonl``),
+which is compacted when it is loaded.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from skew.config import get_cache_dir
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_TTL", "NEGATIVE_ERROR_CODES", "NegativeCache", "get_negative_cache"]
+
+DEFAULT_TTL = 24 * 3600
+
+# error codes of units which will not return anything until the account changes
+# (permissions and opt-in), credentials errors (expired or invalid tokens) are transient
+NEGATIVE_ERROR_CODES = (
+    "AccessDenied",
+    "AccessDeniedException",
+    "UnauthorizedOperation",
+    "OptInRequired",
+    "SubscriptionRequiredException",
+)
+
+
+class NegativeCache(object):
+    """Persistent set of empty or denied work units.
+
+    Parameters:
+        path (Optional[str]): journal file (default ``<skew cache dir>/negative.jsonl``)
+        ttl (int): seconds during which an entry is used (default one day)
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: int = DEFAULT_TTL):
+        self._path = path if path else os.path.join(get_cache_dir(), "negative.jsonl")
+        self._ttl = ttl
+        self._entries: Optional[Dict[str, Tuple[str, float]]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(account: str, region: str, service: str, resource_type: str) -> str:
+        """Return the key of a work unit."""
+        return ":".join((account, region, service, resource_type))
+
+    def _load(self) -> Dict[str, Tuple[str, float]]:
+        # called with the lock held
+        if self._entries is not None:
+            return self._entries
+        entries: Dict[str, Tuple[str, float]] = {}
+        lines = 0
+        try:
+            with open(self._path) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("reason"):
+                        entries[record["key"]] = (record["reason"], record["time"])
+                    else:
+                        entries.pop(record["key"], None)
+        except OSError:
+            pass
+        now = time.time()
+        self._entries = {k: v for k, v in entries.items() if v[1] + self._ttl > now}
+        if lines > len(self._entries):
+            self._compact()
+        return self._entries
+
+    def _compact(self):
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self._path) or ".")
+        try:
+            with os.fdopen(fd, "w") as f:
+                for key, (reason, timestamp) in self._entries.items():
+                    f.write(json.dumps({"key": key, "reason": reason, "time": timestamp}) + "\n")
+            os.replace(tmp, self._path)
+        except OSError:
+            LOG.warning("Unable to write negative cache %s", self._path)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _append(self, key: str, reason: Optional[str], timestamp: float):
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(self._path, "a") as f:
+                f.write(json.dumps({"key": key, "reason": reason, "time": timestamp}) + "\n")
+        except OSError:
+            LOG.warning("Unable to write negative cache %s", self._path)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the reason of a recorded unit (None if it is not recorded or expired)."""
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None or entry[1] + self._ttl <= time.time():
+            return None
+        return entry[0]
+
+    def add(self, key: str, reason: str):
+        """Record a unit which returned nothing (reason ``empty``) or an error code."""
+        timestamp = time.time()
+        with self._lock:
+            self._load()[key] = (reason, timestamp)
+            self._append(key, reason, timestamp)
+
+    def discard(self, key: str):
+        """Forget a unit (it returned resources)."""
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._append(key, None, time.time())
+
+    def clear(self):
+        """Forget all units (the journal file is removed)."""
+        with self._lock:
+            self._entries = {}
+            if os.path.exists(self._path):
+                os.remove(self._path)
+
+
+_caches: Dict[Optional[str], NegativeCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_negative_cache(value) -> Optional[NegativeCache]:
+    """Return the negative cache of a ``negative_cache`` scan parameter.
+
+    Parameters:
+        value: a ``NegativeCache``, a journal file path, True for the default cache,
+            or a false value (no cache)
+    """
+    if not value:
+        return None
+    if isinstance(value, NegativeCache):
+        return value
+    path = value if isinstance(value, str) else None
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = NegativeCache(path=path)
+        return _caches[path]
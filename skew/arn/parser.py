@@ -0,0 +1,83 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parser of resource arn strings.
+
+``ARN`` builds the components of a scan pattern, ``parse_arn`` only splits
+a resource arn (from Config snapshots, CloudTrail logs, tagging api output,
+...) into a tuple, with the resource type and id split rules of scan
+patterns (``split_resource``).  ``parse_arns`` parses a batch of arns and
+shares the repeated components (partition, service, region, account and
+resource type) between the tuples.
+"""
+import sys
+from collections import namedtuple
+from typing import Iterable, List, Optional, Tuple
+
+__all__ = ["ParsedArn", "split_resource", "parse_arn", "parse_arns"]
+
+ParsedArn = namedtuple("ParsedArn", ["partition", "service", "region", "account", "resource_type", "resource_id"])
+
+_new = tuple.__new__
+
+
+def split_resource(resource: str) -> Tuple[str, str]:
+    """Split the resource part of an arn into resource type and id.
+
+    ``type/id`` and ``type:id`` are split on the first separator (``/``
+    first), a resource without separator has the ``*`` type.
+    """
+    if "/" in resource:
+        resource_type, resource_id = resource.split("/", 1)
+    elif ":" in resource:
+        resource_type, resource_id = resource.split(":", 1)
+    else:
+        # some services (sns, sqs, ...) use arns with only a resource identifier
+        resource_type, resource_id = "*", resource
+    return resource_type, resource_id
+
+
+def parse_arn(arn: str) -> ParsedArn:
+    """Parse an arn string (ValueError if it is not an arn)."""
+    parts = arn.split(":", 5)
+    if len(parts) != 6 or parts[0] != "arn":
+        raise ValueError(f"not an arn: {arn!r}")
+    return _new(ParsedArn, (parts[1], parts[2], parts[3], parts[4]) + split_resource(parts[5]))
+
+
+def parse_arns(arns: Iterable[str], strict: bool = True) -> List[Optional[ParsedArn]]:
+    """Parse arn strings.
+
+    Components other than the resource id are interned: tuples of a batch
+    share their strings.
+
+    Parameters:
+        arns (Iterable[str]): arn strings
+        strict (bool): raise ValueError on a string which is not an arn (default),
+            or return None for it
+    """
+    intern = sys.intern
+    result = []
+    append = result.append
+    for arn in arns:
+        parts = arn.split(":", 5)
+        if len(parts) != 6 or parts[0] != "arn":
+            if strict:
+                raise ValueError(f"not an arn: {arn!r}")
+            append(None)
+            continue
+        _, partition, service, region, account, resource = parts
+        resource_type, resource_id = split_resource(resource)
+        components = (intern(partition), intern(service), intern(region), intern(account), intern(resource_type))
+        append(_new(ParsedArn, components + (resource_id,)))
+    return result
@@ -13,7 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Region module."""
+"""Region module.
+
+Regions of a service come from the botocore endpoint data
+(``skew.boto.regions``), so that regions where a service does not exist are
+not scanned.  The static lists below are used for services unknown to
+botocore.
+"""
+from skew.boto.regions import get_service_regions
+
 from .component import LOG, ARNComponent
 
 __all__ = ["Region"]
@@ -95,7 +103,10 @@ class Region(ARNComponent):
         if context:
             service = context[2]
         else:
-            service = self._arn.service
+            service = self._arn.service.pattern
+        regions = get_service_regions(service)
+        if regions:
+            return regions
         return self._service_region_map.get(service, self._all_region_names)
 
     def enumerate(self, context, **kwargs):
@@ -14,9 +14,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Resource module."""
+from botocore.exceptions import ClientError
+
+from skew.boto.client import call_failures
 from skew.resources import all_types, find_resource_class
 
 from .component import LOG, ARNComponent
+from .negative_cache import NEGATIVE_ERROR_CODES, NegativeCache, get_negative_cache
+from .parser import split_resource
 
 __all__ = ["Resource"]
 
@@ -26,21 +31,7 @@ class Resource(ARNComponent):
 
     def _split_resource(self, resource):
         LOG.debug("split_resource: %s", resource)
-        if "/" in resource:
-            resource_type, resource_id = resource.split("/", 1)
-        elif ":" in resource:
-            resource_type, resource_id = resource.split(":", 1)
-        else:
-            # TODO: Some services use ARN's that include only a resource
-            # identifier (i.e. no resource type).  SNS is one example but
-            # there are others.  We need to refactor this code to allow
-            # the splitting of the resource part of the ARN to be handled
-            # by the individual resource classes rather than here.
-
-            # Fix resource enumeration when no resource type is define
-            resource_type = "*"  # one resource type in this case per service
-            resource_id = resource
-        return (resource_type, resource_id)
+        return split_resource(resource)
 
     def _match(self, pattern, context=None):
         resource_type, _ = self._split_resource(pattern)
@@ -58,14 +49,54 @@ class Resource(ARNComponent):
 
     def enumerate(self, context, **kwargs):
         LOG.debug("Resource.enumerate %s", context)
+        _, resource_id = self._split_resource(self.pattern)
+        for resource_type in self.matches(context):
+            yield from self.enumerate_type(context, resource_type, resource_id, **kwargs)
+
+    def enumerate_type(self, context, resource_type, resource_id, **kwargs):
+        """Enumerate resources of one type (one work unit).
+
+        Parameters:
+            context (List[str]): scheme, provider, service, region and account
+            resource_type (str): resource type
+            resource_id (str): resource id or pattern (``*`` for all)
+            kwargs: scan parameters
+        """
         _, provider, service_name, region, account = context
-        resource_type, resource_id = self._split_resource(self.pattern)
         LOG.debug("resource_type=%s, resource_id=%s", resource_type, resource_id)
+        cache = get_negative_cache(kwargs.get("negative_cache"))
+        whole_unit = resource_id in (None, "", "*") and not kwargs.get("tags")
 
-        for resource_type in self.matches(context):
-            resource_path = ".".join([provider, service_name, resource_type])
-            resource_cls = find_resource_class(resource_path)
-            for resource in resource_cls.enumerate(
+        resource_path = ".".join([provider, service_name, resource_type])
+        resource_cls = find_resource_class(resource_path)
+        enumerator = resource_cls.enumerate
+        if kwargs.get("tag_index") and kwargs.get("tags"):
+            # find tagged resources with the tagging api first
+            enumerator = resource_cls.enumerate_tagged
+        if cache is None:
+            yield from enumerator(arn=self._arn, region=region, account=account, resource_id=resource_id, **kwargs)
+            return
+        key = NegativeCache.key(account, region, service_name, resource_type)
+        reason = cache.get(key)
+        if reason:
+            LOG.debug("Resource.enumerate skip %s: %s", key, reason)
+            return
+        found = False
+        failures = call_failures()
+        try:
+            for resource in enumerator(
                 arn=self._arn, region=region, account=account, resource_id=resource_id, **kwargs
             ):
+                found = True
                 yield resource
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code in NEGATIVE_ERROR_CODES:
+                cache.add(key, code)
+            raise
+        if found:
+            cache.discard(key)
+        elif whole_unit and call_failures() == failures:
+            # a filtered unit may be empty while the unit is not,
+            # and a failed call (connection error, timeout, ...) returns no data
+            cache.add(key, "empty")
@@ -18,7 +18,7 @@ from typing import Any, Dict, Optional
 from botocore.config import Config
 
 from skew.boto import AWSClient
-from skew.config import get_credentials, get_profile
+from skew.config import get_credentials, get_profile, get_role
 
 __all__ = ["get_awsclient"]
 
@@ -39,10 +39,13 @@ def get_awsclient(
 ):
     """Return a configured aws client."""
     # credential management
+    role = None
     if profile_name is None:
-        aws_creds = get_credentials(account_id=account_id)
-        if aws_creds is None:
-            profile_name = get_profile(account_id=account_id)
+        role = get_role(account_id=account_id)
+        if role is None:
+            aws_creds = get_credentials(account_id=account_id)
+            if aws_creds is None:
+                profile_name = get_profile(account_id=account_id)
 
     return AWSClient(
         service_name=service_name,
@@ -56,4 +59,7 @@ def get_awsclient(
         max_attempts=max_attempts,
         config=config,
         max_attempts_on_client_error=max_attempts_on_client_error,
+        role_arn=role[0] if role else None,
+        role_profile_name=role[1] if role else None,
+        role_external_id=role[2] if role else None,
     )
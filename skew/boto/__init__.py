@@ -13,13 +13,18 @@
 # limitations under the License.
 """Boto3 utility."""
 from .client import AWSClient
+from .credentials import assume_role, assume_roles
+from .identity import credentials_fingerprint, get_caller_identity_account_id
+from .organizations import list_organization_accounts
+from .query import compile_query, query_fields, search
 from .utility import (
     get_all_activated_regions,
-    get_caller_identity_account_id,
+    get_botocore_session,
     get_client,
     get_default_region,
     get_default_session,
     get_session,
+    get_shared_loader,
 )
 
 __all__ = [
@@ -27,7 +32,16 @@ __all__ = [
     "get_default_region",
     "get_all_activated_regions",
     "get_caller_identity_account_id",
+    "credentials_fingerprint",
     "get_default_session",
     "get_session",
+    "get_shared_loader",
+    "get_botocore_session",
     "get_client",
+    "compile_query",
+    "search",
+    "query_fields",
+    "assume_role",
+    "assume_roles",
+    "list_organization_accounts",
 ]
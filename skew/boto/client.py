@@ -13,18 +13,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import sys
+import threading
 import time
 from typing import Any, Dict, Optional
 
-import jmespath
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from .query import compile_query
 from .utility import get_client, get_session
 
 LOG = logging.getLogger("skew.awsclient")
 
-__all__ = ["AWSClient"]
+__all__ = ["AWSClient", "call_failures"]
+
+# errors swallowed by AWSClient.call, per thread
+_failures = threading.local()
+
+
+def call_failures() -> int:
+    """Return the number of failed calls of the current thread whose error was not raised.
+
+    A caller compares two values to know if an empty result is a real one.
+    """
+    return getattr(_failures, "count", 0)
+
+
+def _add_call_failure():
+    _failures.count = call_failures() + 1
 
 
 class AWSClient(object):
@@ -43,6 +60,9 @@ class AWSClient(object):
         max_attempts: int = 20,
         config: Optional[Config] = None,
         max_attempts_on_client_error: int = 10,
+        role_arn: Optional[str] = None,
+        role_profile_name: Optional[str] = None,
+        role_external_id: Optional[str] = None,
     ):
         """Build a new instance of AWSClient.
 
@@ -59,12 +79,31 @@ class AWSClient(object):
             max_attempts (int): optional retry max attemps (default 20)
             config (Optional[Config]): optional boto3 Config instance (overide max_attempts parameter)
             max_attempts_on_client_error (int): optional limit of retry on client error (default 10)
+            role_arn (Optional[str]): optional role to assume (credentials are refreshed before they expire)
+            role_profile_name (Optional[str]): optional profile used to assume the role
+            role_external_id (Optional[str]): optional external id used to assume the role
 
         """
-        self._service_name = service_name
-        self._region_name = region_name
-        self._account_id = account_id
+        # many resources share these values: intern them once
+        self._service_name = sys.intern(service_name)
+        self._region_name = sys.intern(region_name) if region_name else region_name
+        self._account_id = sys.intern(account_id) if account_id else account_id
         self._max_attempts_on_client_error = max_attempts_on_client_error
+        self._settings = {
+            "aws_creds": aws_creds,
+            "profile_name": profile_name,
+            "placebo": placebo,
+            "placebo_data_path": placebo_data_path,
+            "placebo_mode": placebo_mode,
+            "max_attempts": max_attempts,
+            "config": config,
+            "max_attempts_on_client_error": max_attempts_on_client_error,
+            "role_arn": role_arn,
+            "role_profile_name": role_profile_name,
+            "role_external_id": role_external_id,
+        }
+        self._services: Dict[str, "AWSClient"] = {}
+        self._services_lock = threading.Lock()
 
         # Build a clojure in order to recreate boto3 client if needed
 
@@ -76,6 +115,9 @@ class AWSClient(object):
                     placebo=placebo,
                     placebo_data_path=placebo_data_path,
                     placebo_mode=placebo_mode,
+                    role_arn=role_arn,
+                    role_profile_name=role_profile_name,
+                    role_external_id=role_external_id,
                 ),
                 service_name=service if service else service_name,
                 region_name=region_name,
@@ -101,6 +143,23 @@ class AWSClient(object):
     def account_id(self):
         return self._account_id
 
+    def for_service(self, service_name: str) -> "AWSClient":
+        """Return an AWSClient on another service with the same account, region and settings.
+
+        Clients are created once and shared (resources of an enumeration use the same cloudwatch client).
+        """
+        with self._services_lock:
+            client = self._services.get(service_name)
+            if client is None:
+                client = AWSClient(
+                    service_name=service_name,
+                    account_id=self._account_id,
+                    region_name=self._region_name,
+                    **self._settings,
+                )
+                self._services[service_name] = client
+            return client
+
     def call(self, op_name, query=None, **kwargs):
         """Make a request to a method in this client.
 
@@ -152,11 +211,16 @@ class AWSClient(object):
                     elif "UnrecognizedClientException" in str(e):
                         LOG.error(e)
                         self._client = self.create_client()
+                    elif "ExpiredToken" in str(e):
+                        # static credentials of the session expired: build a new session
+                        LOG.warning(e)
+                        self._client = self.create_client()
                     elif "NoSuchTagSet" in str(e):
                         done = True
                     else:
                         # Avoid infinite loop
                         done = True
+                        _add_call_failure()
                     # avoid infinte loop
                     if not done:
                         retry -= 1
@@ -165,6 +229,7 @@ class AWSClient(object):
 
                 except Exception:
                     done = True
+                    _add_call_failure()
         if query:
-            return jmespath.compile(query).search(data)
+            return compile_query(query).search(data)
         return data
@@ -0,0 +1,336 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Assumed role credentials.
+
+Credentials of assumed roles are cached (per role, source profile and
+external id) until ``refresh_margin`` seconds before their expiration:
+
+* in memory, shared by all threads
+* optionally on disk (``path``), so that successive runs reuse them
+
+A background thread assumes again the roles which were used within
+``idle_timeout`` seconds and whose credentials are about to expire, so that
+callers do not wait for STS.  Credentials of idle roles are left to expire,
+and are assumed again on demand.  Roles of many accounts can be assumed
+concurrently with ``assume_roles``.
+
+Sessions built with ``get_session(role_arn=...)`` use botocore refreshable
+credentials backed by this cache (``AssumeRoleCacheProvider`` is the
+credential provider of their botocore session): clients of a long scan never
+use expired credentials.  The default margin (15 minutes) is the botocore
+advisory refresh timeout, so botocore never gets credentials it considers
+expiring.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from botocore.credentials import CredentialProvider, CredentialResolver, RefreshableCredentials
+from botocore.utils import parse_timestamp
+
+from .utility import get_client, get_session
+
+LOG = logging.getLogger(__name__)
+
+__all__ = [
+    "CredentialsCache",
+    "get_credentials_cache",
+    "assume_role",
+    "assume_roles",
+    "get_refreshable_credentials",
+    "AssumeRoleCacheProvider",
+    "get_credential_resolver",
+]
+
+DEFAULT_REFRESH_MARGIN = 900
+DEFAULT_REFRESH_INTERVAL = 60
+# longer than the default role session duration: roles used by botocore refreshable
+# credentials (at each expiration) stay refreshed
+DEFAULT_IDLE_TIMEOUT = 7200
+DEFAULT_WORKERS = 16
+DEFAULT_SESSION_NAME = "skew"
+
+# (role arn, source profile name, external id)
+RoleKey = Tuple[str, Optional[str], Optional[str]]
+
+
+def _assume_role(
+    role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None
+) -> Tuple[Dict[str, str], datetime.datetime]:
+    kwargs = {"RoleArn": role_arn, "RoleSessionName": DEFAULT_SESSION_NAME}
+    if external_id:
+        kwargs["ExternalId"] = external_id
+    client = get_client(session=get_session(profile_name=profile_name), service_name="sts")
+    credentials = client.assume_role(**kwargs)["Credentials"]
+    return (
+        {
+            "aws_access_key_id": credentials["AccessKeyId"],
+            "aws_secret_access_key": credentials["SecretAccessKey"],
+            "aws_session_token": credentials["SessionToken"],
+        },
+        credentials["Expiration"],
+    )
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class CredentialsCache(object):
+    """Thread safe cache of assumed role credentials."""
+
+    def __init__(
+        self,
+        refresh_margin: int = DEFAULT_REFRESH_MARGIN,
+        path: Optional[str] = None,
+        refresh_interval: Optional[int] = DEFAULT_REFRESH_INTERVAL,
+        idle_timeout: int = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """Build a new cache.
+
+        Parameters:
+            refresh_margin (int): credentials are assumed again this number of seconds before expiration
+            path (Optional[str]): optional directory of the on disk cache
+            refresh_interval (Optional[int]): period in seconds of the background refresh
+                (None to refresh only on demand)
+            idle_timeout (int): roles which are not used for this number of seconds are not refreshed
+        """
+        self._refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self._path = path
+        self._refresh_interval = refresh_interval
+        self._idle_timeout = datetime.timedelta(seconds=idle_timeout)
+        self._credentials: Dict[RoleKey, Tuple[Dict[str, str], datetime.datetime]] = {}
+        # last use of roles
+        self._used: Dict[RoleKey, datetime.datetime] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def set_path(self, path: Optional[str]):
+        """Set directory of the on disk cache (None to disable it)."""
+        self._path = path
+
+    def _file(self, key: RoleKey) -> str:
+        digest = hashlib.sha256("|".join(k or "" for k in key).encode("utf-8")).hexdigest()
+        return os.path.join(self._path, f"{digest}.json")
+
+    def _load(self, key: RoleKey):
+        try:
+            with open(self._file(key)) as f:
+                content = json.load(f)
+            return content["credentials"], parse_timestamp(content["expiration"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key: RoleKey, credentials: Dict[str, str], expiration: datetime.datetime):
+        try:
+            os.makedirs(self._path, mode=0o700, exist_ok=True)
+            filename = self._file(key)
+            tmp = f"{filename}.{threading.get_ident()}.tmp"
+            # credentials are readable by the owner only
+            with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump({"credentials": credentials, "expiration": expiration.isoformat()}, f)
+            os.replace(tmp, filename)
+        except OSError as e:
+            LOG.warning("Unable to save credentials cache: %s", e)
+
+    def _entry(self, key: RoleKey):
+        """Return cached (credentials, expiration) which are not about to expire (the role is used)."""
+        with self._lock:
+            self._used[key] = _now()
+            entry = self._credentials.get(key)
+        if entry is None and self._path:
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self._credentials[key] = entry
+        if entry and entry[1] - self._refresh_margin > _now():
+            return entry
+        return None
+
+    def _valid(self, key: RoleKey) -> Optional[Dict[str, str]]:
+        entry = self._entry(key)
+        return entry[0] if entry else None
+
+    def _assume(self, key: RoleKey):
+        LOG.debug("assume role %s", key[0])
+        role_arn, profile_name, external_id = key
+        credentials, expiration = _assume_role(role_arn, profile_name=profile_name, external_id=external_id)
+        with self._lock:
+            self._credentials[key] = (credentials, expiration)
+        if self._path:
+            self._save(key, credentials, expiration)
+        self._start_refresher()
+        return credentials, expiration
+
+    def get_with_expiration(
+        self, role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None
+    ) -> Tuple[Dict[str, str], datetime.datetime]:
+        """Return credentials of an assumed role and their expiration."""
+        key = (role_arn, profile_name, external_id)
+        entry = self._entry(key)
+        return entry if entry is not None else self._assume(key)
+
+    def get(self, role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None) -> Dict:
+        """Return credentials of an assumed role (boto3 session parameters).
+
+        Parameters:
+            role_arn (str): role to assume
+            profile_name (Optional[str]): optional profile used to assume the role
+            external_id (Optional[str]): optional external id
+        """
+        return self.get_with_expiration(role_arn, profile_name=profile_name, external_id=external_id)[0]
+
+    def get_many(self, roles: Iterable[RoleKey], workers: int = DEFAULT_WORKERS) -> Dict[RoleKey, Dict]:
+        """Return credentials of many roles, assumed concurrently.
+
+        A role which can not be assumed is logged and missing from the result.
+
+        Parameters:
+            roles (Iterable[RoleKey]): (role arn, profile name, external id)
+            workers (int): maximum number of concurrent calls
+        """
+        roles = list(dict.fromkeys(roles))
+        missing = [role for role in roles if self._valid(role) is None]
+
+        def _get(role: RoleKey):
+            try:
+                return self.get(*role)
+            except Exception as e:
+                LOG.error("Unable to assume role %s: %s", role[0], e)
+                return None
+
+        assumed = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as executor:
+                assumed = dict(zip(missing, executor.map(_get, missing)))
+        result = {}
+        for role in roles:
+            credentials = assumed[role] if role in assumed else self._valid(role)
+            if credentials is not None:
+                result[role] = credentials
+        return result
+
+    def refresh(self, within: Optional[int] = None):
+        """Assume again roles whose credentials expire within ``refresh_margin`` + ``within`` seconds.
+
+        Roles which were not used within ``idle_timeout`` seconds are not assumed again.
+        """
+        now = _now()
+        limit = now + self._refresh_margin + datetime.timedelta(seconds=within or 0)
+        idle = now - self._idle_timeout
+        with self._lock:
+            expiring = [
+                key
+                for key, (_, expiration) in self._credentials.items()
+                if expiration <= limit and self._used.get(key, now) > idle
+            ]
+        for key in expiring:
+            try:
+                self._assume(key)
+            except Exception as e:
+                LOG.warning("Unable to refresh role %s: %s", key[0], e)
+
+    def _start_refresher(self):
+        if self._refresh_interval is None or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._refresher = threading.Thread(target=self._run_refresher, name="skew-credentials", daemon=True)
+        self._refresher.start()
+
+    def _run_refresher(self):
+        # refresh before the next check would find expiring credentials
+        while not self._stop.wait(self._refresh_interval):
+            self.refresh(within=2 * self._refresh_interval)
+
+    def stop(self):
+        """Stop the background refresh."""
+        self._stop.set()
+
+    def clear(self):
+        """Remove all cached credentials (in memory)."""
+        with self._lock:
+            self._credentials.clear()
+            self._used.clear()
+
+
+_cache = CredentialsCache()
+
+
+def get_credentials_cache() -> CredentialsCache:
+    """Return the credentials cache shared by skew."""
+    return _cache
+
+
+def assume_role(role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None) -> Dict:
+    """Return credentials of an assumed role (cached)."""
+    return _cache.get(role_arn, profile_name=profile_name, external_id=external_id)
+
+
+def assume_roles(roles: Iterable[RoleKey], workers: int = DEFAULT_WORKERS) -> Dict[RoleKey, Dict]:
+    """Assume roles concurrently and return their credentials (cached)."""
+    return _cache.get_many(roles, workers=workers)
+
+
+def get_refreshable_credentials(
+    role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None
+) -> RefreshableCredentials:
+    """Return botocore credentials of an assumed role which refresh themselves from the cache."""
+
+    def _metadata():
+        credentials, expiration = get_credentials_cache().get_with_expiration(
+            role_arn, profile_name=profile_name, external_id=external_id
+        )
+        return {
+            "access_key": credentials["aws_access_key_id"],
+            "secret_key": credentials["aws_secret_access_key"],
+            "token": credentials["aws_session_token"],
+            "expiry_time": expiration.isoformat(),
+        }
+
+    return RefreshableCredentials.create_from_metadata(
+        metadata=_metadata(), refresh_using=_metadata, method="assume-role"
+    )
+
+
+class AssumeRoleCacheProvider(CredentialProvider):
+    """Botocore credential provider of an assumed role, with refreshable credentials backed by the cache."""
+
+    METHOD = "skew-assume-role"
+    CANONICAL_NAME = "SkewAssumeRole"
+
+    def __init__(self, role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None):
+        super().__init__()
+        self._role_arn = role_arn
+        self._profile_name = profile_name
+        self._external_id = external_id
+
+    def load(self) -> RefreshableCredentials:
+        return get_refreshable_credentials(
+            self._role_arn, profile_name=self._profile_name, external_id=self._external_id
+        )
+
+
+def get_credential_resolver(
+    role_arn: str, profile_name: Optional[str] = None, external_id: Optional[str] = None
+) -> CredentialResolver:
+    """Return a botocore credential resolver (``credential_provider`` session component) of an assumed role."""
+    return CredentialResolver(providers=[AssumeRoleCacheProvider(role_arn, profile_name, external_id)])
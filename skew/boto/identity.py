@@ -0,0 +1,140 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Caller identity.
+
+The account of the caller (``sts.get_caller_identity``) is cached per
+credentials fingerprint:
+
+* in memory
+* on disk (``<skew cache dir>/identity``, disabled with ``SKEW_IDENTITY_CACHE=0``),
+  for one day, for long term credentials only
+
+so that successive runs with the same credentials do not call STS.
+Refreshable credentials (assumed role, instance profile, container role,
+sso, ...) are identified by their current temporary access key, which is
+not reused by the next runs: they are only cached in memory.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import boto3
+from botocore.credentials import RefreshableCredentials
+
+from .utility import get_client, get_default_session
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["IDENTITY_TTL", "credentials_fingerprint", "get_caller_identity_account_id", "clear_identity_cache"]
+
+IDENTITY_TTL = 24 * 3600
+
+_identities: Dict[str, str] = {}
+_identities_lock = threading.Lock()
+
+
+def _fingerprint(credentials) -> str:
+    if isinstance(credentials, RefreshableCredentials):
+        # current temporary credentials (refreshed if they are expiring)
+        access_key = credentials.get_frozen_credentials().access_key
+    else:
+        access_key = credentials.access_key
+    return hashlib.sha256(f"{credentials.method}:{access_key}".encode("utf-8")).hexdigest()
+
+
+def credentials_fingerprint(session: boto3.Session) -> Optional[str]:
+    """Return a fingerprint of the credentials of a session (None without credentials).
+
+    Credentials are identified by their access key (the current one for
+    refreshable credentials).
+    """
+    credentials = session.get_credentials()
+    return None if credentials is None else _fingerprint(credentials)
+
+
+def _cache_file(fingerprint: str) -> Optional[str]:
+    if os.environ.get("SKEW_IDENTITY_CACHE", "1") == "0":
+        return None
+    from skew.config import get_cache_dir
+
+    return os.path.join(get_cache_dir("identity"), f"{fingerprint}.json")
+
+
+def _load(fingerprint: str) -> Optional[str]:
+    path = _cache_file(fingerprint)
+    if path is None:
+        return None
+    try:
+        with open(path) as f:
+            content = json.load(f)
+        if content["time"] + IDENTITY_TTL > time.time():
+            return content["account"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _save(fingerprint: str, account_id: str):
+    path = _cache_file(fingerprint)
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as f:
+            json.dump({"account": account_id, "time": time.time()}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        LOG.warning("Unable to save identity cache: %s", e)
+
+
+def get_caller_identity_account_id(session: Optional[boto3.Session] = None) -> str:
+    """Return aws account of the caller (cached per credentials).
+
+    Parameters:
+        session (Optional[boto3.Session]): session of the caller (default session by default)
+    """
+    session = session if session else get_default_session()
+    credentials = session.get_credentials()
+    fingerprint = None if credentials is None else _fingerprint(credentials)
+    # temporary credentials are not saved on disk
+    persistent = credentials is not None and not isinstance(credentials, RefreshableCredentials)
+    if fingerprint is not None:
+        with _identities_lock:
+            account_id = _identities.get(fingerprint)
+        if account_id is None and persistent:
+            account_id = _load(fingerprint)
+        if account_id is not None:
+            with _identities_lock:
+                _identities[fingerprint] = account_id
+            return account_id
+
+    account_id = get_client(session, service_name="sts").get_caller_identity()["Account"]
+    if fingerprint is not None:
+        with _identities_lock:
+            _identities[fingerprint] = account_id
+        if persistent:
+            _save(fingerprint, account_id)
+    return account_id
+
+
+def clear_identity_cache():
+    """Forget identities (in memory)."""
+    with _identities_lock:
+        _identities.clear()
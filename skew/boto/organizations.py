@@ -0,0 +1,38 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""AWS Organizations utility."""
+from typing import Dict, List, Optional
+
+from .utility import get_client, get_session
+
+__all__ = ["list_organization_accounts"]
+
+
+def list_organization_accounts(profile_name: Optional[str] = None, active_only: bool = True) -> List[Dict]:
+    """Return accounts of the organization (``organizations.list_accounts``).
+
+    Must be called with credentials of the management account (or of a delegated administrator).
+
+    Parameters:
+        profile_name (Optional[str]): optional profile name
+        active_only (bool): return only active accounts (default True)
+
+    Returns:
+        (List[Dict]): accounts (``Id``, ``Name``, ``Status``, ...)
+    """
+    client = get_client(session=get_session(profile_name=profile_name), service_name="organizations")
+    accounts = client.get_paginator("list_accounts").paginate().build_full_result().get("Accounts", [])
+    if active_only:
+        accounts = [account for account in accounts if account.get("Status") == "ACTIVE"]
+    return accounts
@@ -0,0 +1,91 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compiled jmespath queries.
+
+Resource specs (``enum_spec``, ``detail_spec``, ``attr_spec``, ``tags_spec``,
+``name``, ``date``) use a small set of expressions which are evaluated for
+every resource.  They are parsed once and the compiled expression is reused.
+"""
+from functools import lru_cache
+from typing import Any, FrozenSet, Optional, Union
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+__all__ = ["compile_query", "search", "query_fields"]
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str) -> ParsedResult:
+    return jmespath.compile(expression)
+
+
+def compile_query(query: Union[str, ParsedResult]) -> ParsedResult:
+    """Return compiled jmespath query (compiled once per expression)."""
+    if isinstance(query, str):
+        return _compile(query)
+    return query
+
+
+def search(query: Union[str, ParsedResult], data: Any) -> Any:
+    """Apply a jmespath query (expression or compiled) on data."""
+    return compile_query(query).search(data)
+
+
+# nodes whose first child only is evaluated against the current value
+_LEFT_NODES = {"subexpression", "index_expression", "projection", "value_projection", "filter_projection", "pipe"}
+# nodes whose children are all evaluated against the current value
+_ALL_NODES = {
+    "flatten",
+    "multi_select_dict",
+    "multi_select_list",
+    "key_val_pair",
+    "function_expression",
+    "comparator",
+    "and_expression",
+    "or_expression",
+    "not_expression",
+}
+# nodes which do not read the current value
+_CONSTANT_NODES = {"literal", "expref", "index", "slice"}
+
+
+def _root_fields(node) -> Optional[set]:
+    node_type = node["type"]
+    if node_type == "field":
+        return {node["value"]}
+    if node_type in _CONSTANT_NODES:
+        return set()
+    if node_type in _LEFT_NODES:
+        return _root_fields(node["children"][0])
+    if node_type in _ALL_NODES:
+        fields = set()
+        for child in node["children"]:
+            child_fields = _root_fields(child)
+            if child_fields is None:
+                return None
+            fields |= child_fields
+        return fields
+    # current node (@), wildcard or unknown expression: everything is needed
+    return None
+
+
+@lru_cache(maxsize=1024)
+def query_fields(query: Union[str, ParsedResult]) -> Optional[FrozenSet[str]]:
+    """Return the top level fields read by a jmespath query (None if it may read any field).
+
+    ``InstanceType`` reads ``InstanceType``, ``{a: Acl.Grants, b: Policy}`` reads ``Acl`` and ``Policy``.
+    """
+    fields = _root_fields(compile_query(query).parsed)
+    return frozenset(fields) if fields is not None else None
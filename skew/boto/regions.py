@@ -0,0 +1,102 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Region availability.
+
+Regions of a service come from the endpoint data bundled with botocore (no
+call to AWS), regions of an account from ``ec2.describe_regions`` (which
+only returns regions enabled for the account: opt-in regions which are not
+activated are excluded).
+"""
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import botocore.session
+
+from .utility import get_botocore_session
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_PARTITIONS", "get_service_regions", "get_enabled_regions", "clear_enabled_regions"]
+
+# skew "aws" provider covers the china regions
+DEFAULT_PARTITIONS = ("aws", "aws-cn")
+
+# skew service names which are not boto3 client names
+_CLIENT_NAMES = {"states": "stepfunctions"}
+
+_enabled_regions: Dict[str, FrozenSet[str]] = {}
+_enabled_regions_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _session() -> botocore.session.Session:
+    return get_botocore_session()
+
+
+@lru_cache(maxsize=256)
+def get_service_regions(service_name: str, partitions: Sequence[str] = DEFAULT_PARTITIONS) -> List[str]:
+    """Return regions where a service has an endpoint.
+
+    Parameters:
+        service_name (str): skew service name
+        partitions (Sequence[str]): partition names (default ``DEFAULT_PARTITIONS``)
+
+    Returns:
+        (List[str]): region names, empty for global services and services unknown to botocore
+    """
+    session = _session()
+    client_name = _CLIENT_NAMES.get(service_name, service_name)
+    regions = []
+    for partition in partitions:
+        try:
+            regions.extend(session.get_available_regions(client_name, partition_name=partition))
+        except Exception as e:
+            LOG.debug("no endpoint data for %s in %s: %s", client_name, partition, e)
+    return regions
+
+
+def get_enabled_regions(account_id: str, client_factory: Callable[[], Any]) -> Optional[FrozenSet[str]]:
+    """Return regions enabled for an account (cached per account).
+
+    A failure is not cached: regions are listed again on the next call.
+
+    Parameters:
+        account_id (str): account identifier
+        client_factory (Callable[[], Any]): build the ec2 aws client of the account (only called on a cache miss)
+
+    Returns:
+        (Optional[FrozenSet[str]]): region names, None if they can not be listed
+    """
+    with _enabled_regions_lock:
+        if account_id in _enabled_regions:
+            return _enabled_regions[account_id]
+    try:
+        regions = frozenset(client_factory().call("describe_regions", query="Regions[].RegionName") or [])
+    except Exception as e:
+        LOG.debug("unable to list regions of %s: %s", account_id, e)
+        return None
+    if not regions:
+        # the call failed (AWSClient.call returns no data on error)
+        return None
+    with _enabled_regions_lock:
+        _enabled_regions[account_id] = regions
+    return regions
+
+
+def clear_enabled_regions():
+    """Forget regions of accounts."""
+    with _enabled_regions_lock:
+        _enabled_regions.clear()
@@ -17,12 +17,15 @@ from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import boto3
+import botocore.session
 from botocore.config import Config
+from botocore.loaders import Loader
 
 __all__ = [
+    "get_shared_loader",
+    "get_botocore_session",
     "get_default_region",
     "get_all_activated_regions",
-    "get_caller_identity_account_id",
     "get_default_session",
     "get_session",
     "get_client",
@@ -61,6 +64,39 @@ def get_all_activated_regions() -> List[str]:
     )
 
 
+class _SearchPaths(list):
+    """Loader search paths without duplicates (boto3 appends its data path to the loader of each session)."""
+
+    def append(self, path):
+        if path not in self:
+            super().append(path)
+
+
+@lru_cache(maxsize=1)
+def get_shared_loader() -> Loader:
+    """Return the botocore data loader shared by all sessions built by skew.
+
+    The loader caches service models, paginators and endpoints data: they are
+    read and parsed once per process instead of once per session.
+
+    Returns:
+        (Loader): botocore loader (with ``AWS_DATA_PATH`` search paths)
+    """
+    paths = _SearchPaths()
+    data_path = os.environ.get("AWS_DATA_PATH")
+    if data_path:
+        for path in data_path.split(os.pathsep):
+            paths.append(os.path.expanduser(os.path.expandvars(path)))
+    return Loader(extra_search_paths=paths)
+
+
+def get_botocore_session() -> botocore.session.Session:
+    """Return a new botocore session which uses the shared data loader."""
+    session = botocore.session.get_session()
+    session.register_component("data_loader", get_shared_loader())
+    return session
+
+
 def get_session(
     region_name: Optional[str] = None,
     aws_creds: Optional[Dict[str, str]] = None,
@@ -68,9 +104,14 @@ def get_session(
     placebo: Optional[Any] = None,
     placebo_data_path: Optional[str] = None,
     placebo_mode: Optional[str] = "record",
+    role_arn: Optional[str] = None,
+    role_profile_name: Optional[str] = None,
+    role_external_id: Optional[str] = None,
 ) -> boto3.Session:
     """Return boto3 sesssion.
 
+    Sessions share the botocore data loader (see ``get_shared_loader``).
+
     Parameters:
         region_name (Optional[str]): optional region name
         aws_creds (Optional[Dict[str, str]]): optional dict of aws key, aws secret key
@@ -78,13 +119,25 @@ def get_session(
         placebo (Optional[Any]): optional placebo object
         placebo_data_path (Optional[str]): optional placebo data path
         placebo_mode Optional[str]: optional placebo mode (default 'record')
+        role_arn (Optional[str]): optional role to assume, with credentials refreshed before
+            they expire (see ``skew.boto.credentials``)
+        role_profile_name (Optional[str]): optional profile used to assume the role
+        role_external_id (Optional[str]): optional external id used to assume the role
     """
     params = {}
 
     if region_name:
         params["region_name"] = region_name
 
-    if aws_creds:
+    params["botocore_session"] = get_botocore_session()
+    if role_arn:
+        from .credentials import get_credential_resolver
+
+        params["botocore_session"].register_component(
+            "credential_provider",
+            get_credential_resolver(role_arn, profile_name=role_profile_name, external_id=role_external_id),
+        )
+    elif aws_creds:
         params = {**params, **aws_creds}
     elif profile_name:
         params["profile_name"] = profile_name
@@ -131,8 +184,3 @@ def get_client(
         region_name=region_name,
         config=config if config else Config(retries={"max_attempts": max_attempts, "mode": "adaptive"}),
     )
-
-
-def get_caller_identity_account_id() -> str:
-    """Return aws identity of the caller."""
-    return get_client(get_default_session(), service_name="sts").get_caller_identity()["Account"]
@@ -13,9 +13,20 @@
 # limitations under the License.
 
 import argparse
+import json
 import os
+import queue
+import sys
+import threading
+from typing import Dict, Optional, Set, Tuple
 
 import skew
+from skew.diff import write_arns
+
+DEFAULT_WRITERS = 4
+DEFAULT_QUEUE_SIZE = 256
+
+_STOP = object()
 
 
 def _make_directory(path):
@@ -31,6 +42,150 @@ def _call_back(resource):
     resource.tags
 
 
+def _output_file(output_path: str, arn: str) -> Tuple[str, str]:
+    """Return directory and file name of a resource."""
+    if "/" in arn:
+        data = arn.split("/")
+        identifier = data.pop(-1)
+        data = ":".join(data).split(":")
+    else:
+        data = arn.split(":")
+        identifier = data.pop(-1)
+    return os.path.join(output_path, *data), f"{identifier}.json"
+
+
+class ResourceWriter(object):
+    """Write resources of a scan with a pool of threads.
+
+    The scan thread only puts resources in a bounded queue: tag loading,
+    serialization and file writes of writer threads overlap with the scan
+    api calls.  Directories are created once.  The first error of a writer
+    stops the scan (it is raised by ``write`` or ``close``).
+
+    Resources are written in an output directory tree, whose arns file
+    (``skew.diff.ARNS_FILE``) is written by ``close``, or in a snapshot store
+    (``skew.store``) whose manifest is written by ``close``.
+
+    Parameters:
+        output_path (Optional[str]): output directory
+        normalize (bool): normalize json
+        serializer (Optional[str]): json serializer name
+        workers (int): number of writer threads (0 to write in the calling thread)
+        queue_size (int): maximum number of resources waiting to be written
+        store (Optional[SnapshotStore]): snapshot store, replaces the output directory
+    """
+
+    def __init__(
+        self,
+        output_path: Optional[str],
+        normalize: bool = False,
+        serializer: Optional[str] = None,
+        workers: int = DEFAULT_WRITERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        store=None,
+    ):
+        self._output_path = output_path
+        self._store = store
+        self._normalize = normalize
+        self._serializer = serializer
+        self._directories: Set[str] = set()
+        # arns of written files (by path relative to the output directory)
+        self._arns: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._threads = [
+            threading.Thread(target=self._run, name=f"skew-writer-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _directory(self, directory: str):
+        with self._lock:
+            if directory in self._directories:
+                return
+        _make_directory(directory)
+        with self._lock:
+            self._directories.add(directory)
+
+    def _write(self, resource):
+        _call_back(resource)
+        if self._store is not None:
+            self._store.write(resource, normalize=self._normalize, serializer=self._serializer)
+            return
+        directory, filename = _output_file(self._output_path, resource.arn)
+        content = resource.json_dump(normalize=self._normalize, serializer=self._serializer)
+        self._directory(directory)
+        file_path = os.path.join(directory, filename)
+        with open(file_path, "w") as f:
+            f.write(content)
+        relative = os.path.relpath(file_path, self._output_path).replace(os.sep, "/")
+        with self._lock:
+            self._arns[relative] = resource.arn
+
+    def _run(self):
+        while True:
+            resource = self._queue.get()
+            try:
+                if resource is _STOP:
+                    return
+                if self._error is None:
+                    self._write(resource)
+            except BaseException as e:
+                with self._lock:
+                    # keep the first error
+                    if self._error is None:
+                        self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise(self):
+        if self._error is not None:
+            raise self._error
+
+    def write(self, resource):
+        """Write a resource (queued if there are writer threads)."""
+        self._raise()
+        if self._threads:
+            self._queue.put(resource)
+        else:
+            self._write(resource)
+
+    def _stop(self):
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _write_arns(self):
+        if self._arns:
+            write_arns(self._output_path, self._arns)
+            self._arns = {}
+
+    def close(self):
+        """Wait for queued resources, stop writer threads and write the arns file or the manifest of a store."""
+        self._stop()
+        self._raise()
+        if self._store is not None:
+            self._store.close()
+        else:
+            self._write_arns()
+
+    def abort(self):
+        """Stop writer threads after a failed scan, without raising their error.
+
+        Queued resources are still written, with the arns file (best effort).
+        The manifest of a store is not written.
+        """
+        self._stop()
+        if self._store is None:
+            try:
+                self._write_arns()
+            except OSError:
+                pass
+
+
 def _create_parser():
 
     parser = argparse.ArgumentParser(description="SKEW alias Stock Keeping Unit")
@@ -44,13 +199,22 @@ def _create_parser():
         required=True,
     )
 
-    parser.add_argument(
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument(
         "--output-path",
         action="store",
         type=str,
         nargs=1,
         help="output directory",
-        required=True,
+    )
+
+    output.add_argument(
+        "--store",
+        action="store",
+        type=str,
+        default=None,
+        help="snapshot store directory: write changed resources and a manifest of the scan (see skew.store)",
+        dest="store",
     )
 
     parser.add_argument(
@@ -59,33 +223,90 @@ def _create_parser():
         help="normalize json",
         dest="normalize",
     )
+
+    parser.add_argument(
+        "--serializer",
+        action="store",
+        type=str,
+        default=None,
+        help="json serializer: json (4 spaces indent), orjson (2 spaces indent) or auto, orjson if installed "
+        "(default: SKEW_JSON_SERIALIZER or json)",
+        dest="serializer",
+    )
+
+    parser.add_argument(
+        "--negative-cache",
+        action="store_true",
+        help="skip work units found empty or denied by previous scans (see skew.arn.negative_cache)",
+        dest="negative_cache",
+    )
+
+    parser.add_argument(
+        "--writers",
+        action="store",
+        type=int,
+        default=DEFAULT_WRITERS,
+        help=f"number of writer threads, 0 to write in the scan thread (default: {DEFAULT_WRITERS})",
+        dest="writers",
+    )
     return parser
 
 
+def _create_diff_parser():
+
+    parser = argparse.ArgumentParser(
+        prog="skew diff",
+        description="Compare two scan outputs (output directories, sorted json lines files or store manifests)",
+    )
+    parser.add_argument("old", help="old snapshot")
+    parser.add_argument("new", help="new snapshot")
+    return parser
+
+
+def _diff(argv) -> int:
+    """Print changes between two snapshots as json lines, return 1 if they differ."""
+    from skew.diff import diff_snapshots
+
+    args = _create_diff_parser().parse_args(argv)
+    counts = {}
+    for change in diff_snapshots(args.old, args.new):
+        counts[change.kind] = counts.get(change.kind, 0) + 1
+        record = {"change": change.kind, "arn": change.arn}
+        if change.fields:
+            record["fields"] = [f._asdict() for f in change.fields]
+        sys.stdout.write(json.dumps(record, default=str) + "\n")
+    sys.stderr.write(", ".join(f"{count} {kind}" for kind, count in sorted(counts.items())) or "no change")
+    sys.stderr.write("\n")
+    return 1 if counts else 0
+
+
 def main():
     """Define entry point for cli."""
+    if sys.argv[1:2] == ["diff"]:
+        sys.exit(_diff(sys.argv[2:]))
+
     args = _create_parser().parse_args()
 
     _uri = str(args.uri[0])
-    _output_path = args.output_path[0]
-    for resource in skew.scan(_uri):
-        _call_back(resource)
-        directory = None
-        identifier = None
-        if "/" in resource.arn:
-            data = resource.arn.split("/")
-            identifier = data.pop(-1)
-            data = ":".join(data).split(":")
-            directory = os.path.join(_output_path, *data)
-        else:
-            data = resource.arn.split(":")
-            identifier = data.pop(-1)
-            directory = os.path.join(_output_path, *data)
+    _output_path = args.output_path[0] if args.output_path else None
+    store = None
+    if args.store:
+        from skew.store import SnapshotStore
 
-        _make_directory(directory)
-
-        with open(os.path.join(directory, f"{identifier}.json"), "w") as f:
-            f.write((resource.json_dump(normalize=args.normalize)))
+        store = SnapshotStore(args.store)
+    writer = ResourceWriter(
+        _output_path, normalize=args.normalize, serializer=args.serializer, workers=args.writers, store=store
+    )
+    try:
+        for resource in skew.scan(_uri, negative_cache=args.negative_cache):
+            writer.write(resource)
+    except BaseException:
+        # the scan error is raised, not an error of the writers
+        writer.abort()
+        raise
+    writer.close()
+    if store is not None:
+        sys.stderr.write(f"{store.manifest_path} ({store.written} new objects)\n")
 
 
 if __name__ == "__main__":
@@ -12,18 +12,47 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""config module."""
+"""config module.
+
+Accounts are read from the ``accounts`` section of the configuration file.
+An account entry can define a ``profile``, static ``credentials`` or a
+``role_arn`` to assume (with optional ``source_profile`` and ``external_id``).
+
+With an ``organizations`` section, accounts of the organization are added
+(entries of the ``accounts`` section take precedence), with the role to
+assume in each of them::
+
+    organizations:
+      role_name: OrganizationAccountAccessRole
+      profile: management   # optional profile used to list accounts and assume roles
+      external_id: foo      # optional
+      workers: 16           # optional, concurrent role assumptions
+
+Credentials of assumed roles are cached in memory.  With
+``credentials_cache: true`` (or a directory), they are also cached on disk
+(in ``get_cache_dir("credentials")`` by default).
+"""
 import logging
 import os
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 
 import yaml
 
 from skew.boto import get_caller_identity_account_id
+from skew.boto.credentials import DEFAULT_WORKERS, assume_role, assume_roles, get_credentials_cache
+from skew.boto.organizations import list_organization_accounts
 
 LOG = logging.getLogger(__name__)
 
-__all__ = ["get_config", "get_credentials", "get_profile", "get_accounts"]
+__all__ = [
+    "get_config",
+    "get_credentials",
+    "get_profile",
+    "get_role",
+    "get_accounts",
+    "get_cache_dir",
+    "prefetch_credentials",
+]
 
 _config = None
 
@@ -38,6 +67,12 @@ def get_config():
         if os.path.exists(path):
             with open(path) as config_file:
                 _config = yaml.load(config_file, Loader=yaml.FullLoader)
+            credentials_cache = _config.get("credentials_cache")
+            if credentials_cache:
+                path = get_cache_dir("credentials") if credentials_cache is True else credentials_cache
+                get_credentials_cache().set_path(os.path.expandvars(os.path.expanduser(path)))
+            if _config.get("organizations"):
+                _add_organization_accounts(_config)
         else:
             LOG.warning("Unable to find skew config file")
             _config = {"accounts": {}}
@@ -46,18 +81,73 @@ def get_config():
     return _config
 
 
+def _add_organization_accounts(config: Dict):
+    organizations = config["organizations"]
+    accounts = config.get("accounts") or {}
+    config["accounts"] = accounts
+    for account in list_organization_accounts(profile_name=organizations.get("profile")):
+        if account["Id"] in accounts:
+            continue
+        entry = {"role_arn": f"arn:aws:iam::{account['Id']}:role/{organizations['role_name']}"}
+        if organizations.get("profile"):
+            entry["source_profile"] = organizations["profile"]
+        if organizations.get("external_id"):
+            entry["external_id"] = organizations["external_id"]
+        accounts[account["Id"]] = entry
+    LOG.debug("%d accounts with organization accounts", len(accounts))
+
+
+def _role(account: Dict):
+    return (account["role_arn"], account.get("source_profile"), account.get("external_id"))
+
+
 def get_accounts():
     """Return skew configuration accounts."""
     return get_config()["accounts"]
 
 
 def get_credentials(account_id: str) -> Optional[Dict[str, str]]:
-    """Return skew configuration account credentials."""
+    """Return skew configuration account credentials (static or of the assumed role)."""
+    account = get_config()["accounts"].get(account_id)
+    if account is None:
+        return None
+    if account.get("credentials"):
+        return account["credentials"]
+    if account.get("role_arn"):
+        return assume_role(*_role(account))
+    return None
+
+
+def get_role(account_id: str) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+    """Return skew configuration account role to assume (role arn, source profile, external id)."""
+    account = get_config()["accounts"].get(account_id)
+    if account is None or account.get("credentials") or not account.get("role_arn"):
+        return None
+    return _role(account)
+
+
+def prefetch_credentials(account_ids: Iterable[str]):
+    """Assume roles of accounts concurrently (credentials are cached for ``get_credentials``)."""
     _config = get_config()
-    return _config["accounts"][account_id].get("credentials") if account_id in _config["accounts"] else None
+    accounts = _config["accounts"]
+    roles = [_role(accounts[a]) for a in account_ids if a in accounts and accounts[a].get("role_arn")]
+    if len(roles) > 1:
+        workers = (_config.get("organizations") or {}).get("workers", DEFAULT_WORKERS)
+        assume_roles(roles, workers=workers)
 
 
 def get_profile(account_id: str) -> Optional[str]:
     """Return skew configuration account profile."""
     _config = get_config()
     return _config["accounts"][account_id].get("profile") if account_id in _config["accounts"] else None
+
+
+def get_cache_dir(name: Optional[str] = None) -> str:
+    """Return skew cache directory (``SKEW_CACHE_DIR``, default ``~/.cache/skew``).
+
+    Parameters:
+        name (Optional[str]): optional sub directory name
+    """
+    path = os.environ.get("SKEW_CACHE_DIR", os.path.join("~", ".cache", "skew"))
+    path = os.path.expandvars(os.path.expanduser(path))
+    return os.path.join(path, name) if name else path
@@ -0,0 +1,265 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Differences between two scan snapshots.
+
+A snapshot is either:
+
+* an output directory of the command line (one json file per resource, and
+  the arns of the files in ``arns.jsonl``)
+* a json lines file, one ``{"arn": ..., "data": ...}`` record per resource,
+  sorted by arn (records may also have a content ``hash``)
+* a manifest of a snapshot store (``skew.store``), one ``{"arn": ..., "hash": ...}``
+  record per resource, data is read from the store only when needed
+
+Both snapshots are read as streams sorted by arn components (the arn split
+on ``:`` and ``/``, which are the directories of a cli output) and merged:
+only the current resource of each snapshot is in memory.  Records with the
+same content hash are equal without looking at their data, other resources
+are canonicalized with the ``sleek_data`` of their resource class, and
+their volatile fields (``Meta.volatile``) removed, before being compared
+field by field.
+"""
+import json
+import os
+import re
+import tempfile
+from collections import namedtuple
+from functools import partial
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+__all__ = [
+    "ADDED",
+    "REMOVED",
+    "CHANGED",
+    "Change",
+    "FieldChange",
+    "ARNS_FILE",
+    "sort_key",
+    "read_arns",
+    "write_arns",
+    "read_directory",
+    "read_jsonl",
+    "read_snapshot",
+    "canonicalize",
+    "diff_data",
+    "diff",
+    "diff_snapshots",
+]
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# kind: ADDED, REMOVED or CHANGED, fields: List[FieldChange] of a changed resource
+Change = namedtuple("Change", ["kind", "arn", "fields"])
+
+# path: "State.Name", "Tags[0].Value", ...
+FieldChange = namedtuple("FieldChange", ["path", "old", "new"])
+
+# (arn, data or a callable returning data, content hash or None)
+Record = Tuple[str, Any, Optional[str]]
+
+_SEPARATORS = re.compile("[:/]")
+
+# arns of the files of a cli output directory: paths drop the empty components of
+# arns (s3, iam...) and the separator of resource ids, they can not be read back
+ARNS_FILE = "arns.jsonl"
+
+# arn service and type which are not the skew resource path
+_ARN_TYPES = {("elasticfilesystem", "file-system-id"): "aws.efs.filesystem"}
+
+_MISSING = object()
+
+
+def sort_key(arn: str) -> Tuple[str, ...]:
+    """Return the order of a resource in a snapshot (arn components)."""
+    return tuple(_SEPARATORS.split(arn))
+
+
+def _read_json(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_arns(path: str) -> Dict[str, str]:
+    """Return the arns of the files of an output directory (by path relative to the directory, ``/`` separated)."""
+    arns = {}
+    try:
+        with open(os.path.join(path, ARNS_FILE)) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    arns[record["path"]] = record["arn"]
+    except FileNotFoundError:
+        pass
+    return arns
+
+
+def write_arns(path: str, arns: Dict[str, str]):
+    """Add arns of files (by relative path) to the arns of an output directory."""
+    from skew.store import replace_file
+
+    arns = {**read_arns(path), **arns}
+    fd, tmp = tempfile.mkstemp(dir=path)
+    with os.fdopen(fd, "w") as f:
+        for relative, arn in sorted(arns.items()):
+            f.write(json.dumps({"path": relative, "arn": arn}) + "\n")
+    replace_file(tmp, os.path.join(path, ARNS_FILE))
+
+
+def _path_arn(relative: str) -> str:
+    # output directories without arns file: the resource id is assumed to be separated by "/"
+    parts = relative[: -len(".json")].split("/")
+    return ":".join(parts[:-1]) + "/" + parts[-1] if len(parts) > 6 else ":".join(parts)
+
+
+def read_directory(path: str) -> Iterator[Record]:
+    """Read a cli output directory, sorted by arn components.
+
+    Arns are read from ``ARNS_FILE``, arns of files which are not listed are
+    rebuilt from their paths (``arn/aws/ec2/us-east-1/123456789012/instance/i-1234.json``
+    is ``arn:aws:ec2:us-east-1:123456789012:instance/i-1234``).  Data is read one
+    resource at a time.
+    """
+    arns = read_arns(path)
+    files = []
+    for directory, _, names in os.walk(path):
+        for name in names:
+            if name.endswith(".json"):
+                file_path = os.path.join(directory, name)
+                relative = os.path.relpath(file_path, path).replace(os.sep, "/")
+                arn = arns.get(relative) or _path_arn(relative)
+                files.append((sort_key(arn), arn, file_path))
+    files.sort()
+    for _, arn, file_path in files:
+        yield arn, _read_json(file_path), None
+
+
+def read_jsonl(path: str) -> Iterator[Record]:
+    """Read a json lines snapshot (records must be sorted by ``sort_key`` of their arn).
+
+    Records without data are read from the snapshot store of the file (``skew.store`` manifest).
+    """
+    objects = None
+    previous = None
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = sort_key(record["arn"])
+            if previous is not None and key < previous:
+                raise ValueError(f"{path}: {record['arn']} is not sorted")
+            previous = key
+            if "data" not in record and record.get("hash"):
+                if objects is None:
+                    from skew.store import ObjectStore
+
+                    objects = ObjectStore.for_manifest(path)
+                yield record["arn"], partial(objects.get, record["hash"]), record["hash"]
+            else:
+                yield record["arn"], record.get("data"), record.get("hash")
+
+
+def read_snapshot(path: str) -> Iterator[Record]:
+    """Read a snapshot directory or json lines file."""
+    return read_directory(path) if os.path.isdir(path) else read_jsonl(path)
+
+
+def _resource_class(arn: str):
+    from skew.resources import find_resource_class
+
+    components = sort_key(arn)
+    if len(components) < 6:
+        return None
+    provider, service, resource_type = components[1], components[2], components[5]
+    resource_path = _ARN_TYPES.get((service, resource_type), f"{provider}.{service}.{resource_type}")
+    try:
+        return find_resource_class(resource_path)
+    except (KeyError, ImportError):
+        return None
+
+
+def canonicalize(arn: str, data):
+    """Apply ``sleek_data`` of the resource class of an arn to data and remove volatile fields (in place)."""
+    from skew.resources.json_dump import camel_to_snake
+
+    cls = _resource_class(arn)
+    if cls is not None and isinstance(data, dict):
+        cls.sleek_data(data)
+        for field in getattr(cls.Meta, "volatile", ()):
+            # raw or normalized output
+            data.pop(field, None)
+            data.pop(camel_to_snake(field), None)
+    return data
+
+
+def _data(record: Record):
+    return record[1]() if callable(record[1]) else record[1]
+
+
+def diff_data(old, new, path: str = "") -> List[FieldChange]:
+    """Return field changes between two resource data.
+
+    Dictionaries are compared by key, lists of the same length by index,
+    other values (and lists of different lengths) as a whole.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in sorted(set(old) | set(new), key=str):
+            child = f"{path}.{key}" if path else str(key)
+            changes.extend(diff_data(old.get(key, _MISSING), new.get(key, _MISSING), child))
+        return [
+            FieldChange(c.path, None if c.old is _MISSING else c.old, None if c.new is _MISSING else c.new)
+            for c in changes
+        ]
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        for index, (o, n) in enumerate(zip(old, new)):
+            changes.extend(diff_data(o, n, f"{path}[{index}]"))
+        return changes
+    return [FieldChange(path, old, new)]
+
+
+def diff(old: Iterable[Record], new: Iterable[Record]) -> Iterator[Change]:
+    """Merge two snapshot streams sorted by ``sort_key`` and yield changes.
+
+    Parameters:
+        old (Iterable[Record]): (arn, data, hash) of the old snapshot (data may be a callable)
+        new (Iterable[Record]): (arn, data, hash) of the new snapshot (data may be a callable)
+    """
+    old, new = iter(old), iter(new)
+    o, n = next(old, None), next(new, None)
+    while o is not None or n is not None:
+        o_key = sort_key(o[0]) if o is not None else None
+        n_key = sort_key(n[0]) if n is not None else None
+        if n is None or (o is not None and o_key < n_key):
+            yield Change(REMOVED, o[0], [])
+            o = next(old, None)
+        elif o is None or n_key < o_key:
+            yield Change(ADDED, n[0], [])
+            n = next(new, None)
+        else:
+            if not (o[2] and o[2] == n[2]):
+                fields = diff_data(canonicalize(o[0], _data(o)), canonicalize(n[0], _data(n)))
+                if fields:
+                    yield Change(CHANGED, n[0], fields)
+            o, n = next(old, None), next(new, None)
+
+
+def diff_snapshots(old_path: str, new_path: str) -> Iterator[Change]:
+    """Yield changes between two snapshots (directories, json lines files or store manifests)."""
+    return diff(read_snapshot(old_path), read_snapshot(new_path))
@@ -0,0 +1,283 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Relationship graph of scanned resources.
+
+Relations come from ``Resource.relations`` (``Meta.relations`` of resource
+classes: vpc, subnets, security groups, network interfaces, load balancers,
+target groups, auto scaling groups, launch templates...), references are
+resolved in the account and region of the resource, references to resources
+which are not in the graph are dropped.
+
+Resources are numbered in arn order (an arn is found by bisection), and
+edges are stored as compressed sparse rows: for each direction an ``array``
+of offsets (one per node, plus one) and an ``array`` of target nodes, i.e.
+4 bytes per edge and direction, instead of dictionaries and lists of python
+objects.  A graph is built once
+(resources are added, then ``build`` resolves and sorts the relations, and
+drops the identifier index), then queried and serialized (``save`` and
+``load``).
+"""
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+__all__ = ["OUTGOING", "INCOMING", "BOTH", "RelationGraph"]
+
+# resources referenced by a resource
+OUTGOING = "outgoing"
+# resources referencing a resource (e.g. blast radius of a vpc)
+INCOMING = "incoming"
+BOTH = "both"
+
+FORMAT_VERSION = 1
+# node numbers (4 bytes)
+_TYPECODE = "I"
+
+_NONE = 0xFFFFFFFF
+
+
+def _scope(arn: str) -> Tuple[str, str]:
+    """Return account and region of an arn."""
+    parts = arn.split(":", 5)
+    if len(parts) < 5:
+        return "", ""
+    return parts[4], parts[3]
+
+
+def _reverse(offsets: array, targets: array) -> Tuple[array, array]:
+    """Return offsets and sources of the reversed edges (counting sort)."""
+    size = len(offsets) - 1
+    itemsize = array(_TYPECODE).itemsize
+    reverse_offsets = array(_TYPECODE, bytes(itemsize * (size + 1)))
+    for target in targets:
+        reverse_offsets[target + 1] += 1
+    for node in range(size):
+        reverse_offsets[node + 1] += reverse_offsets[node]
+    position = reverse_offsets[:size]
+    sources = array(_TYPECODE, bytes(itemsize * len(targets)))
+    for source in range(size):
+        for target in targets[offsets[source] : offsets[source + 1]]:
+            sources[position[target]] = source
+            position[target] += 1
+    return reverse_offsets, sources
+
+
+class RelationGraph(object):
+    """Resources and their relations, with integer nodes and array adjacency.
+
+    Nodes are the indexes of the arns of the resources in ``arns``, which is
+    sorted by ``build``.
+
+    Parameters:
+        resources (Iterable[Resource]): scanned resources (e.g. ``skew.scan(...)``)
+    """
+
+    def __init__(self, resources: Iterable = ()):
+        self.arns: List[str] = []
+        # arn: insertion number (until build)
+        self._nodes: Optional[Dict[str, int]] = {}
+        # (account, region, service, type, identifier) or arn: key number
+        self._keys: Optional[Dict[object, int]] = {}
+        # key number: insertion number (_NONE while unknown)
+        self._key_nodes = array(_TYPECODE)
+        # references of resources (key numbers), from the offset of their insertion number
+        self._reference_offsets = array(_TYPECODE, [0])
+        self._references = array(_TYPECODE)
+        self._out: Optional[Tuple[array, array]] = None
+        self._in: Optional[Tuple[array, array]] = None
+        for resource in resources:
+            self.add(resource)
+
+    def __len__(self) -> int:
+        return len(self.arns)
+
+    def __contains__(self, arn: str) -> bool:
+        self.build()
+        index = bisect_left(self.arns, arn)
+        return index < len(self.arns) and self.arns[index] == arn
+
+    def add(self, resource):
+        """Add a resource and its relations (see ``Resource.relations``)."""
+        self.add_node(resource.arn, resource.Meta.service, resource.resourcetype, resource.id, resource.relations())
+
+    def add_node(
+        self,
+        arn: str,
+        service: str,
+        resource_type: str,
+        identifier: str,
+        relations: Iterable[Tuple[str, str, str]] = (),
+    ):
+        """Add a resource and its relations.
+
+        Parameters:
+            arn (str): resource arn
+            service (str): skew service name
+            resource_type (str): resource type
+            identifier (str): resource identifier
+            relations (Iterable[Tuple[str, str, str]]): service, type and identifier (or arn) of referenced resources
+        """
+        if self._keys is None:
+            raise ValueError("graph is built, resources can not be added")
+        if arn in self._nodes:
+            raise ValueError(f"{arn} is already in the graph")
+        node = self._nodes[arn] = len(self.arns)
+        self.arns.append(arn)
+        account, region = _scope(arn)
+        keys, key_nodes = self._keys, self._key_nodes
+        key = (account, region, service, resource_type, identifier)
+        number = keys.get(key)
+        if number is None:
+            keys[key] = len(key_nodes)
+            key_nodes.append(node)
+        else:
+            key_nodes[number] = node
+        numbers = set()
+        for target_service, target_type, target in relations:
+            # arn references are resolved by build
+            key = target if target.startswith("arn:") else (account, region, target_service, target_type, target)
+            number = keys.get(key)
+            if number is None:
+                number = keys[key] = len(key_nodes)
+                key_nodes.append(_NONE)
+            numbers.add(number)
+        self._references.extend(numbers)
+        self._reference_offsets.append(len(self._references))
+
+    def build(self):
+        """Resolve references, sort arns and edges (done by the first query).
+
+        Resources can not be added to a built graph.
+        """
+        if self._out is not None:
+            return
+        key_nodes, references, reference_offsets = self._key_nodes, self._references, self._reference_offsets
+        for key, number in self._keys.items():
+            if isinstance(key, str) and key_nodes[number] == _NONE:
+                key_nodes[number] = self._nodes.get(key, _NONE)
+        self._keys = self._nodes = None
+        # nodes are renumbered in arn order
+        order = sorted(range(len(self.arns)), key=self.arns.__getitem__)
+        rank = array(_TYPECODE, bytes(array(_TYPECODE).itemsize * len(order)))
+        for node, inserted in enumerate(order):
+            rank[inserted] = node
+        offsets, targets = array(_TYPECODE, [0]), array(_TYPECODE)
+        for inserted in order:
+            for number in references[reference_offsets[inserted] : reference_offsets[inserted + 1]]:
+                target = key_nodes[number]
+                if target != _NONE and target != inserted:
+                    targets.append(rank[target])
+            offsets.append(len(targets))
+        self.arns = [self.arns[inserted] for inserted in order]
+        self._key_nodes = self._reference_offsets = self._references = None
+        self._out = (offsets, targets)
+        self._in = _reverse(offsets, targets)
+
+    @property
+    def edge_count(self) -> int:
+        """Return the number of resolved relations."""
+        self.build()
+        return len(self._out[1])
+
+    def node(self, arn: str) -> int:
+        """Return the node of an arn (KeyError if unknown)."""
+        self.build()
+        index = bisect_left(self.arns, arn)
+        if index == len(self.arns) or self.arns[index] != arn:
+            raise KeyError(arn)
+        return index
+
+    def successors(self, node: int) -> Sequence[int]:
+        """Return nodes referenced by a node."""
+        self.build()
+        offsets, targets = self._out
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def predecessors(self, node: int) -> Sequence[int]:
+        """Return nodes referencing a node."""
+        self.build()
+        offsets, targets = self._in
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def reachable(self, arn: str, direction: str = INCOMING, max_depth: Optional[int] = None) -> List[str]:
+        """Return arns of resources reachable from a resource (breadth first).
+
+        Parameters:
+            arn (str): start resource
+            direction (str): ``OUTGOING``, ``INCOMING`` (default: resources depending on the start resource)
+                or ``BOTH``
+            max_depth (Optional[int]): maximum number of relations from the start resource
+        """
+        self.build()
+        tables = {OUTGOING: (self._out,), INCOMING: (self._in,), BOTH: (self._out, self._in)}[direction]
+        start = self.node(arn)
+        visited = bytearray(len(self.arns))
+        visited[start] = 1
+        found: List[int] = []
+        frontier = [start]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            reached = []
+            for node in frontier:
+                for offsets, targets in tables:
+                    for target in targets[offsets[node] : offsets[node + 1]]:
+                        if not visited[target]:
+                            visited[target] = 1
+                            reached.append(target)
+            found.extend(reached)
+            frontier = reached
+            depth += 1
+        return [self.arns[node] for node in found]
+
+    def save(self, path: str):
+        """Write the graph: a json header line (version, arns) then the adjacency arrays."""
+        self.build()
+        header = {
+            "version": FORMAT_VERSION,
+            "typecode": _TYPECODE,
+            "itemsize": array(_TYPECODE).itemsize,
+            "byteorder": sys.byteorder,
+            "edges": len(self._out[1]),
+            "arns": self.arns,
+        }
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for table in (self._out, self._in):
+                for values in table:
+                    values.tofile(f)
+
+    @classmethod
+    def load(cls, path: str) -> "RelationGraph":
+        """Read a graph written by ``save``."""
+        graph = cls()
+        with open(path, "rb") as f:
+            header = json.loads(f.readline().decode("utf-8"))
+            if header["version"] != FORMAT_VERSION or header["itemsize"] != array(_TYPECODE).itemsize:
+                raise ValueError(f"{path}: unsupported graph format")
+            graph.arns = header["arns"]
+            size, edges = len(graph.arns), header["edges"]
+            tables = []
+            for _ in range(2):
+                offsets, targets = array(_TYPECODE), array(_TYPECODE)
+                offsets.fromfile(f, size + 1)
+                targets.fromfile(f, edges)
+                if header["byteorder"] != sys.byteorder:
+                    offsets.byteswap()
+                    targets.byteswap()
+                tables.append((offsets, targets))
+        graph._out, graph._in = tables
+        graph._keys = graph._nodes = graph._key_nodes = graph._reference_offsets = graph._references = None
+        return graph
@@ -0,0 +1,223 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In memory inventory of scanned resources.
+
+An ``Inventory`` indexes the resources of a scan by arn, (service, type),
+region, account, tag key and tag key/value, and keeps the parent to children
+relation given by ``Resource.parent`` (the parent identifier, e.g. the image
+of an instance, is resolved in the account and region of the child).
+
+Indexes are dictionaries of arns (insertion ordered sets), so that queries
+cost the size of their result, and resources can be added or removed one by
+one.  An inventory is not thread safe: build it, then query it from any
+number of threads.
+"""
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["Inventory"]
+
+# (account, region, resource id)
+_Key = Tuple[str, str, str]
+
+
+def _arn_scope(arn: str) -> Tuple[str, str]:
+    """Return region and account of an arn."""
+    parts = arn.split(":", 5)
+    if len(parts) < 5:
+        return "", ""
+    return parts[3], parts[4]
+
+
+def _parent_id(resource) -> Optional[str]:
+    try:
+        return resource.parent
+    except (KeyError, IndexError, TypeError):
+        # parent field missing in data
+        return None
+
+
+class _Index(object):
+    """Map a key to an insertion ordered set of arns."""
+
+    __slots__ = ("_entries",)
+
+    def __init__(self):
+        self._entries: Dict[object, Dict[str, None]] = {}
+
+    def add(self, key, arn: str):
+        self._entries.setdefault(key, {})[arn] = None
+
+    def discard(self, key, arn: str):
+        arns = self._entries.get(key)
+        if arns is not None:
+            arns.pop(arn, None)
+            if not arns:
+                del self._entries[key]
+
+    def get(self, key) -> Dict[str, None]:
+        return self._entries.get(key, {})
+
+    def keys(self):
+        return self._entries.keys()
+
+
+class Inventory(object):
+    """Indexed resources of a scan.
+
+    Parameters:
+        resources (Iterable[Resource]): scanned resources (e.g. ``skew.scan(...)``)
+    """
+
+    def __init__(self, resources: Iterable = ()):
+        self._resources: Dict[str, object] = {}
+        self._by_type = _Index()
+        self._by_region = _Index()
+        self._by_account = _Index()
+        self._by_tag_key = _Index()
+        self._by_tag = _Index()
+        self._by_id = _Index()
+        self._children = _Index()
+        # arn: (type key, region, account, tags, id key, parent key)
+        self._keys: Dict[str, Tuple] = {}
+        self.extend(resources)
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def __contains__(self, arn: str) -> bool:
+        return arn in self._resources
+
+    def __iter__(self) -> Iterator:
+        return iter(self._resources.values())
+
+    def add(self, resource):
+        """Add (or replace) a resource."""
+        arn = resource.arn
+        if arn in self._resources:
+            self.remove(arn)
+        region, account = _arn_scope(arn)
+        type_key = (resource.Meta.service, resource.resourcetype)
+        tags = dict(resource.tags or {})
+        id_key = (account, region, resource.id)
+        parent_id = _parent_id(resource)
+        parent_key = (account, region, parent_id) if parent_id else None
+
+        self._resources[arn] = resource
+        self._keys[arn] = (type_key, region, account, tags, id_key, parent_key)
+        self._by_type.add(type_key, arn)
+        self._by_region.add(region, arn)
+        self._by_account.add(account, arn)
+        for key, value in tags.items():
+            self._by_tag_key.add(key, arn)
+            self._by_tag.add((key, value), arn)
+        self._by_id.add(id_key, arn)
+        if parent_key is not None:
+            self._children.add(parent_key, arn)
+
+    def extend(self, resources: Iterable):
+        """Add resources."""
+        for resource in resources:
+            self.add(resource)
+
+    def remove(self, arn: str):
+        """Remove a resource (KeyError if unknown)."""
+        resource = self._resources.pop(arn)
+        type_key, region, account, tags, id_key, parent_key = self._keys.pop(arn)
+        self._by_type.discard(type_key, arn)
+        self._by_region.discard(region, arn)
+        self._by_account.discard(account, arn)
+        for key, value in tags.items():
+            self._by_tag_key.discard(key, arn)
+            self._by_tag.discard((key, value), arn)
+        self._by_id.discard(id_key, arn)
+        if parent_key is not None:
+            self._children.discard(parent_key, arn)
+        return resource
+
+    def get(self, arn: str, default=None):
+        """Return the resource of an arn."""
+        return self._resources.get(arn, default)
+
+    def _resolve(self, arns: Iterable[str]) -> List:
+        return [self._resources[arn] for arn in arns]
+
+    def by_type(self, service: str, resource_type: str) -> List:
+        """Return resources of a skew service and resource type (``"ec2", "instance"``)."""
+        return self._resolve(self._by_type.get((service, resource_type)))
+
+    def by_region(self, region: str) -> List:
+        """Return resources of a region."""
+        return self._resolve(self._by_region.get(region))
+
+    def by_account(self, account: str) -> List:
+        """Return resources of an account."""
+        return self._resolve(self._by_account.get(account))
+
+    def by_tag(self, key: str, value: Optional[str] = None) -> List:
+        """Return resources with a tag key (and value)."""
+        return self._resolve(self._by_tag_key.get(key) if value is None else self._by_tag.get((key, value)))
+
+    def find(
+        self,
+        service: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        region: Optional[str] = None,
+        account: Optional[str] = None,
+        tags: Optional[Dict[str, Optional[str]]] = None,
+    ) -> List:
+        """Return resources matching all criteria.
+
+        The smallest index of the criteria is iterated, other criteria are
+        checked with the other indexes.
+
+        Parameters:
+            service (Optional[str]): skew service name (requires ``resource_type``)
+            resource_type (Optional[str]): resource type
+            region (Optional[str]): region name
+            account (Optional[str]): account identifier
+            tags (Optional[Dict[str, Optional[str]]]): tag values (None for any value)
+        """
+        candidates = []
+        if resource_type is not None:
+            candidates.append(self._by_type.get((service, resource_type)))
+        if region is not None:
+            candidates.append(self._by_region.get(region))
+        if account is not None:
+            candidates.append(self._by_account.get(account))
+        for key, value in (tags or {}).items():
+            candidates.append(self._by_tag_key.get(key) if value is None else self._by_tag.get((key, value)))
+        if not candidates:
+            return list(self._resources.values())
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return self._resolve(arn for arn in smallest if all(arn in other for other in others))
+
+    def parent(self, arn: str):
+        """Return the parent of a resource (None if it has no parent or if the parent is not in the inventory)."""
+        parent_key = self._keys[arn][5]
+        if parent_key is None:
+            return None
+        parents = self._by_id.get(parent_key)
+        return self._resources[next(iter(parents))] if parents else None
+
+    def children(self, arn: str) -> List:
+        """Return resources whose parent is a resource."""
+        return self._resolve(self._children.get(self._keys[arn][4]))
+
+    def tag_keys(self) -> List[str]:
+        """Return tag keys of resources."""
+        return list(self._by_tag_key.keys())
@@ -0,0 +1,242 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Incremental CloudWatch metric cache."""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from skew.config import get_cache_dir
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["MetricCache"]
+
+
+def _epoch(value) -> int:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp())
+    return int(value)
+
+
+def _datetime(epoch: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(epoch, tz=datetime.timezone.utc)
+
+
+class MetricCache(object):
+    """Local store of ``get_metric_statistics`` datapoints.
+
+    Datapoints are stored per (dimensions, namespace, metric name, statistic, period)
+    with the time range they cover.  A request only fetches the part of its
+    window which is not covered yet, and merges it with the cached datapoints.
+
+    The most recent ``settle`` seconds are never considered as covered, as
+    CloudWatch may still aggregate late datapoints on them.
+
+    A request merges datapoints in a copy of the cached entry, which then
+    replaces it: concurrent requests never see a partially merged entry.
+
+    Parameters:
+        path (Optional[str]): cache directory (default ``<skew cache dir>/metrics``)
+        settle (int): seconds before now which are always fetched again (default 10 minutes)
+        retention (int): seconds of datapoints kept in cache (default 15 days, CloudWatch max is 14)
+    """
+
+    def __init__(self, path: Optional[str] = None, settle: int = 600, retention: int = 15 * 24 * 3600):
+        self._path = path if path else get_cache_dir("metrics")
+        self._settle = settle
+        self._retention = retention
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(dimensions: Sequence[Dict], namespace: str, metric_name: str, statistic: str, period: int) -> str:
+        """Return cache key of a metric statistic."""
+        dims = sorted((d["Name"], d["Value"]) for d in dimensions)
+        raw = json.dumps([namespace, metric_name, dims, statistic, int(period)])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self._path, key[:2], f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Return cached entry ``{"start", "end", "unit", "points"}`` or None."""
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+        try:
+            with open(self._file(key)) as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry = {
+            "start": raw["start"],
+            "end": raw["end"],
+            "unit": raw.get("unit"),
+            "points": {int(t): v for t, v in raw["points"]},
+        }
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def save(self, key: str, entry: Dict):
+        """Store an entry (atomically replace the cache file), it must not be modified afterwards."""
+        with self._lock:
+            self._entries[key] = entry
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        raw = {
+            "start": entry["start"],
+            "end": entry["end"],
+            "unit": entry["unit"],
+            "points": sorted(entry["points"].items()),
+        }
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(raw, f)
+            os.replace(tmp, path)
+        except OSError:
+            LOG.warning("Unable to write metric cache %s", path)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def clear(self):
+        """Forget in memory entries (files are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metric_statistics(
+        self,
+        cloudwatch,
+        start,
+        end,
+        dimensions: Sequence[Dict],
+        namespace: str,
+        metric_name: str,
+        statistics: Sequence[str],
+        period: int,
+        now=None,
+    ) -> List[Dict]:
+        """Return datapoints of ``start <= Timestamp < end``, fetching only missing ranges.
+
+        Parameters:
+            cloudwatch: cloudwatch ``AWSClient``
+            start (datetime|int): window start
+            end (datetime|int): window end
+            dimensions (Sequence[Dict]): metric dimensions
+            namespace (str): metric namespace
+            metric_name (str): metric name
+            statistics (Sequence[str]): statistics
+            period (int): period in seconds
+            now (datetime|int): current time (default utc now)
+
+        Returns:
+            (List[Dict]): datapoints like ``get_metric_statistics``, sorted by Timestamp
+        """
+        period = int(period)
+        start = _epoch(start) // period * period
+        end = _epoch(end)
+        now = _epoch(now if now is not None else datetime.datetime.utcnow())
+        settled = (now - self._settle) // period * period
+        oldest = (now - self._retention) // period * period
+
+        keys = {statistic: self.key(dimensions, namespace, metric_name, statistic, period) for statistic in statistics}
+        entries = {}
+        plan: Dict[Tuple[int, int], List[str]] = {}
+        for statistic, key in keys.items():
+            entry = self.load(key)
+            if entry is None or entry["end"] < start or entry["start"] > end:
+                # nothing usable, start a new range for this window
+                entry = {"start": start, "end": start, "unit": None, "points": {}}
+            else:
+                # cached entries are shared by threads: they are replaced by save, never modified
+                entry = {**entry, "points": dict(entry["points"])}
+            entries[statistic] = entry
+            for missing in self._missing(entry, start, end):
+                plan.setdefault(missing, []).append(statistic)
+
+        for (lower, upper), names in plan.items():
+            LOG.debug("fetching %s %s [%s, %s[", metric_name, names, lower, upper)
+            datapoints = cloudwatch.call(
+                "get_metric_statistics",
+                query="Datapoints",
+                Dimensions=dimensions,
+                Namespace=namespace,
+                MetricName=metric_name,
+                StartTime=_datetime(lower).isoformat(),
+                EndTime=_datetime(upper).isoformat(),
+                Statistics=names,
+                Period=period,
+            )
+            for statistic in names:
+                self._merge(entries[statistic], datapoints or [], statistic, lower, upper, settled)
+
+        for statistic in {name for names in plan.values() for name in names}:
+            self._prune(entries[statistic], oldest)
+            self.save(keys[statistic], entries[statistic])
+
+        return self._datapoints(entries, start, end)
+
+    @staticmethod
+    def _missing(entry: Dict, start: int, end: int) -> List[Tuple[int, int]]:
+        if entry["end"] <= entry["start"]:
+            return [(start, end)]
+        missing = []
+        if start < entry["start"]:
+            missing.append((start, entry["start"]))
+        if entry["end"] < end:
+            missing.append((entry["end"], end))
+        return missing
+
+    @staticmethod
+    def _merge(entry: Dict, datapoints: List[Dict], statistic: str, lower: int, upper: int, settled: int):
+        points = entry["points"]
+        for t in [t for t in points if lower <= t < upper]:
+            del points[t]
+        for datapoint in datapoints:
+            if statistic in datapoint:
+                points[_epoch(datapoint["Timestamp"])] = datapoint[statistic]
+                entry["unit"] = datapoint.get("Unit", entry["unit"])
+        covered_end = max(lower, min(upper, settled))
+        if entry["end"] <= entry["start"]:
+            entry["start"], entry["end"] = lower, covered_end
+        else:
+            entry["start"] = min(entry["start"], lower)
+            entry["end"] = max(entry["end"], covered_end)
+
+    @staticmethod
+    def _prune(entry: Dict, oldest: int):
+        if entry["start"] < oldest:
+            entry["points"] = {t: v for t, v in entry["points"].items() if t >= oldest}
+            entry["start"] = min(oldest, entry["end"])
+
+    @staticmethod
+    def _datapoints(entries: Dict[str, Dict], start: int, end: int) -> List[Dict]:
+        result: Dict[int, Dict] = {}
+        for statistic, entry in entries.items():
+            for t, value in entry["points"].items():
+                if start <= t < end:
+                    datapoint = result.get(t)
+                    if datapoint is None:
+                        datapoint = result[t] = {"Timestamp": _datetime(t)}
+                        if entry["unit"]:
+                            datapoint["Unit"] = entry["unit"]
+                    datapoint[statistic] = value
+        return [result[t] for t in sorted(result)]
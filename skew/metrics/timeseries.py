@@ -0,0 +1,270 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Numpy backed CloudWatch metric time series."""
+import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from botocore.utils import parse_timestamp
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("skew.metrics.timeseries requires numpy, install it with 'pip install skew[metrics]'")
+
+__all__ = ["MetricTimeSeries", "stack"]
+
+# keys of a CloudWatch datapoint which are not statistics
+_NOT_A_STATISTIC = ("Timestamp", "Unit", "ExtendedStatistics")
+
+# how a statistic is aggregated when several datapoints fall into the same bucket
+_AGGREGATIONS = {
+    "Average": "mean",
+    "Sum": "sum",
+    "SampleCount": "sum",
+    "Maximum": "max",
+    "Minimum": "min",
+}
+
+
+def _to_epoch(timestamp) -> int:
+    """Convert a CloudWatch timestamp (datetime or ISO 8601 string) to epoch seconds."""
+    if isinstance(timestamp, str):
+        timestamp = parse_timestamp(timestamp)
+    if isinstance(timestamp, datetime.datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+        return int(timestamp.timestamp())
+    return int(timestamp)
+
+
+def _statistic_value(datapoint: Dict, statistic: str) -> float:
+    if statistic in datapoint:
+        return datapoint[statistic]
+    return datapoint.get("ExtendedStatistics", {}).get(statistic, np.nan)
+
+
+class MetricTimeSeries(object):
+    """Time series of a single CloudWatch metric.
+
+    Timestamps are stored in a sorted ``datetime64[s]`` array and each statistic
+    in a ``float64`` array of the same length.  Missing values are ``nan``.
+
+    Parameters:
+        timestamps: sorted array of ``datetime64[s]``
+        values (Dict[str, np.ndarray]): values per statistic name
+        period (int): period in seconds of the datapoints
+        unit (Optional[str]): CloudWatch unit of the metric
+    """
+
+    def __init__(self, timestamps, values: Dict[str, "np.ndarray"], period: int, unit: Optional[str] = None):
+        self.timestamps = timestamps
+        self.values = values
+        self.period = int(period)
+        self.unit = unit
+
+    @classmethod
+    def from_datapoints(
+        cls, datapoints: Iterable[Dict], period: int, statistics: Optional[Sequence[str]] = None
+    ) -> "MetricTimeSeries":
+        """Build a time series from the ``Datapoints`` of ``get_metric_statistics``.
+
+        Parameters:
+            datapoints (Iterable[Dict]): CloudWatch datapoints, in any order
+            period (int): period used to retrieve the datapoints
+            statistics (Optional[Sequence[str]]): statistics to keep (default all found in datapoints)
+        """
+        datapoints = list(datapoints) if datapoints else []
+        if statistics is None:
+            found = set()
+            for datapoint in datapoints:
+                found.update(k for k in datapoint if k not in _NOT_A_STATISTIC)
+                found.update(datapoint.get("ExtendedStatistics", {}))
+            statistics = sorted(found)
+        epochs = np.fromiter((_to_epoch(d["Timestamp"]) for d in datapoints), dtype=np.int64, count=len(datapoints))
+        order = np.argsort(epochs, kind="stable")
+        values = {
+            statistic: np.fromiter(
+                (_statistic_value(d, statistic) for d in datapoints), dtype=np.float64, count=len(datapoints)
+            )[order]
+            for statistic in statistics
+        }
+        unit = datapoints[0].get("Unit") if datapoints else None
+        return cls(epochs[order].astype("datetime64[s]"), values, period, unit)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, statistic: str):
+        return self.values[statistic]
+
+    def __repr__(self):
+        return "MetricTimeSeries(points=%d, period=%d, statistics=%s)" % (len(self), self.period, self.statistics)
+
+    @property
+    def statistics(self) -> List[str]:
+        """Return statistic names."""
+        return list(self.values.keys())
+
+    @property
+    def epochs(self):
+        """Return timestamps as an int64 array of epoch seconds."""
+        return self.timestamps.astype(np.int64)
+
+    def window(self, start=None, end=None) -> "MetricTimeSeries":
+        """Return datapoints with ``start <= timestamp < end``."""
+        epochs = self.epochs
+        lower = 0 if start is None else np.searchsorted(epochs, _to_epoch(start), side="left")
+        upper = len(epochs) if end is None else np.searchsorted(epochs, _to_epoch(end), side="left")
+        return MetricTimeSeries(
+            self.timestamps[lower:upper],
+            {k: v[lower:upper] for k, v in self.values.items()},
+            self.period,
+            self.unit,
+        )
+
+    def resample(self, period: int, how: Optional[str] = None) -> "MetricTimeSeries":
+        """Aggregate datapoints into buckets of ``period`` seconds.
+
+        Buckets are aligned on the epoch and labelled with their start time.
+        Each statistic is aggregated with its natural function (``Sum`` are summed,
+        ``Maximum`` are maxed, ...) unless ``how`` forces one of
+        ``mean``, ``sum``, ``max`` or ``min``.  ``nan`` values are ignored.
+        """
+        period = int(period)
+        buckets = self.epochs // period
+        keys, inverse = np.unique(buckets, return_inverse=True)
+        values = {
+            statistic: _aggregate(data, inverse, len(keys), how or _AGGREGATIONS.get(statistic, "mean"))
+            for statistic, data in self.values.items()
+        }
+        return MetricTimeSeries((keys * period).astype("datetime64[s]"), values, period, self.unit)
+
+    def fill_gaps(self, start=None, end=None, method: str = "nan", value: float = 0.0) -> "MetricTimeSeries":
+        """Return a time series with one datapoint per period between ``start`` and ``end``.
+
+        Parameters:
+            start: first timestamp of the grid (default first datapoint)
+            end: grid upper bound, excluded (default after last datapoint)
+            method (str): how to fill missing datapoints, one of
+                ``nan``, ``value`` (use ``value``), ``ffill`` (last known value)
+                or ``interpolate`` (linear interpolation)
+            value (float): value used by the ``value`` method
+        """
+        if method not in ("nan", "value", "ffill", "interpolate"):
+            raise ValueError("Unknown fill method %s" % method)
+        epochs = self.epochs
+        if start is None:
+            start = int(epochs[0]) if len(epochs) else 0
+        if end is None:
+            end = int(epochs[-1]) + self.period if len(epochs) else start
+        start, end = _to_epoch(start), _to_epoch(end)
+        grid = np.arange(start, end, self.period, dtype=np.int64)
+
+        inside = (epochs >= start) & (epochs < end)
+        positions = (epochs[inside] - start) // self.period
+        values = {}
+        for statistic, data in self.values.items():
+            filled = np.full(len(grid), np.nan)
+            filled[positions] = data[inside]
+            values[statistic] = _fill(filled, method, value)
+        return MetricTimeSeries(grid.astype("datetime64[s]"), values, self.period, self.unit)
+
+    def percentile(self, q, statistic: str = "Average"):
+        """Return the q-th percentile(s) of a statistic, ignoring missing values."""
+        return np.nanpercentile(self.values[statistic], q)
+
+
+def _aggregate(data, inverse, size: int, how: str):
+    valid = ~np.isnan(data)
+    if how in ("mean", "sum"):
+        total = np.bincount(inverse[valid], weights=data[valid], minlength=size)
+        if how == "sum":
+            return total
+        count = np.bincount(inverse[valid], minlength=size)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+    if how in ("max", "min"):
+        result = np.full(size, -np.inf if how == "max" else np.inf)
+        (np.maximum if how == "max" else np.minimum).at(result, inverse[valid], data[valid])
+        result[np.isinf(result)] = np.nan
+        return result
+    raise ValueError("Unknown aggregation %s" % how)
+
+
+def _fill(data, method: str, value: float):
+    missing = np.isnan(data)
+    if method == "nan" or not missing.any():
+        return data
+    if method == "value":
+        data[missing] = value
+        return data
+    present = np.flatnonzero(~missing)
+    if not len(present):
+        return data
+    if method == "ffill":
+        index = np.where(missing, 0, np.arange(len(data)))
+        np.maximum.accumulate(index, out=index)
+        filled = data[index]
+        # nothing to carry forward before the first known value
+        filled[: present[0]] = np.nan
+        return filled
+    # interpolate between known values, keeping edges missing
+    filled = np.interp(np.arange(len(data)), present, data[present])
+    filled[: present[0]] = np.nan
+    filled[present[-1] + 1 :] = np.nan
+    return filled
+
+
+def stack(
+    series: Sequence[MetricTimeSeries],
+    statistic: str = "Average",
+    start=None,
+    end=None,
+    period: Optional[int] = None,
+    method: str = "nan",
+    value: float = 0.0,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Align many time series on a common grid.
+
+    Series with a smaller period than the grid are resampled first.
+
+    Parameters:
+        series (Sequence[MetricTimeSeries]): time series, one per resource
+        statistic (str): statistic to stack (default "Average")
+        start: first timestamp of the grid (default earliest datapoint)
+        end: grid upper bound, excluded (default after latest datapoint)
+        period (Optional[int]): grid period (default largest period of series)
+        method (str): gap filling method, see ``MetricTimeSeries.fill_gaps``
+        value (float): value used by the ``value`` fill method
+
+    Returns:
+        (timestamps, matrix): grid as ``datetime64[s]`` and a 2-D array with one row per series
+    """
+    if period is None:
+        period = max((s.period for s in series), default=60)
+    series = [s if s.period == period else s.resample(period) for s in series]
+    non_empty = [s for s in series if len(s)]
+    if start is None:
+        start = min((int(s.epochs[0]) for s in non_empty), default=0)
+    if end is None:
+        end = max((int(s.epochs[-1]) + period for s in non_empty), default=_to_epoch(start))
+    # align the grid on the period like resample does
+    start = _to_epoch(start) // period * period
+    grid = np.arange(start, _to_epoch(end), period, dtype=np.int64)
+    matrix = np.full((len(series), len(grid)), np.nan)
+    for row, item in enumerate(series):
+        if statistic in item.values and len(item):
+            matrix[row] = item.fill_gaps(start, start + len(grid) * period, method=method, value=value)[statistic]
+        elif method == "value":
+            matrix[row] = value
+    return grid.astype("datetime64[s]"), matrix
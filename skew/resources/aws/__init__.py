@@ -17,8 +17,8 @@ import datetime
 import logging
 from collections import namedtuple
 
-import jmespath
-
+from skew.boto.query import search
+from skew.resources.hydration import hydrate
 from skew.resources.resource import Resource
 
 LOG = logging.getLogger(__name__)
@@ -37,9 +37,16 @@ class MetricData(object):
 
     """
 
-    def __init__(self, data, period):
+    def __init__(self, data, period, statistics=None):
         self.data = data
         self.period = period
+        self.statistics = statistics
+
+    def to_timeseries(self):
+        """Return data as a ``MetricTimeSeries`` (sorted numpy arrays, requires numpy)."""
+        from skew.metrics.timeseries import MetricTimeSeries
+
+        return MetricTimeSeries.from_datapoints(self.data, self.period, self.statistics)
 
 
 class AWSResource(Resource):
@@ -88,9 +95,27 @@ class AWSResource(Resource):
       given type.  But you can also tell it to filter the results by
       passing in a list of id's.  This parameter tells it the name of the
       parameter to use to specify this list of id's.
+    * hydrate - The extra calls needed to get the details of a resource.
+      This is a list of tuples consisting of the data key which receives
+      the result (or None to merge the result into the data) and of an
+      ``attr_spec`` (operation name, jmespath query, parameter name and
+      resource attribute which gives the parameter value).  These calls
+      are made by batch for all resources of an enumeration
+      (see ``skew.resources.hydration``).  A call whose key is not
+      wanted (see ``fields`` scan parameter) is skipped.
+    * volatile - Top level fields which change without a change of the
+      resource (timestamps, usage counters, status).  They are dumped but
+      not part of the content hash (see ``Resource.content_hash``).
+    * relations - The resources referenced by a resource (vpc, subnets,
+      security groups, ...).  This is a tuple of (service, resource type,
+      jmespath query), the query gives identifiers (or arns) of the
+      referenced resources, in the account and region of the resource
+      (see ``skew.graph``).
 
     """
 
+    __slots__ = ("_extra_attribute_loaded", "_hydrated")
+
     class Meta(object):
         type = "awsresource"
 
@@ -108,13 +133,17 @@ class AWSResource(Resource):
     def __init__(self, client, data, query=None):
         super(AWSResource, self).__init__(client=client, data=data, query=query)
         self._extra_attribute_loaded = False
+        # False, None while hydration calls run, True once their results are applied
+        self._hydrated = False
 
     def __repr__(self):
         return self.arn
 
     @property
     def data(self):
-        """Return data and load extra attributes if needed."""
+        """Return data, hydrate and load extra attributes if needed."""
+        if self._hydrated is False:
+            hydrate([self], workers=1)
         if not self._extra_attribute_loaded:
             if hasattr(self, "_load_extra_attribute"):
                 self._load_extra_attribute()
@@ -130,7 +159,7 @@ class AWSResource(Resource):
                     "list_metrics",
                     Dimensions=[{"Name": self.Meta.dimension, "Value": self._id}],
                 )
-                self._metrics = jmespath.search("Metrics", data)
+                self._metrics = search("Metrics", data)
             else:
                 self._metrics = []
         return self._metrics
@@ -190,6 +219,7 @@ class AWSResource(Resource):
         minutes=None,
         statistics=None,
         period=None,
+        cache=None,
     ):
         """Get metric data for this resource.
 
@@ -224,6 +254,11 @@ class AWSResource(Resource):
             * Maximum
             * Minimum
 
+        :type cache: skew.metrics.cache.MetricCache
+        :param cache: An optional metric cache.  Only the part of the
+            time frame which is not already cached is requested to
+            CloudWatch.  Use ``True`` for a cache in the default location.
+
         :returns: A ``MetricData`` object that contains both the CloudWatch
             data as well as the ``period`` used since this value may have
             been calculated by skew.
@@ -243,6 +278,23 @@ class AWSResource(Resource):
         if metric and self._cloudwatch:
             end = datetime.datetime.utcnow()
             start = end - delta
+            if cache:
+                if cache is True:
+                    from skew.metrics.cache import MetricCache
+
+                    cache = MetricCache()
+                datapoints = cache.get_metric_statistics(
+                    self._cloudwatch,
+                    start,
+                    end,
+                    dimensions=metric["Dimensions"],
+                    namespace=metric["Namespace"],
+                    metric_name=metric["MetricName"],
+                    statistics=statistics,
+                    period=period,
+                    now=end,
+                )
+                return MetricData(datapoints, period, statistics)
             data = self._cloudwatch.call(
                 "get_metric_statistics",
                 Dimensions=metric["Dimensions"],
@@ -253,7 +305,7 @@ class AWSResource(Resource):
                 Statistics=statistics,
                 Period=period,
             )
-            return MetricData(jmespath.search("Datapoints", data), period)
+            return MetricData(search("Datapoints", data), period, statistics)
         else:
             raise ValueError("Metric (%s) not available" % metric_name)
 
@@ -286,9 +338,48 @@ class AWSResource(Resource):
         if path:
             kwargs["query"] = path
         data = self._client.call(method, **kwargs)
-        if "ResponseMetadata" in data:
+        if isinstance(data, dict) and "ResponseMetadata" in data:
             del data["ResponseMetadata"]
         return data
 
+    def _hydration_calls(self):
+        """Return the hydration calls ``(resource, key, method, query, kwargs)`` of this resource.
+
+        Calls are returned once, until they fail (see ``_reset_hydration``).
+        """
+        if self._hydrated is not False:
+            return []
+        # in progress: attributes read below do not hydrate again
+        self._hydrated = None
+        calls = []
+        for key, attr_spec in getattr(self.Meta, "hydrate", None) or []:
+            if key is not None and not self._wants(key):
+                continue
+            method, path, param_name, param_value = attr_spec[:4]
+            calls.append((self, key, method, path, {param_name: getattr(self, param_value)}))
+        if not calls:
+            self._hydrated = True
+        return calls
+
+    def _reset_hydration(self):
+        """Forget hydration calls which did not complete, so that they are made again."""
+        if self._hydrated is None:
+            self._hydrated = False
+
+    def _apply_hydration(self, values):
+        """Apply results of hydration calls, a list of ``(key, data)``."""
+        for key, data in values:
+            if isinstance(data, dict) and "ResponseMetadata" in data:
+                del data["ResponseMetadata"]
+            if key is None:
+                if data:
+                    self._data = {**self._data, **data}
+            else:
+                self._data[key] = data
+        if self._query:
+            # the query applies to the hydrated data
+            self.filtered_data = self._query.search(self._data)
+        self._hydrated = True
+
 
 ArnComponents = namedtuple("ArnComponents", ["scheme", "provider", "service", "region", "account", "resource"])
@@ -15,14 +15,15 @@
 
 import logging
 
-import jmespath
-
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class Certificate(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "acm"
         type = "certificate"
@@ -53,4 +54,4 @@ class Certificate(AWSResource):
         detail_op, param_name, detail_path = self.Meta.detail_spec
         params = {param_name: data["CertificateArn"]}
         data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
+        self._data = search(detail_path, data)
@@ -19,6 +19,8 @@ LOG = logging.getLogger(__name__)
 
 
 class RestAPI(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "apigateway"
         type = "restapis"
@@ -13,12 +13,14 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-import jmespath
-
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
+from skew.resources.json_dump import data_key
 
 
 class AutoScalingGroup(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "autoscaling"
         type = "autoScalingGroup"
@@ -30,19 +32,37 @@ class AutoScalingGroup(AWSResource):
         id = "AutoScalingGroupName"
         filter_name = "AutoScalingGroupNames"
         filter_type = "list"
-
-    def __init__(self, client, data, query=None):
-        super(AutoScalingGroup, self).__init__(client, data, query)
-        self._arn_query = jmespath.compile("AutoScalingGroupARN")
+        relations = (
+            ("ec2", "launch-template", "LaunchTemplate.LaunchTemplateId"),
+            (
+                "ec2",
+                "launch-template",
+                "MixedInstancesPolicy.LaunchTemplate.LaunchTemplateSpecification.LaunchTemplateId",
+            ),
+            ("autoscaling", "launchConfiguration", "LaunchConfigurationName"),
+            ("elb", "loadbalancer", "LoadBalancerNames"),
+            ("elbv2", "targetgroup", "TargetGroupARNs"),
+            ("ec2", "instance", "Instances[].InstanceId"),
+        )
 
     @property
     def arn(self):
-        return self._arn_query.search(self.data)
+        return search("AutoScalingGroupARN", self.data)
 
-    def sleek(self):
+    @classmethod
+    def sleek_data(cls, data):
         # Always render lists in the same order to avoid false changes detection
-        self.data["EnabledMetrics"].sort(key=lambda item: item["Metric"])
-        self.data["SuspendedProcesses"].sort(key=str)
+        data.get(data_key(data, "EnabledMetrics"), []).sort(key=lambda item: item[data_key(item, "Metric")])
+        data.get(data_key(data, "SuspendedProcesses"), []).sort(key=str)
+        return data
+
+    @classmethod
+    def relations_data(cls, data):
+        yield from super(AutoScalingGroup, cls).relations_data(data)
+        # comma separated subnet identifiers
+        for subnet in (data.get("VPCZoneIdentifier") or "").split(","):
+            if subnet:
+                yield "ec2", "subnet", subnet
 
     @classmethod
     def set_tags(cls, arn, region, account, tags, resource_id=None, **kwargs):
@@ -70,6 +90,8 @@ class AutoScalingGroup(AWSResource):
 
 
 class LaunchConfiguration(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "autoscaling"
         type = "launchConfiguration"
@@ -82,10 +104,6 @@ class LaunchConfiguration(AWSResource):
         filter_name = "LaunchConfigurationNames"
         filter_type = "list"
 
-    def __init__(self, client, data, query=None):
-        super(LaunchConfiguration, self).__init__(client, data, query)
-        self._arn_query = jmespath.compile("LaunchConfigurationARN")
-
     @property
     def arn(self):
-        return self._arn_query.search(self.data)
+        return search("LaunchConfigurationARN", self.data)
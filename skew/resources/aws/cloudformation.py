@@ -11,12 +11,14 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
-import jmespath
 
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
 
 
 class Stack(AWSResource):
+    __slots__ = ("_resources",)
+
     @classmethod
     def enumerate(cls, arn, region, account, resource_id=None, **kwargs):
         resources = list(super(Stack, cls).enumerate(arn, region, account, resource_id, **kwargs))
@@ -43,7 +45,7 @@ class Stack(AWSResource):
         params = {param_name: self.id}
         if not self._resources:
             data = self._client.call(detail_op, **params)
-            self._resources = jmespath.search(detail_path, data)
+            self._resources = search(detail_path, data)
         for resource in self._resources:
             yield resource
 
@@ -6,6 +6,8 @@ LOG = logging.getLogger(__name__)
 
 
 class CloudfrontResource(AWSResource):
+    __slots__ = ()
+
     @property
     def arn(self):
         return "arn:aws:%s::%s:%s/%s" % (
@@ -17,6 +19,8 @@ class CloudfrontResource(AWSResource):
 
 
 class Distribution(CloudfrontResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "cloudfront"
         type = "distribution"
@@ -22,6 +22,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Domain(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "cloudsearch"
         type = "domain"
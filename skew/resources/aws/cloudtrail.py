@@ -18,11 +18,14 @@ import logging
 from botocore.exceptions import ClientError
 
 from skew.resources.aws import AWSResource
+from skew.resources.filters import is_id_pattern
 
 LOG = logging.getLogger(__name__)
 
 
 class CloudTrail(AWSResource):
+    __slots__ = ()
+
     @classmethod
     def enumerate(cls, arn, region, account, resource_id=None, **kwargs):
 
@@ -34,9 +37,9 @@ class CloudTrail(AWSResource):
                     data = filter(lambda d: account == d["TrailARN"].split(":")[4], data)
                 if region and region != "*":
                     data = filter(lambda d: region == d["HomeRegion"], data)
-                if resource_id and resource_id != "*":
+                if resource_id and resource_id != "*" and not is_id_pattern(resource_id):
                     data = filter(lambda d: cls.filter(arn, resource_id, d), data)
-                return map(lambda d: cls(client, d, arn.query), data)
+                return cls._build_resources(client, data, arn, resource_id=resource_id, **kwargs)
         except ClientError as e:
             LOG.debug(e)
             # if the error is because the resource was not found, be quiet
@@ -55,6 +58,9 @@ class CloudTrail(AWSResource):
         filter_name = None
         detail_spec = ("get_trail", "Trail", "Name", "name")
         status_spec = ("get_trail_status", None, "Name", "name")
+        hydrate = [(None, detail_spec), ("Status", status_spec)]
+        # delivery times and errors
+        volatile = ("Status",)
         id = "Name"
         name = "Name"
         tags_spec = (
@@ -67,14 +73,6 @@ class CloudTrail(AWSResource):
         date = None
         dimension = None
 
-    def __init__(self, client, data, query=None):
-        super(CloudTrail, self).__init__(client, data, query)
-        self._data = {
-            **self._data,
-            **self._feed_from_spec(attr_spec=self.Meta.detail_spec),
-        }
-        self._data["Status"] = self._feed_from_spec(attr_spec=self.Meta.status_spec)
-
     @property
     def arn(self):
         return self._data["TrailARN"]
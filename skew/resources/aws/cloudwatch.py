@@ -20,6 +20,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Alarm(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "cloudwatch"
         type = "alarm"
@@ -45,6 +47,8 @@ class Alarm(AWSResource):
 
 
 class LogGroup(AWSResource):
+    __slots__ = ("_keys",)
+
     class Meta(object):
         service = "logs"
         type = "log-group"
@@ -71,6 +75,7 @@ class LogGroup(AWSResource):
         tags_spec = ("list_tags_log_group", "tags", "logGroupName", "id")
         filter_name = "logGroupNamePrefix"
         filter_type = "dict"
+        prefix_filter_name = "logGroupNamePrefix"
         name = "logGroupName"
         date = "creationTime"
         dimension = "logGroupName"
@@ -133,6 +138,8 @@ class LogGroup(AWSResource):
 
 
 class CloudWatchEventRule(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "events"
         type = "rule"
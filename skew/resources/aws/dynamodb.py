@@ -15,25 +15,27 @@
 
 import logging
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class Table(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "dynamodb"
         type = "table"
         enum_spec = ("list_tables", "TableNames", None)
         id = "TableName"
-        detail_spec = ("describe_table", "TableName", "Table")
+        detail_spec = ("describe_table", "Table", "TableName", "id")
+        hydrate = [(None, detail_spec)]
         tags_spec = ("list_tags_of_resource", "Tags[]", "ResourceArn", "arn")
         filter_name = None
         name = "TableName"
         date = "CreationDateTime"
         dimension = "TableName"
+        volatile = ("ItemCount", "TableSizeBytes")
 
     @classmethod
     def filter(cls, arn, resource_id, data):
@@ -43,7 +45,3 @@ class Table(AWSResource):
     def __init__(self, client, data, query=None):
         # data from list_tables operation is a table name
         super(Table, self).__init__(client, data={"TableName": data}, query=query)
-        detail_op, param_name, detail_path = self.Meta.detail_spec
-        params = {param_name: self.id}
-        data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
@@ -16,10 +16,13 @@ from skew.resources.aws import AWSResource
 
 
 class Instance(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "instance"
         enum_spec = ("describe_instances", "Reservations[].Instances[]", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "InstanceId"
         filter_name = "InstanceIds"
@@ -27,6 +30,13 @@ class Instance(AWSResource):
         name = "InstanceId"
         date = "LaunchTime"
         dimension = "InstanceId"
+        relations = (
+            ("ec2", "image", "ImageId"),
+            ("ec2", "vpc", "VpcId"),
+            ("ec2", "subnet", "SubnetId"),
+            ("ec2", "security-group", "SecurityGroups[].GroupId"),
+            ("ec2", "network-interface", "NetworkInterfaces[].NetworkInterfaceId"),
+        )
 
     @property
     def parent(self):
@@ -39,40 +49,51 @@ class Instance(AWSResource):
 
 
 class SecurityGroup(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "security-group"
         enum_spec = ("describe_security_groups", "SecurityGroups", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "GroupId"
-        filter_name = "GroupNames"
+        filter_name = "GroupIds"
         filter_type = "list"
         name = "GroupName"
         date = None
         dimension = None
+        relations = (("ec2", "vpc", "VpcId"),)
 
 
 class KeyPair(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "key-pair"
         enum_spec = ("describe_key_pairs", "KeyPairs", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "KeyPairId"
-        filter_name = "KeyNames"
+        filter_name = "KeyPairIds"
+        filter_type = "list"
         name = "KeyName"
         date = None
         dimension = None
 
 
 class Address(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "address"
         enum_spec = ("describe_addresses", "Addresses", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "AllocationId"
-        filter_name = "PublicIps"
+        filter_name = "AllocationIds"
         filter_type = "list"
         name = "PublicIp"
         date = None
@@ -80,10 +101,13 @@ class Address(AWSResource):
 
 
 class Volume(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "volume"
         enum_spec = ("describe_volumes", "Volumes", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "VolumeId"
         filter_name = "VolumeIds"
@@ -91,6 +115,7 @@ class Volume(AWSResource):
         name = "VolumeId"
         date = "createTime"
         dimension = "VolumeId"
+        relations = (("ec2", "instance", "Attachments[].InstanceId"),)
 
     @property
     def parent(self):
@@ -101,10 +126,13 @@ class Volume(AWSResource):
 
 
 class Snapshot(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "snapshot"
         enum_spec = ("describe_snapshots", "Snapshots", {"OwnerIds": ["self"]})
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "SnapshotId"
         filter_name = "SnapshotIds"
@@ -112,6 +140,7 @@ class Snapshot(AWSResource):
         name = "SnapshotId"
         date = "StartTime"
         dimension = None
+        relations = (("ec2", "volume", "VolumeId"),)
 
     @property
     def parent(self):
@@ -122,10 +151,13 @@ class Snapshot(AWSResource):
 
 
 class Image(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "image"
         enum_spec = ("describe_images", "Images", {"Owners": ["self"]})
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "ImageId"
         filter_name = "ImageIds"
@@ -143,10 +175,13 @@ class Image(AWSResource):
 
 
 class Vpc(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "vpc"
         enum_spec = ("describe_vpcs", "Vpcs", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "VpcId"
         filter_name = "VpcIds"
@@ -157,10 +192,13 @@ class Vpc(AWSResource):
 
 
 class Subnet(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "subnet"
         enum_spec = ("describe_subnets", "Subnets", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "SubnetId"
         filter_name = "SubnetIds"
@@ -168,13 +206,17 @@ class Subnet(AWSResource):
         name = "SubnetId"
         date = None
         dimension = None
+        relations = (("ec2", "vpc", "VpcId"),)
 
 
 class CustomerGateway(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "customer-gateway"
         enum_spec = ("describe_customer_gateways", "CustomerGateways", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "CustomerGatewayId"
         filter_name = "CustomerGatewayIds"
@@ -185,10 +227,13 @@ class CustomerGateway(AWSResource):
 
 
 class InternetGateway(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "internet-gateway"
         enum_spec = ("describe_internet_gateways", "InternetGateways", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "InternetGatewayId"
         filter_name = "InternetGatewayIds"
@@ -199,10 +244,13 @@ class InternetGateway(AWSResource):
 
 
 class RouteTable(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "route-table"
         enum_spec = ("describe_route_tables", "RouteTables", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "RouteTableId"
         filter_name = "RouteTableIds"
@@ -213,10 +261,13 @@ class RouteTable(AWSResource):
 
 
 class NatGateway(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "natgateway"
         enum_spec = ("describe_nat_gateways", "NatGateways", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "NatGatewayId"
         filter_name = "NatGatewayIds"
@@ -226,11 +277,44 @@ class NatGateway(AWSResource):
         dimension = None
 
 
+class NetworkInterface(AWSResource):
+    __slots__ = ()
+
+    class Meta(object):
+        service = "ec2"
+        type = "network-interface"
+        enum_spec = ("describe_network_interfaces", "NetworkInterfaces", None)
+        tag_filter_name = "Filters"
+        detail_spec = None
+        id = "NetworkInterfaceId"
+        filter_name = "NetworkInterfaceIds"
+        filter_type = "list"
+        name = "NetworkInterfaceId"
+        date = None
+        dimension = None
+        relations = (
+            ("ec2", "vpc", "VpcId"),
+            ("ec2", "subnet", "SubnetId"),
+            ("ec2", "security-group", "Groups[].GroupId"),
+            ("ec2", "instance", "Attachment.InstanceId"),
+        )
+
+    @property
+    def tags(self):
+        # network interfaces have a TagSet instead of Tags
+        if self._tags is None:
+            self._tags = self._normalize_tags(self._data.get("TagSet", []))
+        return self._tags
+
+
 class NetworkAcl(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "network-acl"
         enum_spec = ("describe_network_acls", "NetworkAcls", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "NetworkAclId"
         filter_name = "NetworkAclIds"
@@ -241,10 +325,13 @@ class NetworkAcl(AWSResource):
 
 
 class VpcPeeringConnection(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "vpc-peering-connection"
         enum_spec = ("describe_vpc_peering_connections", "VpcPeeringConnections", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "VpcPeeringConnectionId"
         filter_name = "VpcPeeringConnectionIds"
@@ -255,10 +342,13 @@ class VpcPeeringConnection(AWSResource):
 
 
 class LaunchTemplate(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "launch-template"
         enum_spec = ("describe_launch_templates", "LaunchTemplates", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "LaunchTemplateId"
         filter_name = "LaunchTemplateIds"
@@ -269,10 +359,13 @@ class LaunchTemplate(AWSResource):
 
 
 class FlowLog(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ec2"
         type = "flow-log"
         enum_spec = ("describe_flow_logs", "FlowLogs", None)
+        tag_filter_name = "Filters"
         detail_spec = None
         id = "FlowLogId"
         filter_name = "FlowLogIds"
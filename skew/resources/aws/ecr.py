@@ -16,11 +16,14 @@ import logging
 from botocore.exceptions import ClientError
 
 from skew.resources.aws import AWSResource
+from skew.resources.filters import is_id_pattern
 
 LOG = logging.getLogger(__name__)
 
 
 class Registery(AWSResource):
+    __slots__ = ()
+
     @classmethod
     def enumerate(cls, arn, region, account, resource_id=None, **kwargs):
         client = cls.get_awsclient(region_name=region, account_id=account, **kwargs)
@@ -46,12 +49,14 @@ class Registery(AWSResource):
 
 
 class Repository(AWSResource):
+    __slots__ = ()
+
     @classmethod
     def enumerate(cls, arn, region, account, resource_id=None, **kwargs):
         client = cls.get_awsclient(region_name=region, account_id=account, **kwargs)
         try:
             param = {"registryId": account}
-            if resource_id and resource_id != "*":
+            if resource_id and resource_id != "*" and not is_id_pattern(resource_id):
                 param.update({"repositoryNames": [resource_id]})
             data = client.call("describe_repositories", query="repositories[]", **param)
 
@@ -59,7 +64,7 @@ class Repository(AWSResource):
                 if "ResponseMetadata" in data:
                     del data["ResponseMetadata"]
 
-                return map(lambda d: Repository(client, d, arn.query), data)
+                return cls._build_resources(client, data, arn, resource_id=resource_id, **kwargs)
         except ClientError as e:
             LOG.debug(e)
             # if the error is because the resource was not found, be quiet
@@ -15,14 +15,15 @@
 
 import logging
 
-import jmespath
-
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class Cluster(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ecs"
         type = "cluster"
@@ -48,7 +49,7 @@ class Cluster(AWSResource):
         detail_op, param_name, detail_path = self.Meta.detail_spec
         params = {param_name: [self.id]}
         data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
+        self._data = search(detail_path, data)
 
         service_arns = self._feed_from_spec(attr_spec=self.Meta.attr_spec)
         self._data["services"] = {}
@@ -63,6 +64,8 @@ class Cluster(AWSResource):
 
 
 class TaskDefinition(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ecs"
         type = "task-definition"
@@ -80,7 +83,7 @@ class TaskDefinition(AWSResource):
         detail_op, param_name, detail_path = self.Meta.detail_spec
         params = {param_name: self.id}
         data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
+        self._data = search(detail_path, data)
 
     @property
     def arn(self):
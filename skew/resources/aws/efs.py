@@ -20,6 +20,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Filesystem(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "efs"
         type = "filesystem"
@@ -31,6 +33,7 @@ class Filesystem(AWSResource):
         name = "Name"
         date = "CreationTime"
         dimension = None
+        volatile = ("SizeInBytes",)
 
     @property
     def arn(self):
@@ -48,9 +51,6 @@ class Filesystem(AWSResource):
         # Asset name is get by tags if defined, or is FileSystemId
         self._name = self.tags.get("Name", self.data["FileSystemId"])
 
-    def sleek(self):
-        self._data["SizeInBytes"] = 0
-
     @classmethod
     def set_tags(cls, arn, region, account, tags, resource_id=None, **kwargs):
         client = cls.get_awsclient(region_name=region, account_id=account, **kwargs)
@@ -16,6 +16,8 @@ from skew.resources.aws import AWSResource
 
 
 class Cluster(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'elasticache'
         type = 'cluster'
@@ -41,6 +43,8 @@ class Cluster(AWSResource):
 
 
 class SubnetGroup(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'elasticache'
         type = 'subnet-group'
@@ -55,6 +59,8 @@ class SubnetGroup(AWSResource):
 
 
 class Snapshot(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'elasticache'
         type = 'snapshot'
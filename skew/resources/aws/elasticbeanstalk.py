@@ -13,6 +13,8 @@ from skew.resources.aws import AWSResource
 
 
 class Application(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'elasticbeanstalk'
         type = 'application'
@@ -28,6 +30,8 @@ class Application(AWSResource):
 
 
 class Environment(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'elasticbeanstalk'
         type = 'environment'
@@ -39,6 +43,7 @@ class Environment(AWSResource):
         name = 'EnvironmentName'
         date = None
         dimension = None
+        volatile = ('DateUpdated', 'Health', 'HealthStatus', 'Status')
         tags_spec = ('list_tags_for_resource', 'ResourceTags[]', 'ResourceArn', 'arn')
 
     @property
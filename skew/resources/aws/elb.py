@@ -15,32 +15,36 @@
 # language governing permissions and limitations under the License.
 import logging
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class LoadBalancer(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "elb"
         type = "loadbalancer"
         enum_spec = ("describe_load_balancers", "LoadBalancerDescriptions", None)
         detail_spec = None
-        attr_spec = [
-            (
+        attr_spec = {
+            "attributes": (
                 "describe_load_balancer_attributes",
-                "LoadBalancerName",
-                "LoadBalancerAttributes",
                 "LoadBalancerAttributes",
+                "LoadBalancerName",
+                "id",
             ),
-            (
+            "policies": (
                 "describe_load_balancer_policies",
-                "LoadBalancerName",
-                "PolicyDescriptions",
                 "PolicyDescriptions",
+                "LoadBalancerName",
+                "id",
             ),
+        }
+        hydrate = [
+            ("LoadBalancerAttributes", attr_spec["attributes"]),
+            ("PolicyDescriptions", attr_spec["policies"]),
         ]
         id = "LoadBalancerName"
         filter_name = "LoadBalancerNames"
@@ -48,6 +52,12 @@ class LoadBalancer(AWSResource):
         name = "DNSName"
         date = "CreatedTime"
         dimension = "LoadBalancerName"
+        relations = (
+            ("ec2", "vpc", "VPCId"),
+            ("ec2", "subnet", "Subnets"),
+            ("ec2", "security-group", "SecurityGroups"),
+            ("ec2", "instance", "Instances[].InstanceId"),
+        )
         tags_spec = (
             "describe_tags",
             "TagDescriptions[].Tags[]",
@@ -59,19 +69,6 @@ class LoadBalancer(AWSResource):
         super(LoadBalancer, self).__init__(client, data, query)
         self._id = data["LoadBalancerName"]
 
-        # add addition attribute data
-        for attr in self.Meta.attr_spec:
-            LOG.debug(attr)
-            detail_op, param_name, detail_path, detail_key = attr
-            params = {param_name: self._id}
-            data = self._client.call(detail_op, **params)
-            if not (detail_path is None):
-                data = jmespath.search(detail_path, data)
-            if "ResponseMetadata" in data:
-                del data["ResponseMetadata"]
-            self._data[detail_key] = data
-            LOG.debug(data)
-
     @property
     def arn(self):
         return "arn:aws:elb:%s:%s:%s/%s" % (
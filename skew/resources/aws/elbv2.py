@@ -14,36 +14,40 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 
 class LoadBalancer(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "elbv2"
         type = "loadbalancer"
         enum_spec = ("describe_load_balancers", "LoadBalancers", None)
-        detail_spec = ("describe_listeners", "LoadBalancerArn", "Listeners")
+        detail_spec = ("describe_listeners", "Listeners", "LoadBalancerArn", "id")
+        hydrate = [("Listeners", detail_spec)]
         id = "LoadBalancerArn"
         filter_name = "Names"
         filter_type = "list"
         name = "LoadBalancerName"
         date = "CreatedTime"
         dimension = None
+        relations = (
+            ("ec2", "vpc", "VpcId"),
+            ("ec2", "subnet", "AvailabilityZones[].SubnetId"),
+            ("ec2", "security-group", "SecurityGroups"),
+        )
         tags_spec = ("describe_tags", "TagDescriptions[].Tags[]", "ResourceArns", "id")
 
     def __init__(self, client, data, query=None):
         super(LoadBalancer, self).__init__(client, data, query)
         if data and "LoadBalancerArn" in data:
-            detail_op, param_name, detail_path = self.Meta.detail_spec
-            params = {param_name: self._data["LoadBalancerArn"]}
-            data = client.call(detail_op, **params)
-            self._data["Listeners"] = jmespath.search(detail_path, data)
             self._arn = self._data["LoadBalancerArn"]
 
 
 class TargetGroup(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "elbv2"
         type = "targetgroup"
@@ -55,6 +59,10 @@ class TargetGroup(AWSResource):
         name = "TargetGroupName"
         date = "CreatedTime"
         dimension = "LoadBalancerName"
+        relations = (
+            ("ec2", "vpc", "VpcId"),
+            ("elbv2", "loadbalancer", "LoadBalancerArns"),
+        )
         tags_spec = (
             "describe_tags",
             "TagDescriptions[].Tags[]",
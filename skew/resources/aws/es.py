@@ -12,18 +12,19 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 
 class ElasticsearchDomain(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'es'
         type = 'domain'
         enum_spec = ('list_domain_names', 'DomainNames[].DomainName', None)
         tags_spec = ('list_tags', 'TagList', 'ARN', 'arn')
-        detail_spec = ('describe_elasticsearch_domain', 'DomainName', 'DomainStatus')
+        detail_spec = ('describe_elasticsearch_domain', 'DomainStatus', 'DomainName', 'id')
+        hydrate = [(None, detail_spec)]
         id = 'DomainName'
         filter_name = None
         name = 'DomainName'
@@ -33,7 +34,4 @@ class ElasticsearchDomain(AWSResource):
     def __init__(self, client, data, query=None):
         super(ElasticsearchDomain, self).__init__(client, data, query)
         self._id = data
-        detail_op, param_name, detail_path = self.Meta.detail_spec
-        params = {param_name: self.id}
-        data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
+        self._data = {'DomainName': data}
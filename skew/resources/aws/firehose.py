@@ -9,17 +9,18 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 
 class DeliveryStream(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'firehose'
         type = 'deliverystream'
         enum_spec = ('list_delivery_streams', 'DeliveryStreamNames', None)
-        detail_spec = ('describe_delivery_stream', 'DeliveryStreamName', 'DeliveryStreamDescription')
+        detail_spec = ('describe_delivery_stream', 'DeliveryStreamDescription', 'DeliveryStreamName', 'id')
+        hydrate = [(None, detail_spec)]
         id = 'DeliveryStreamName'
         filter_name = None
         filter_type = None
@@ -31,7 +32,4 @@ class DeliveryStream(AWSResource):
     def __init__(self, client, data, query=None):
         super(DeliveryStream, self).__init__(client, data, query)
         self._id = data
-        detail_op, param_name, detail_path = self.Meta.detail_spec
-        params = {param_name: self.id}
-        data = client.call(detail_op, **params)
-        self._data = jmespath.search(detail_path, data)
+        self._data = {'DeliveryStreamName': data}
@@ -15,14 +15,15 @@
 
 import logging
 
-import jmespath
-
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class IAMResource(AWSResource):
+    __slots__ = ()
+
     @property
     def arn(self):
         return "arn:aws:%s::%s:%s/%s" % (
@@ -34,6 +35,8 @@ class IAMResource(AWSResource):
 
 
 class Group(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "group"
@@ -62,12 +65,19 @@ class Group(IAMResource):
         return resource_id == data["GroupName"]
 
     def _load_extra_attribute(self):
-        self._data["Users"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["users"])
-        self._data["PolicyNames"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["policy_names"])
-        self._data["AttachedPolicies"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["attached_group_policies"])
+        if self._wants("Users"):
+            self._data["Users"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["users"])
+        if self._wants("PolicyNames"):
+            self._data["PolicyNames"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["policy_names"])
+        if self._wants("AttachedPolicies"):
+            self._data["AttachedPolicies"] = self._feed_from_spec(
+                attr_spec=self.Meta.attr_spec["attached_group_policies"]
+            )
 
 
 class User(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "user"
@@ -101,7 +111,7 @@ class User(IAMResource):
             detail_op, param_name, detail_path = self.Meta.detail_spec
             params = {param_name: self._data[param_name]}
             data = client.call(detail_op, **params)
-            self._data = jmespath.search(detail_path, data)
+            self._data = search(detail_path, data)
 
         # add attribute data
         if self.Meta.attr_spec is not None:
@@ -112,7 +122,7 @@ class User(IAMResource):
                 params = {param_name: self._data[param_name]}
                 tmp_data = self._client.call(detail_op, **params)
                 if not (detail_path is None):
-                    tmp_data = jmespath.search(detail_path, tmp_data)
+                    tmp_data = search(detail_path, tmp_data)
                 if "ResponseMetadata" in tmp_data:
                     del tmp_data["ResponseMetadata"]
                 self._data[detail_key] = tmp_data
@@ -127,7 +137,7 @@ class User(IAMResource):
                         "PolicyName": policy_name,
                     }
                     tmp_data = self._client.call("get_user_policy", **params)
-                    tmp_data = jmespath.search("PolicyDocument", tmp_data)
+                    tmp_data = search("PolicyDocument", tmp_data)
                     tmp_dict[policy_name] = tmp_data
                 self._data["PolicyNames"] = tmp_dict
 
@@ -138,6 +148,8 @@ class User(IAMResource):
 
 
 class Role(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "role"
@@ -157,6 +169,8 @@ class Role(IAMResource):
 
 
 class InstanceProfile(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "instance-profile"
@@ -175,6 +189,8 @@ class InstanceProfile(IAMResource):
 
 
 class Policy(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "policy"
@@ -193,6 +209,8 @@ class Policy(IAMResource):
 
 
 class ServerCertificate(IAMResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "iam"
         type = "server-certificate"
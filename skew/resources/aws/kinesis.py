@@ -17,6 +17,8 @@ from skew.resources.aws import AWSResource
 
 
 class Stream(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "kinesis"
         type = "stream"
@@ -19,6 +19,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Key(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "kms"
         type = "key"
@@ -39,15 +41,15 @@ class Key(AWSResource):
             "aliases": ("list_aliases", "Aliases[]", "KeyId", "id"),
         }
 
+        hydrate = [
+            ("KeyMetadata", attr_spec["describe"]),
+            ("Policy", attr_spec["key_policy"]),
+            ("KeyRotationEnabled", attr_spec["key_rotation_status"]),
+            ("Aliases", attr_spec["aliases"]),
+        ]
+
         tags_spec = ("list_resource_tags", "Tags[]", "KeyId", "arn")
 
     @classmethod
     def filter(cls, arn, resource_id, data):
         return resource_id == data["KeyId"]
-
-    def __init__(self, client, data, query=None):
-        super(Key, self).__init__(client, data, query)
-        self._data["KeyMetadata"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["describe"])
-        self._data["Policy"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["key_policy"])
-        self._data["KeyRotationEnabled"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["key_rotation_status"])
-        self._data["Aliases"] = self._feed_from_spec(attr_spec=self.Meta.attr_spec["aliases"])
@@ -21,6 +21,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Function(AWSResource):
+    __slots__ = ()
+
     @classmethod
     def enumerate(cls, arn, region, account, resource_id=None, **kwargs):
         resources = list(super(Function, cls).enumerate(arn, region, account, resource_id, **kwargs))
@@ -43,6 +45,7 @@ class Function(AWSResource):
         name = "FunctionName"
         date = "LastModified"
         dimension = "FunctionName"
+        volatile = ("LastModified",)
         tags_spec = ("list_tags", "Tags", "Resource", "arn")
 
     @classmethod
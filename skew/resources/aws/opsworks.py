@@ -22,6 +22,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Stack(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "opsworks"
         type = "stack"
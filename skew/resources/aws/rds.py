@@ -16,6 +16,8 @@ from skew.resources.aws import AWSResource
 
 
 class DBInstance(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'rds'
         type = 'db'
@@ -28,6 +30,7 @@ class DBInstance(AWSResource):
         name = 'DBInstanceIdentifier'
         date = 'InstanceCreateTime'
         dimension = 'DBInstanceIdentifier'
+        volatile = ('LatestRestorableTime',)
 
     @property
     def arn(self):
@@ -39,11 +42,10 @@ class DBInstance(AWSResource):
             self.id,
         )
 
-    def sleek(self):
-        self._data['LatestRestorableTime'] = ''
-
 
 class DBSecurityGroup(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'rds'
         type = 'secgrp'
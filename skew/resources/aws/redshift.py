@@ -16,6 +16,8 @@ from skew.resources.aws import AWSResource
 
 
 class Cluster(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'redshift'
         type = 'cluster'
@@ -16,12 +16,16 @@ from skew.resources.aws import AWSResource
 
 
 class Route53Resource(AWSResource):
+    __slots__ = ()
+
     @property
     def arn(self):
         return 'arn:aws:%s:::%s/%s' % (self._client.service_name, self.resourcetype, self.id)
 
 
 class HostedZone(Route53Resource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'route53'
         type = 'hostedzone'
@@ -46,6 +50,8 @@ class HostedZone(Route53Resource):
 
 
 class HealthCheck(Route53Resource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'route53'
         type = 'healthcheck'
@@ -66,6 +72,8 @@ class HealthCheck(Route53Resource):
 
 
 class ResourceRecordSet(Route53Resource):
+    __slots__ = ()
+
     class Meta(object):
         service = 'route53'
         type = 'rrset'
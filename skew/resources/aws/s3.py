@@ -13,14 +13,14 @@
 # language governing permissions and limitations under the License.
 import logging
 
-import jmespath
-
+from skew.boto.query import search
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class Bucket(AWSResource):
+    __slots__ = ("_keys",)
 
     _location_cache = {}
 
@@ -117,19 +117,26 @@ class Bucket(AWSResource):
     def name(self):
         return self._id
 
+    # data key and property of each extra attribute
+    _extra_attributes = (
+        ("LocationConstraint", "location"),
+        ("Acl", "acl"),
+        ("CORSRules", "cors"),
+        ("ServerSideEncryptionConfiguration", "encryption"),
+        ("LifecycleConfiguration", "lifecycle"),
+        ("Logging", "logging"),
+        ("Policy", "policy"),
+        ("PolicyStatus", "policy_status"),
+        ("NotificationConfiguration", "notifications"),
+        ("Versioning", "versioning"),
+        ("Website", "website"),
+    )
+
     def _load_extra_attribute(self):
-        # loaded when self.data is called
-        self.location
-        self.acl
-        self.cors
-        self.encryption
-        self.lifecycle
-        self.logging
-        self.policy
-        self.policy_status
-        self.notifications
-        self.versioning
-        self.website
+        # loaded when self.data is called, only the wanted fields
+        for key, attribute in self._extra_attributes:
+            if self._wants(key):
+                getattr(self, attribute)
 
     @property
     def location(self):
@@ -220,6 +227,6 @@ class Bucket(AWSResource):
         params = {param_name: self.id}
         if not self._keys:
             data = self._client.call(detail_op, **params)
-            self._keys = jmespath.search(detail_path, data)
+            self._keys = search(detail_path, data)
         for key in self._keys:
             yield key
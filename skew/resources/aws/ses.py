@@ -22,6 +22,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Identity(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "ses"
         type = "identity"
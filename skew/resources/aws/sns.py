@@ -11,19 +11,20 @@
 
 import logging
 
-import jmespath
-
 from skew.resources.aws import AWSResource
 
 LOG = logging.getLogger(__name__)
 
 
 class Topic(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "sns"
         type = "topic"
         enum_spec = ("list_topics", "Topics", None)
-        detail_spec = ("get_topic_attributes", "TopicArn", "Attributes")
+        detail_spec = ("get_topic_attributes", "Attributes", "TopicArn", "arn")
+        hydrate = [(None, detail_spec)]
         id = "TopicArn"
         filter_name = None
         filter_type = None
@@ -42,16 +43,11 @@ class Topic(AWSResource):
         super(Topic, self).__init__(client, data, query)
 
         self._id = data["TopicArn"].split(":", 5)[5]
-
-        detail_op, param_name, detail_path = self.Meta.detail_spec
-        params = {param_name: data["TopicArn"]}
-        data = client.call(detail_op, **params)
-
-        self._data = jmespath.search(detail_path, data)
-        self._arn = self._data.get("TopicArn")
+        self._arn = data["TopicArn"]
 
 
 class Subscription(AWSResource):
+    __slots__ = ()
 
     invalid_arns = ["PendingConfirmation", "Deleted"]
 
@@ -59,7 +55,8 @@ class Subscription(AWSResource):
         service = "sns"
         type = "subscription"
         enum_spec = ("list_subscriptions", "Subscriptions", None)
-        detail_spec = ("get_subscription_attributes", "SubscriptionArn", "Attributes")
+        detail_spec = ("get_subscription_attributes", "Attributes", "SubscriptionArn", "arn")
+        hydrate = [(None, detail_spec)]
         id = "SubscriptionArn"
         filter_name = None
         filter_type = None
@@ -82,10 +79,11 @@ class Subscription(AWSResource):
 
         self._id = data["SubscriptionArn"].split(":", 6)[6]
         self._name = ""
-
-        detail_op, param_name, detail_path = self.Meta.detail_spec
-        params = {param_name: data["SubscriptionArn"]}
-        data = client.call(detail_op, **params)
-
-        self._data = jmespath.search(detail_path, data)
-        self._arn = self._data.get("SubscriptionArn")
+        self._arn = data["SubscriptionArn"]
+
+    def _hydration_calls(self):
+        if self._id == "PendingConfirmation":
+            # no attributes without a subscription arn
+            self._hydrated = True
+            return []
+        return super(Subscription, self)._hydration_calls()
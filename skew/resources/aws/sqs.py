@@ -16,6 +16,8 @@ from skew.resources.aws import AWSResource
 
 
 class Queue(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "sqs"
         type = "queue"
@@ -24,6 +26,7 @@ class Queue(AWSResource):
         id = "QueueUrl"
         filter_name = "QueueNamePrefix"
         filter_type = "scalar"
+        prefix_filter_name = "QueueNamePrefix"
         name = "QueueName"
         date = None
         dimension = "QueueName"
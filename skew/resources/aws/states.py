@@ -19,11 +19,14 @@ LOG = logging.getLogger(__name__)
 
 
 class StateMachines(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "stepfunctions"
         type = "stateMachine"
         enum_spec = ("list_state_machines", "stateMachines[]", None)
         detail_spec = ("describe_state_machine", None, "stateMachineArn", "arn")
+        hydrate = [(None, detail_spec)]
         filter_name = None
         filter_type = None
         id = "name"
@@ -38,8 +41,3 @@ class StateMachines(AWSResource):
     def __init__(self, client, data, query=None):
         super(StateMachines, self).__init__(client, data, query)
         self._arn = self._data["stateMachineArn"]
-
-        self._data = {
-            **self._data,
-            **self._feed_from_spec(attr_spec=self.Meta.detail_spec),
-        }
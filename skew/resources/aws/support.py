@@ -21,6 +21,8 @@ LOG = logging.getLogger(__name__)
 
 
 class Check(AWSResource):
+    __slots__ = ()
+
     class Meta(object):
         service = "support"
         type = "check"
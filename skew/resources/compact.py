@@ -0,0 +1,76 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Compact resource representation."""
+import sys
+from typing import Any, Optional
+
+from skew.resources.json_dump import json_dump
+
+__all__ = ["CompactResource"]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CompactResource(object):
+    """Detached and memory efficient copy of a resource.
+
+    A compact resource has no ``__dict__`` and no client: it keeps the
+    identity of the resource and its data.  Service, region, account and
+    resource type are interned, so they are shared by all instances.
+    Use it to hold large inventories in memory.
+    """
+
+    __slots__ = ("arn", "service", "region", "account", "resourcetype", "id", "name", "data")
+
+    def __init__(
+        self,
+        arn: str,
+        service: str,
+        region: Optional[str],
+        account: Optional[str],
+        resourcetype: str,
+        id: Any,
+        name: Any = None,
+        data: Any = None,
+    ):
+        self.arn = arn
+        self.service = _intern(service)
+        self.region = _intern(region)
+        self.account = _intern(account)
+        self.resourcetype = _intern(resourcetype)
+        self.id = id
+        self.name = name
+        self.data = data
+
+    @classmethod
+    def from_resource(cls, resource) -> "CompactResource":
+        """Build a compact copy of a ``Resource``."""
+        client = resource._client
+        return cls(
+            arn=resource.arn,
+            service=client.service_name,
+            region=client.region_name,
+            account=client.account_id,
+            resourcetype=resource.resourcetype,
+            id=resource.id,
+            name=resource.name,
+            data=resource.data,
+        )
+
+    def __repr__(self):
+        return self.arn
+
+    def json_dump(self, normalize=True, serializer=None):
+        return json_dump(self.data, normalize=normalize, serializer=serializer)
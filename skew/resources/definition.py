@@ -40,6 +40,7 @@ _RESOURCE_TYPES: Dict[str, str] = {
     "aws.ec2.instance": "aws.ec2.Instance",
     "aws.ec2.natgateway": "aws.ec2.NatGateway",
     "aws.ec2.network-acl": "aws.ec2.NetworkAcl",
+    "aws.ec2.network-interface": "aws.ec2.NetworkInterface",
     "aws.ec2.route-table": "aws.ec2.RouteTable",
     "aws.ec2.internet-gateway": "aws.ec2.InternetGateway",
     "aws.ec2.security-group": "aws.ec2.SecurityGroup",
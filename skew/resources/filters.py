@@ -0,0 +1,104 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Resource filters.
+
+A scan can select resources with an id pattern (``instance/i-12*``) and with
+tags (``scan(..., tags={"env": "prod"})``).  When the service supports it, the
+selection is pushed down to the enumeration call, so that unwanted resources
+are not downloaded:
+
+* ``Meta.prefix_filter_name``: parameter of the enumeration call which takes
+  an id prefix (e.g. ``logGroupNamePrefix``), used for ``prefix*`` patterns
+* ``Meta.tag_filter_name``: parameter of the enumeration call which takes
+  EC2 like filters (``[{"Name": "tag:env", "Values": ["prod"]}]``)
+
+Native filters may be approximate, so resources are always checked again
+with their id and tags before being hydrated.
+
+Tag values are strings or lists of strings (any of) with shell wildcards,
+``None`` matches any value of the tag.
+"""
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, List, Optional, Union
+
+__all__ = ["has_wildcard", "is_id_pattern", "id_prefix", "tag_filters", "match_tags", "resource_filter"]
+
+_WILDCARDS = ("*", "?", "[")
+
+TagValues = Optional[Union[str, List[str]]]
+
+
+def has_wildcard(value: str) -> bool:
+    """Return True if value contains a shell wildcard."""
+    return any(w in value for w in _WILDCARDS)
+
+
+def is_id_pattern(resource_id: Optional[str]) -> bool:
+    """Return True if the resource id is a pattern (but not ``*`` which selects everything)."""
+    return bool(resource_id) and resource_id != "*" and has_wildcard(resource_id)
+
+
+def id_prefix(resource_id: str) -> Optional[str]:
+    """Return the prefix of a ``prefix*`` pattern (None for other patterns)."""
+    if resource_id.endswith("*"):
+        prefix = resource_id[:-1]
+        if prefix and not has_wildcard(prefix):
+            return prefix
+    return None
+
+
+def _values(values: TagValues) -> Optional[List[str]]:
+    if values is None:
+        return None
+    return [values] if isinstance(values, str) else list(values)
+
+
+def tag_filters(tags: Dict[str, TagValues]) -> List[Dict]:
+    """Return EC2 like filters of tags."""
+    filters = []
+    for key, values in tags.items():
+        values = _values(values)
+        if values is None:
+            filters.append({"Name": "tag-key", "Values": [key]})
+        else:
+            filters.append({"Name": f"tag:{key}", "Values": values})
+    return filters
+
+
+def match_tags(resource_tags: Dict, tags: Dict[str, TagValues]) -> bool:
+    """Return True if resource tags match all tags."""
+    for key, values in tags.items():
+        if key not in resource_tags:
+            return False
+        values = _values(values)
+        if values is None:
+            continue
+        actual = resource_tags[key]
+        actual = actual if isinstance(actual, list) else [actual]
+        if not any(fnmatchcase(str(a), v) for a in actual for v in values):
+            return False
+    return True
+
+
+def resource_filter(resource_id: Optional[str], tags: Optional[Dict[str, TagValues]]) -> Optional[Callable]:
+    """Return a predicate on resources for an id pattern and tags (None if all resources are selected)."""
+    pattern = resource_id if is_id_pattern(resource_id) else None
+    if not pattern and not tags:
+        return None
+
+    def predicate(resource) -> bool:
+        if pattern and not fnmatchcase(str(resource.id), pattern):
+            return False
+        return not tags or match_tags(resource.tags, tags)
+
+    return predicate
@@ -0,0 +1,106 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Concurrent hydration of resources.
+
+Some resources need extra calls to get their details (``describe_*``,
+``get_*``).  A resource class declares them in ``Meta.hydrate``, a list of
+``(key, spec)``:
+
+* ``key``: data key which receives the result, or ``None`` to merge the
+  result (a dictionary) into the resource data
+* ``spec``: ``(operation, query, parameter name, resource attribute)``, the
+  same format than ``attr_spec`` (the parameter value is read from the
+  resource attribute, e.g. ``id``, ``name`` or ``arn``)
+
+Building a resource does not call AWS.  Resources of an enumeration are
+hydrated by chunk: the calls of a chunk run on a bounded thread pool, results
+are applied to resources in the calling thread, in declaration order.
+A resource which was not hydrated by an enumeration is hydrated on first
+access to its data.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+LOG = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_WORKERS", "DEFAULT_CHUNK_SIZE", "hydrate", "iter_hydrated"]
+
+DEFAULT_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _call(call):
+    resource, _, method, path, kwargs = call
+    return resource._client.call(method, query=path, **kwargs)
+
+
+def hydrate(resources: List, workers: Optional[int] = None) -> List:
+    """Run hydration calls of resources which are not hydrated yet.
+
+    Parameters:
+        resources (List): resources to hydrate
+        workers (Optional[int]): maximum number of concurrent calls (default ``DEFAULT_WORKERS``),
+            calls are made in the calling thread if ``workers`` <= 1
+
+    Returns:
+        (List): resources
+    """
+    calls = []
+    for resource in resources:
+        hydration_calls = getattr(resource, "_hydration_calls", None)
+        if hydration_calls is not None:
+            calls.extend(hydration_calls())
+    if not calls:
+        return resources
+
+    workers = DEFAULT_WORKERS if workers is None else workers
+    try:
+        if workers <= 1 or len(calls) == 1:
+            results = [_call(call) for call in calls]
+        else:
+            LOG.debug("hydrate %d resources with %d calls", len(resources), len(calls))
+            with ThreadPoolExecutor(max_workers=min(workers, len(calls))) as executor:
+                results = list(executor.map(_call, calls))
+    except BaseException:
+        # no partial data: resources are hydrated again on their next access
+        for call in calls:
+            call[0]._reset_hydration()
+        raise
+
+    # group results by resource, keeping declaration order
+    updates = {}
+    for call, result in zip(calls, results):
+        updates.setdefault(id(call[0]), (call[0], []))[1].append((call[1], result))
+    for resource, values in updates.values():
+        resource._apply_hydration(values)
+    return resources
+
+
+def iter_hydrated(
+    resources: Iterable, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator:
+    """Hydrate resources by chunk and yield them.
+
+    Parameters:
+        resources (Iterable): resources to hydrate
+        workers (Optional[int]): maximum number of concurrent calls
+        chunk_size (int): number of resources hydrated together
+    """
+    resources = iter(resources)
+    while True:
+        chunk = list(islice(resources, chunk_size))
+        if not chunk:
+            return
+        yield from hydrate(chunk, workers=workers)
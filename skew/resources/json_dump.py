@@ -10,13 +10,45 @@
 # distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
-"""Json utilities."""
+"""Json utilities.
+
+Serialization goes through a pluggable serializer:
+
+* ``json``: standard library, indented with 4 spaces (default)
+* ``orjson``: native encoder (if ``orjson`` is installed), indented with 2 spaces
+* ``auto``: ``orjson`` if installed, otherwise ``json``
+
+All serializers sort keys and format datetimes and bytes with ``custom_json_encoder``.
+The default serializer is read from the ``SKEW_JSON_SERIALIZER`` environment variable.
+
+``json_dump_hash`` also returns a content hash (blake2b) of the data, over the
+``json`` serializer output without the volatile top level fields.  With the
+``json`` serializer, the hash is computed from the serialized fields
+themselves: data is walked once.
+"""
 import datetime
+import hashlib
 import json
+import os
 import re
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
-__all__ = ["json_dump", "custom_json_encoder", "camel_to_snake"]
+__all__ = [
+    "json_dump",
+    "json_dump_hash",
+    "content_hash",
+    "custom_json_encoder",
+    "camel_to_snake",
+    "data_key",
+    "register_serializer",
+    "get_serializer",
+    "set_default_serializer",
+]
 
 
 def custom_json_encoder(x):
@@ -28,36 +60,202 @@ def custom_json_encoder(x):
     raise TypeError("Unknown type")
 
 
-def json_dump(data, normalize=True):
-    """Dump a dictionnary as json."""
-    return json.dumps(
-        obj=_normalize(data) if normalize else data,
-        indent=4,
-        sort_keys=True,
+def _json_serializer(data: Any) -> str:
+    return json.dumps(obj=data, indent=4, sort_keys=True, default=custom_json_encoder)
+
+
+def _orjson_serializer(data: Any) -> str:
+    # datetimes are passed to custom_json_encoder to keep the same format than json
+    return orjson.dumps(
+        data,
         default=custom_json_encoder,
-    )
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    ).decode("utf-8")
+
+
+# Maps serializer names to a function which dump data to a json string
+_SERIALIZERS: Dict[str, Callable[[Any], str]] = {"json": _json_serializer}
+if orjson is not None:
+    _SERIALIZERS["orjson"] = _orjson_serializer
+
+_default_serializer = os.environ.get("SKEW_JSON_SERIALIZER", "json")
+
+
+def register_serializer(name: str, serializer: Callable[[Any], str]):
+    """Register a serializer: a function which dump data (sorted keys) to a json string."""
+    _SERIALIZERS[name] = serializer
+
+
+def get_serializer(name: Optional[str] = None) -> Callable[[Any], str]:
+    """Return serializer function by name (default serializer if None)."""
+    name = name if name else _default_serializer
+    if name == "auto":
+        name = "orjson" if "orjson" in _SERIALIZERS else "json"
+    if name not in _SERIALIZERS:
+        raise ValueError(f"Unknown json serializer {name} (available: {', '.join(sorted(_SERIALIZERS))})")
+    return _SERIALIZERS[name]
+
+
+def set_default_serializer(name: str):
+    """Set default serializer name (``json``, ``orjson``, ``auto`` or a registered one)."""
+    global _default_serializer
+    get_serializer(name)
+    _default_serializer = name
+
+
+def json_dump(data, normalize=True, serializer: Optional[str] = None):
+    """Dump a dictionnary as json.
+
+    Parameters:
+        data: data to dump
+        normalize (bool): convert keys to snake case
+        serializer (Optional[str]): serializer name (default serializer if None)
+    """
+    return get_serializer(serializer)(_normalize(data) if normalize else data)
+
+
+def _json_fields(data: Dict) -> Iterator[Tuple[Any, str]]:
+    """Yield (key, text) of the top level fields, as rendered by the json serializer."""
+    for key, value in sorted(data.items()):
+        # nested values are indented one level: json strings never contain raw new lines
+        text = _json_serializer(value).replace("\n", "\n    ")
+        yield key, f"{json.dumps(key)}: {text}"
+
+
+def _dump_hash(data: Any, volatile: Iterable[str], render: bool) -> Tuple[Optional[str], str]:
+    hasher = hashlib.blake2b(digest_size=16)
+    if not isinstance(data, dict) or not data or not all(isinstance(k, str) for k in data):
+        text = _json_serializer(data)
+        hasher.update(text.encode("utf-8"))
+        return (text if render else None), hasher.hexdigest()
+    volatile = frozenset(volatile)
+    fields = []
+    for key, text in _json_fields(data):
+        if key not in volatile:
+            hasher.update(text.encode("utf-8"))
+            hasher.update(b"\n")
+        if render:
+            fields.append(text)
+    text = "{\n    " + ",\n    ".join(fields) + "\n}" if render else None
+    return text, hasher.hexdigest()
+
+
+def _volatile(volatile: Iterable[str], normalize: bool) -> List[str]:
+    return [camel_to_snake(v) for v in volatile] if normalize else list(volatile)
+
+
+def content_hash(data, normalize=True, volatile: Iterable[str] = ()) -> str:
+    """Return a stable content hash of data.
+
+    Parameters:
+        data: data to hash
+        normalize (bool): convert keys to snake case
+        volatile (Iterable[str]): top level fields (not normalized) which are not hashed
+    """
+    return _dump_hash(_normalize(data) if normalize else data, _volatile(volatile, normalize), render=False)[1]
+
+
+def json_dump_hash(
+    data, normalize=True, serializer: Optional[str] = None, volatile: Iterable[str] = ()
+) -> Tuple[str, str]:
+    """Dump a dictionnary as json and return its content hash.
+
+    Parameters:
+        data: data to dump
+        normalize (bool): convert keys to snake case
+        serializer (Optional[str]): serializer name (default serializer if None)
+        volatile (Iterable[str]): top level fields (not normalized) which are dumped but not hashed
+
+    Returns:
+        (Tuple[str, str]): json text (same as ``json_dump``) and content hash (same as ``content_hash``)
+    """
+    data = _normalize(data) if normalize else data
+    volatile = _volatile(volatile, normalize)
+    dump = get_serializer(serializer)
+    if dump is _json_serializer:
+        return _dump_hash(data, volatile, render=True)
+    return dump(data), _dump_hash(data, volatile, render=False)[1]
 
 
 # _camel_to_snake optimisation pattern
 _pattern_1 = re.compile("(.)([A-Z][a-z]+)")
 _pattern_2 = re.compile("([a-z0-9])([A-Z])")
 
+# camel_to_snake memoization: AWS payloads use a small set of keys
+_SNAKE_CACHE_SIZE = 8192
+_snake_cache: Dict[str, str] = {}
+
 
 def camel_to_snake(name: str) -> str:
     """Convert camel case string to snake case."""
-    name = _pattern_1.sub(r"\1_\2", name)
-    return _pattern_2.sub(r"\1_\2", name).lower()
-
-
-def _normalize(data: Dict) -> Dict:
-    """Normalize dictionary keys."""
-    new_data = dict(map(lambda item: (camel_to_snake(item[0]), item[1]), data.items()))
-    for key, value in new_data.items():
-        if isinstance(value, dict):
-            new_data[key] = _normalize(value)
-        if isinstance(value, list):
-            for i in range(len(value)):
-                if isinstance(value[i], dict):
-                    value[i] = _normalize(value[i])
-
-    return new_data
+    snake = _snake_cache.get(name)
+    if snake is None:
+        snake = _pattern_2.sub(r"\1_\2", _pattern_1.sub(r"\1_\2", name)).lower()
+        if len(_snake_cache) >= _SNAKE_CACHE_SIZE:
+            # bounded: user defined keys (tags, policies) may be unlimited
+            _snake_cache.clear()
+        _snake_cache[name] = snake
+    return snake
+
+
+def data_key(data: Dict, name: str) -> str:
+    """Return the key of a field in raw or normalized data (``name`` if data has none)."""
+    if name in data:
+        return name
+    snake = camel_to_snake(name)
+    return snake if snake in data else name
+
+
+def _normalize(data: Any) -> Any:
+    """Normalize dictionary keys.
+
+    The tree is walked iteratively (no recursion limit) and is never modified:
+    a dict or list is copied only when a key or an item below it changes,
+    unchanged structures are returned as is.
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+    # a frame is [source, keys, values, index, changed]
+    stack = [_frame(data)]
+    while True:
+        frame = stack[-1]
+        values = frame[2]
+        index = frame[3]
+        # advance to the next container child
+        while index < len(values) and not isinstance(values[index], (dict, list)):
+            index += 1
+        frame[3] = index
+        if index < len(values):
+            stack.append(_frame(values[index]))
+            continue
+        # frame complete
+        stack.pop()
+        source, keys, values, _, changed = frame
+        if changed:
+            result = dict(zip(keys, values)) if keys is not None else values
+        else:
+            result = source
+        if not stack:
+            return result
+        parent = stack[-1]
+        if result is not source:
+            if not parent[4] and parent[1] is None:
+                # copy on write of the parent list
+                parent[2] = list(parent[2])
+            parent[2][parent[3]] = result
+            parent[4] = True
+        parent[3] += 1
+
+
+def _frame(data: Any) -> List:
+    if isinstance(data, dict):
+        keys = []
+        changed = False
+        for key in data:
+            if isinstance(key, str):
+                snake = camel_to_snake(key)
+                changed = changed or snake != key
+                key = snake
+            keys.append(key)
+        return [data, keys, list(data.values()), 0, changed]
+    return [data, None, data, 0, False]
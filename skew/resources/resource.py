@@ -13,13 +13,19 @@
 # ANY KIND, either express or implied. See the License for the specific
 # language governing permissions and limitations under the License.
 
+import copy
 import logging
+from functools import partial
 
-import jmespath
 from botocore.exceptions import ClientError
 
 from skew.awsclient import get_awsclient
-from skew.resources.json_dump import json_dump
+from skew.boto.query import query_fields, search
+from skew.resources.compact import CompactResource
+from skew.resources.filters import id_prefix, is_id_pattern, resource_filter, tag_filters
+from skew.resources.hydration import iter_hydrated
+from skew.resources.json_dump import content_hash, json_dump, json_dump_hash
+from skew.resources.tag_index import enumerate_tagged
 
 LOG = logging.getLogger(__name__)
 
@@ -27,6 +33,22 @@ __all__ = ["Resource"]
 
 
 class Resource(object):
+    # no per instance __dict__: every subclass declares __slots__ (with the
+    # attributes it adds), or its instances get one again
+    __slots__ = (
+        "_client",
+        "_data",
+        "_id",
+        "_metrics",
+        "_name",
+        "_date",
+        "_arn",
+        "_tags",
+        "_query",
+        "_fields",
+        "filtered_data",
+    )
+
     @classmethod
     def get_awsclient(cls, region_name, account_id, **kwargs):
         """Get aws client and merge parameters."""
@@ -42,7 +64,14 @@ class Resource(object):
         op_kwargs = {}
 
         do_client_side_filtering = False
-        if resource_id and resource_id != "*":
+        if is_id_pattern(resource_id):
+            # Resources are checked against the pattern after the enumeration,
+            # but a prefix can be pushed down if the API supports it.
+            prefix = id_prefix(resource_id)
+            prefix_filter_name = getattr(cls.Meta, "prefix_filter_name", None)
+            if prefix and prefix_filter_name:
+                op_kwargs[prefix_filter_name] = prefix
+        elif resource_id and resource_id != "*":
             # If we are looking for a specific resource and the
             # API provides a way to filter on a specific resource
             # id then let's insert the right parameter to do the filtering.
@@ -59,24 +88,86 @@ class Resource(object):
             else:
                 do_client_side_filtering = True
 
+        data_filter = partial(cls.filter, arn, resource_id) if do_client_side_filtering else None
+        return cls._enumerate_call(client, arn, op_kwargs, data_filter, resource_id=resource_id, **kwargs)
+
+    @classmethod
+    def enumerate_tagged(cls, arn, region, account, resource_id=None, **kwargs):
+        """Enumerate resources with the scan tags, found with the Resource Groups Tagging API.
+
+        See ``skew.resources.tag_index``.
+        """
+        return enumerate_tagged(
+            cls,
+            arn,
+            region,
+            account,
+            resource_id=resource_id,
+            by_ids=cls.enumerate.__func__ is Resource.enumerate.__func__,
+            **kwargs,
+        )
+
+    @classmethod
+    def _enumerate_call(
+        cls, client, arn, op_kwargs, data_filter=None, resource_id=None, quiet_not_found=True, **kwargs
+    ):
+        """Call the enumeration operation and build resources.
+
+        Parameters:
+            client: aws client
+            arn: scanned arn
+            op_kwargs (Dict): operation parameters (in addition to the enum_spec ones)
+            data_filter (Optional[Callable]): predicate on enumerated data
+            resource_id: scanned resource id
+            quiet_not_found (bool): return no resource on a not found error (otherwise raise it)
+            kwargs: scan parameters
+        """
         enum_op, path, extra_args = cls.Meta.enum_spec
         if extra_args:
             op_kwargs.update(extra_args)
+        tags = kwargs.get("tags")
+        tag_filter_name = getattr(cls.Meta, "tag_filter_name", None)
+        if tags and tag_filter_name:
+            op_kwargs[tag_filter_name] = op_kwargs.get(tag_filter_name, []) + tag_filters(tags)
         LOG.debug("enum_spec=%s" % str(cls.Meta.enum_spec))
 
         try:
             data = client.call(enum_op, query=path, **op_kwargs)
             if data:
-                if do_client_side_filtering:
-                    data = filter(lambda d: cls.filter(arn, resource_id, d), data)
-                return map(lambda d: cls(client, d, arn.query), data)
+                if data_filter:
+                    data = filter(data_filter, data)
+                return cls._build_resources(client, data, arn, resource_id=resource_id, **kwargs)
         except ClientError as e:
             LOG.debug(e)
             # if the error is because the resource was not found, be quiet
-            if "NotFound" not in e.response["Error"]["Code"]:
+            if not quiet_not_found or "NotFound" not in e.response["Error"]["Code"]:
                 raise
         return []
 
+    @classmethod
+    def _build_resources(cls, client, data, arn, resource_id=None, **kwargs):
+        """Build, select and hydrate resources of an enumeration.
+
+        Parameters:
+            client: aws client
+            data: iterable of enumerated resource data
+            arn: scanned arn
+            resource_id: scanned resource id (resources are checked if it is a pattern)
+            kwargs: scan parameters (``fields``, ``tags``, ``hydration_workers``)
+        """
+        fields = kwargs.get("fields")
+
+        def build(d):
+            resource = cls(client, d, arn.query)
+            resource.set_fields(fields)
+            return resource
+
+        resources = map(build, data)
+        predicate = resource_filter(resource_id, kwargs.get("tags"))
+        if predicate:
+            resources = filter(predicate, resources)
+        return iter_hydrated(resources, workers=kwargs.get("hydration_workers"))
+
     class Meta(object):
         type = "resource"
         dimension = None
@@ -94,17 +185,39 @@ class Resource(object):
         self._date = None
         self._arn = None
         self._tags = None
-        self._cloudwatch = (
-            self._client.create_client(service="cloudwatch")
-            if hasattr(self.Meta, "dimension") and self.Meta.dimension
-            else None
-        )
         self._query = query
+        # top level fields loaded on demand (None for all), the query ones by default
+        self._fields = query_fields(query) if query else None
         self.filtered_data = self._query.search(self._data) if self._query else None
 
     def __repr__(self):
         return self.arn
 
+    def set_fields(self, fields):
+        """Restrict the data loaded on demand to these top level fields.
+
+        Fields read by the query are always loaded.  Fields already
+        present in data are kept.
+
+        Parameters:
+            fields (Optional[Iterable[str]]): top level field names (None for all)
+        """
+        if fields is None:
+            return
+        needed = query_fields(self._query) if self._query else frozenset()
+        self._fields = None if needed is None else frozenset(fields) | needed
+
+    def _wants(self, field):
+        """Return True if the top level field should be loaded."""
+        return self._fields is None or field in self._fields
+
+    @property
+    def _cloudwatch(self):
+        """Return cloudwatch client (shared by all resources of the same client) if resource has metrics."""
+        if getattr(self.Meta, "dimension", None):
+            return self._client.for_service("cloudwatch")
+        return None
+
     @property
     def arn(self):
         if not self._arn:
@@ -129,7 +242,7 @@ class Resource(object):
     @property
     def name(self):
         if not self._name:
-            self._name = jmespath.search(self.Meta.name, self._data)
+            self._name = search(self.Meta.name, self._data)
         return self._name
 
     @property
@@ -139,7 +252,7 @@ class Resource(object):
     @property
     def date(self):
         if not self._date:
-            self._date = jmespath.search(self.Meta.date, self._data)
+            self._date = search(self.Meta.date, self._data)
         return self._date
 
     @property
@@ -160,5 +273,67 @@ class Resource(object):
                 return m
         return None
 
-    def json_dump(self, normalize=True):
-        return json_dump(self.data, normalize=normalize)
+    @classmethod
+    def sleek_data(cls, data):
+        """Canonicalize resource data in place, to avoid false change detection.
+
+        Volatile values are reset and lists are sorted.  Resource classes
+        override it, it is also applied to scan outputs by ``skew.diff``:
+        fields are looked up with ``data_key``.
+
+        Parameters:
+            data (Dict): resource data (raw or normalized)
+        """
+        return data
+
+    def sleek(self):
+        """Canonicalize data of this resource (see ``sleek_data``)."""
+        self.sleek_data(self.data)
+
+    @classmethod
+    def relations_data(cls, data):
+        """Yield resources referenced by resource data (``Meta.relations``).
+
+        Parameters:
+            data (Dict): resource data (not normalized)
+
+        Returns:
+            (Iterator[Tuple[str, str, str]]): service, resource type and identifier (id or arn)
+        """
+        for service, resource_type, query in getattr(cls.Meta, "relations", ()):
+            value = search(query, data)
+            for identifier in value if isinstance(value, list) else [value]:
+                if identifier:
+                    yield service, resource_type, identifier
+
+    def relations(self):
+        """Return resources referenced by this resource (see ``relations_data``)."""
+        return list(self.relations_data(self.data))
+
+    def json_dump(self, normalize=True, serializer=None):
+        return json_dump(self.data, normalize=normalize, serializer=serializer)
+
+    @classmethod
+    def _sleeks(cls):
+        """Return True if the class overrides ``sleek_data``."""
+        return cls.sleek_data.__func__ is not Resource.sleek_data.__func__
+
+    def _sleek_copy(self):
+        """Return data after ``sleek_data``, the data of the resource is not modified."""
+        return self.sleek_data(copy.deepcopy(self.data)) if self._sleeks() else self.data
+
+    def content_hash(self, normalize=True):
+        """Return a stable hash of the data (after ``sleek_data``), without ``Meta.volatile`` fields."""
+        return content_hash(self._sleek_copy(), normalize=normalize, volatile=getattr(self.Meta, "volatile", ()))
+
+    def json_dump_hash(self, normalize=True, serializer=None):
+        """Dump data as json (same as ``json_dump``) and return it with its content hash (see ``content_hash``)."""
+        if not self._sleeks():
+            # data is its own canonical form: dumped and hashed at once
+            volatile = getattr(self.Meta, "volatile", ())
+            return json_dump_hash(self.data, normalize=normalize, serializer=serializer, volatile=volatile)
+        return self.json_dump(normalize=normalize, serializer=serializer), self.content_hash(normalize=normalize)
+
+    def compact(self):
+        """Return a ``CompactResource`` copy of this resource, without client."""
+        return CompactResource.from_resource(self)
@@ -0,0 +1,214 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You
+# may not use this file except in compliance with the License. A copy of
+# the License is located at
+#
+# http://aws.amazon.com/apache2.0/
+#
+# or in the "license" file accompanying this file. This file is
+# distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF
+# ANY KIND, either express or implied. See the License for the specific
+# language governing permissions and limitations under the License.
+"""Tag index scan.
+
+With ``scan(..., tags={...}, tag_index=True)``, tagged resources are first
+looked up with the Resource Groups Tagging API (``get_resources``, which
+filters on tags and resource type server side).  Then only the returned resources
+are fetched:
+
+* with the ``filter_name`` of the resource class when it takes a list of
+  ids or arns (by chunks of ``ID_CHUNK_SIZE``; a chunk with a resource
+  deleted since it was indexed, which fails with a not found error, is
+  fetched again id by id)
+* otherwise the resource class is enumerated and resources are selected
+  by id
+
+Tag values with wildcards are not supported by the tagging api: only the
+tag key is sent for them and values are checked with the returned tags.
+Global services (no region) are enumerated as usual.
+"""
+import logging
+from fnmatch import fnmatchcase
+from typing import Dict, List, Set, Tuple
+
+from botocore.exceptions import ClientError
+
+from skew.awsclient import get_awsclient
+from skew.resources.filters import has_wildcard, match_tags
+
+LOG = logging.getLogger(__name__)
+
+__all__ = [
+    "ID_CHUNK_SIZE",
+    "tagging_service",
+    "tagging_resource_type",
+    "tag_index_filters",
+    "get_tagged_resources",
+    "enumerate_tagged",
+]
+
+ID_CHUNK_SIZE = 100
+
+# skew service names which are not the arn service names
+_TAGGING_SERVICES = {
+    "elb": "elasticloadbalancing",
+    "elbv2": "elasticloadbalancing",
+    "efs": "elasticfilesystem",
+    "stepfunctions": "states",
+}
+
+# (skew service, resource type) of the resources whose arns have no resource type
+# (arn:aws:sns:us-east-1:123456789012:name)
+_UNTYPED_ARNS = {("sns", "topic"), ("sqs", "queue"), ("s3", "bucket")}
+
+# (skew service, resource type) whose arns have another resource type
+_ARN_TYPES = {
+    ("efs", "filesystem"): "file-system",
+    ("ec2", "address"): "elastic-ip",
+    ("ec2", "flow-log"): "vpc-flow-log",
+}
+
+# (skew service, resource type): id of a resource of the class from the id of its arn, None when the arn is
+# not a resource of the class (classic and application/network load balancers have the same arn type)
+_ARN_IDS = {
+    ("elb", "loadbalancer"): lambda arn_id: None if "/" in arn_id else arn_id,
+    ("elbv2", "loadbalancer"): lambda arn_id: arn_id.split("/")[1] if arn_id.count("/") == 2 else None,
+    ("elbv2", "targetgroup"): lambda arn_id: arn_id.split("/")[0],
+}
+
+
+def tagging_service(service: str) -> str:
+    """Return the service name used in arns (and tagging api filters) of a skew service."""
+    return _TAGGING_SERVICES.get(service, service)
+
+
+def _arn_type(service: str, resource_type: str) -> str:
+    # resource type of the arns of a skew resource type, "*" when the arns have no resource type
+    if (service, resource_type) in _UNTYPED_ARNS:
+        return "*"
+    return _ARN_TYPES.get((service, resource_type), resource_type)
+
+
+def tagging_resource_type(service: str, resource_type: str) -> str:
+    """Return the tagging api resource type filter (``service:type``) of a skew resource type."""
+    arn_type = _arn_type(service, resource_type)
+    if arn_type == "*":
+        return tagging_service(service)
+    return f"{tagging_service(service)}:{arn_type}"
+
+
+def tag_index_filters(tags: Dict) -> List[Dict]:
+    """Return tagging api TagFilters of tags (values with wildcards are checked afterwards)."""
+    filters = []
+    for key, values in tags.items():
+        tag_filter = {"Key": key}
+        if values is not None:
+            values = [values] if isinstance(values, str) else list(values)
+            if not any(has_wildcard(v) for v in values):
+                tag_filter["Values"] = values
+        filters.append(tag_filter)
+    return filters
+
+
+def _split_arn(arn: str) -> Tuple[str, str]:
+    # resource type and id of an arn, type is "*" when the arn has no resource type
+    resource = arn.split(":", 5)[5]
+    for separator in ("/", ":"):
+        if separator in resource:
+            resource_type, resource_id = resource.split(separator, 1)
+            return resource_type, resource_id
+    return "*", resource
+
+
+def get_tagged_resources(client, tags: Dict, resource_type: str) -> Dict[str, Dict]:
+    """Return tags of the resources of a type which match tags, by arn.
+
+    Parameters:
+        client: resourcegroupstaggingapi aws client
+        tags (Dict): scan tags
+        resource_type (str): tagging api resource type filter (see ``tagging_resource_type``)
+    """
+    mappings = client.call(
+        "get_resources",
+        query="ResourceTagMappingList[]",
+        TagFilters=tag_index_filters(tags),
+        ResourceTypeFilters=[resource_type],
+    )
+    result = {}
+    for mapping in mappings or []:
+        resource_tags = {t["Key"]: t["Value"] for t in mapping.get("Tags", [])}
+        if match_tags(resource_tags, tags):
+            result[mapping["ResourceARN"]] = resource_tags
+    return result
+
+
+def enumerate_tagged(cls, arn, region, account, resource_id=None, by_ids=True, **kwargs):
+    """Enumerate resources of a class which match the scan tags, through the tagging api.
+
+    Parameters:
+        cls: resource class
+        arn: scanned arn
+        region (str): region name
+        account (str): account identifier
+        resource_id (Optional[str]): scanned resource id or pattern
+        by_ids (bool): resources can be fetched by ids with ``filter_name``
+            (False if the class has its own enumeration)
+        kwargs: scan parameters (``tags``)
+    """
+    tags = kwargs.get("tags")
+    if not tags or not region:
+        return cls.enumerate(arn, region, account, resource_id, **kwargs)
+
+    client = get_awsclient(
+        **{**kwargs, "service_name": "resourcegroupstaggingapi", "region_name": region, "account_id": account}
+    )
+    tagged = get_tagged_resources(client, tags, tagging_resource_type(cls.Meta.service, cls.Meta.type))
+
+    # arns (by id) of this resource type
+    arn_type = _arn_type(cls.Meta.service, cls.Meta.type)
+    arn_id = _ARN_IDS.get((cls.Meta.service, cls.Meta.type))
+    candidates: Dict[str, str] = {}
+    for tagged_arn in tagged:
+        resource_type, tagged_id = _split_arn(tagged_arn)
+        if resource_type != arn_type:
+            continue
+        if arn_id is not None:
+            tagged_id = arn_id(tagged_id)
+            if tagged_id is None:
+                continue
+        if resource_id and resource_id != "*" and not fnmatchcase(tagged_id, resource_id):
+            continue
+        candidates[tagged_id] = tagged_arn
+    LOG.debug("tag index: %d %s resources", len(candidates), cls.Meta.type)
+    if not candidates:
+        return []
+
+    # tags are already checked
+    kwargs = {k: v for k, v in kwargs.items() if k not in ("tags", "tag_index")}
+    filter_type = getattr(cls.Meta, "filter_type", None)
+    if by_ids and getattr(cls.Meta, "filter_name", None) and filter_type in ("list", "arn"):
+        return _enumerate_ids(cls, arn, region, account, candidates, **kwargs)
+    ids: Set[str] = set(candidates)
+    return [r for r in cls.enumerate(arn, region, account, resource_id, **kwargs) if r.id in ids]
+
+
+def _enumerate_ids(cls, arn, region, account, candidates: Dict[str, str], **kwargs):
+    client = cls.get_awsclient(region_name=region, account_id=account, **kwargs)
+    values = list(candidates.values() if cls.Meta.filter_type == "arn" else candidates.keys())
+    for index in range(0, len(values), ID_CHUNK_SIZE):
+        chunk = values[index : index + ID_CHUNK_SIZE]
+        try:
+            resources = cls._enumerate_call(
+                client, arn, {cls.Meta.filter_name: chunk}, quiet_not_found=len(chunk) == 1, **kwargs
+            )
+        except ClientError as e:
+            if "NotFound" not in e.response["Error"]["Code"]:
+                raise
+            # a resource deleted since it was indexed fails the whole chunk
+            LOG.debug("tag index: %s, fetching %d %s resources one by one", e, len(chunk), cls.Meta.type)
+            resources = []
+            for value in chunk:
+                resources.extend(cls._enumerate_call(client, arn, {cls.Meta.filter_name: [value]}, **kwargs))
+        for resource in resources:
+            yield resource
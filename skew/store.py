@@ -0,0 +1,164 @@
+# Copyright (c) 2020 Jerome Guibert
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Content addressed snapshot store.
+
+A store is a directory with:
+
+* ``objects/ab/abcdef....json``: serialized resources, named by their
+  content hash (``Resource.json_dump_hash``), written once
+* ``manifests/<name>.jsonl``: one ``{"arn": ..., "hash": ...}`` record per
+  resource of a scan, sorted by arn (see ``skew.diff.sort_key``)
+
+Unchanged resources are stored once for all scans: a scan only writes the
+objects of new or changed resources, and its manifest.  Manifests can be
+compared with ``skew.diff`` (objects are only read for resources whose hash
+changed).
+
+Objects are named by the hash of the non volatile fields: when only volatile
+fields of a resource change, the stored object keeps their previous values.
+"""
+import datetime
+import json
+import os
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+__all__ = ["ObjectStore", "SnapshotStore", "read_manifest", "replace_file"]
+
+OBJECTS = "objects"
+MANIFESTS = "manifests"
+
+# umask of the process (read once: os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def replace_file(tmp: str, path: str):
+    """Publish a temporary file written with ``tempfile.mkstemp`` as ``path``.
+
+    mkstemp creates files readable by their owner only: the file gets the mode of
+    a file created with ``open`` before it is renamed.
+    """
+    os.chmod(tmp, 0o666 & ~_UMASK)
+    os.replace(tmp, path)
+
+
+class ObjectStore(object):
+    """Serialized resources named by content hash.
+
+    Parameters:
+        path (str): store directory
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._known = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_manifest(cls, manifest_path: str) -> "ObjectStore":
+        """Return the object store of a manifest file."""
+        return cls(os.path.dirname(os.path.dirname(os.path.abspath(manifest_path))))
+
+    def _file(self, digest: str) -> str:
+        return os.path.join(self._path, OBJECTS, digest[:2], f"{digest}.json")
+
+    def put(self, digest: str, text: str) -> bool:
+        """Store a serialized resource, return False if it was already stored."""
+        with self._lock:
+            if digest in self._known:
+                return False
+            self._known.add(digest)
+        path = self._file(digest)
+        if os.path.exists(path):
+            return False
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            replace_file(tmp, path)
+        except BaseException:
+            with self._lock:
+                self._known.discard(digest)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return True
+
+    def get(self, digest: str):
+        """Return the data of a stored resource."""
+        with open(self._file(digest)) as f:
+            return json.load(f)
+
+
+class SnapshotStore(object):
+    """Write the resources of a scan in a store (thread safe).
+
+    Parameters:
+        path (str): store directory
+        name (Optional[str]): manifest name (default: utc time ``20200101T000000Z``)
+    """
+
+    def __init__(self, path: str, name: Optional[str] = None):
+        self._path = path
+        self._name = name if name else datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        self._objects = ObjectStore(path)
+        self._entries: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self.written = 0
+
+    @property
+    def manifest_path(self) -> str:
+        """Return the manifest file of this scan."""
+        return os.path.join(self._path, MANIFESTS, f"{self._name}.jsonl")
+
+    def add(self, arn: str, digest: str, text: str):
+        """Add a serialized resource to the scan."""
+        written = self._objects.put(digest, text)
+        with self._lock:
+            self._entries.append((arn, digest))
+            if written:
+                self.written += 1
+
+    def write(self, resource, normalize: bool = False, serializer: Optional[str] = None):
+        """Add a resource to the scan."""
+        text, digest = resource.json_dump_hash(normalize=normalize, serializer=serializer)
+        self.add(resource.arn, digest, text)
+
+    def close(self) -> str:
+        """Write the manifest (sorted by arn) and return its path."""
+        from skew.diff import sort_key
+
+        with self._lock:
+            entries = sorted(self._entries, key=lambda entry: sort_key(entry[0]))
+        path = self.manifest_path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w") as f:
+            for arn, digest in entries:
+                f.write(json.dumps({"arn": arn, "hash": digest}) + "\n")
+        replace_file(tmp, path)
+        return path
+
+
+def read_manifest(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield (arn, hash) of a manifest."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["arn"], record["hash"]
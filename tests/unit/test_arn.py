@@ -63,6 +63,17 @@ class TestARN(unittest.TestCase):
         r = l[0]
         self.assertEqual(r.filtered_data, "t2.small")
 
+    def test_ec2_filters(self):
+        placebo_cfg = {
+            "placebo": placebo,
+            "placebo_data_path": self._get_response_path("instances_1"),
+            "placebo_mode": "playback",
+        }
+        l = list(scan("arn:aws:ec2:us-west-2:123456789012:instance/i-db*", **placebo_cfg))
+        self.assertEqual([r.id for r in l], ["i-db530902"])
+        l = list(scan("arn:aws:ec2:us-west-2:123456789012:instance/*", tags={"Name": "DevTest*"}, **placebo_cfg))
+        self.assertEqual([r.id for r in l], ["i-c81fb512"])
+
     def test_ec2_instance_not_found(self):
         placebo_cfg = {
             "placebo": placebo,
@@ -180,6 +191,19 @@ class TestARN(unittest.TestCase):
         l = list(arn)
         self.assertEqual(len(l), 5)
 
+    def test_s3_buckets_fields(self):
+        placebo_cfg = {
+            "placebo": placebo,
+            "placebo_data_path": self._get_response_path("buckets"),
+            "placebo_mode": "playback",
+        }
+        l = list(scan("arn:aws:s3:us-east-1:234567890123:bucket/*|LocationConstraint", **placebo_cfg))
+        self.assertIn("LocationConstraint", l[0].data)
+        self.assertNotIn("Acl", l[0].data)
+        l = list(scan("arn:aws:s3:us-east-1:234567890123:bucket/*", fields=["Policy"], **placebo_cfg))
+        self.assertIn("Policy", l[0].data)
+        self.assertNotIn("LocationConstraint", l[0].data)
+
     def test_iam_groups(self):
         placebo_cfg = {
             "placebo": placebo,
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import skew
+from skew.arn import ARN
+from skew.arn.parser import ParsedArn, parse_arn, parse_arns, split_resource
+
+
+class TestArnParser(unittest.TestCase):
+    def test_parse_arn(self):
+        self.assertEqual(
+            parse_arn("arn:aws:ec2:us-east-1:123456789012:instance/i-1234"),
+            ParsedArn("aws", "ec2", "us-east-1", "123456789012", "instance", "i-1234"),
+        )
+        self.assertEqual(
+            parse_arn("arn:aws:iam::123456789012:role/service-role/my-role"),
+            ("aws", "iam", "", "123456789012", "role", "service-role/my-role"),
+        )
+        self.assertEqual(
+            parse_arn("arn:aws:lambda:us-east-1:123456789012:function:my-function:1").resource_id, "my-function:1"
+        )
+        self.assertEqual(parse_arn("arn:aws:sns:us-east-1:123456789012:my-topic")[4:], ("*", "my-topic"))
+        with self.assertRaises(ValueError):
+            parse_arn("arn:aws:s3")
+
+    def test_same_split_as_scan_patterns(self):
+        for resource in ("instance/i-1234", "function:name:1", "topic", "role/a/b", "key:id/x"):
+            arn = ARN(f"arn:aws:ec2:us-east-1:123456789012:{resource}")
+            self.assertEqual(split_resource(resource), arn.resource._split_resource(resource))
+
+    def test_parse_arns(self):
+        arns = [
+            "arn:aws:ec2:us-east-1:123456789012:instance/i-1",
+            "not an arn",
+            "arn:aws:ec2:us-east-1:123456789012:instance/i-2",
+        ]
+        with self.assertRaises(ValueError):
+            parse_arns(arns)
+        first, invalid, second = parse_arns(arns, strict=False)
+        self.assertIsNone(invalid)
+        self.assertEqual(second.resource_id, "i-2")
+        # components are shared
+        self.assertIs(first.account, second.account)
+        self.assertIs(first.resource_type, second.resource_type)
+
+    def test_lazy_import(self):
+        # a fresh interpreter: the parser does not load boto3 nor yaml
+        statement = (
+            "import sys, skew.arn.parser; "
+            "print(' '.join(m for m in ('boto3', 'botocore', 'yaml') if m in sys.modules))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(skew.__file__)))
+        output = subprocess.check_output([sys.executable, "-c", statement], cwd=root)
+        self.assertEqual(output.decode().strip(), "")
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+import mock
+
+from skew.cli import _STOP, ResourceWriter, _make_directory, _output_file
+
+
+def fake_resource(arn, content="{}"):
+    resource = mock.Mock(arn=arn)
+    resource.json_dump.return_value = content
+    return resource
+
+
+class TestResourceWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_output_file(self):
+        self.assertEqual(
+            _output_file("out", "arn:aws:ec2:us-east-1:123456789012:instance/i-1234"),
+            (os.path.join("out", "arn", "aws", "ec2", "us-east-1", "123456789012", "instance"), "i-1234.json"),
+        )
+        self.assertEqual(
+            _output_file("out", "arn:aws:sns:us-east-1:123456789012:topic"),
+            (os.path.join("out", "arn", "aws", "sns", "us-east-1", "123456789012"), "topic.json"),
+        )
+
+    def _write(self, workers):
+        resources = [
+            fake_resource(f"arn:aws:ec2:us-east-1:123456789012:instance/i-{i:04d}", f'{{"i": {i}}}') for i in range(50)
+        ]
+        writer = ResourceWriter(self.tmp.name, workers=workers, queue_size=4)
+        with mock.patch("skew.cli._make_directory", wraps=_make_directory) as make_directory:
+            for resource in resources:
+                writer.write(resource)
+            writer.close()
+        directory = os.path.join(self.tmp.name, "arn", "aws", "ec2", "us-east-1", "123456789012", "instance")
+        self.assertEqual(len(os.listdir(directory)), 50)
+        with open(os.path.join(directory, "i-0042.json")) as f:
+            self.assertEqual(f.read(), '{"i": 42}')
+        # directories are created once per writer
+        self.assertLessEqual(make_directory.call_count, max(workers, 1))
+
+    def test_writer_pool(self):
+        self._write(workers=4)
+
+    def test_synchronous(self):
+        self._write(workers=0)
+
+    def test_error(self):
+        resource = fake_resource("arn:aws:ec2:us-east-1:123456789012:instance/i-1")
+        resource.json_dump.side_effect = ValueError("not serializable")
+        writer = ResourceWriter(self.tmp.name, workers=2)
+        writer.write(resource)
+        with self.assertRaises(ValueError):
+            writer.close()
+
+    def test_first_error(self):
+        resources = [fake_resource(f"arn:aws:ec2:us-east-1:123456789012:instance/i-{i}") for i in range(2)]
+        resources[0].json_dump.side_effect = ValueError("first")
+        resources[1].json_dump.side_effect = TypeError("second")
+        writer = ResourceWriter(self.tmp.name, workers=0)
+        # a writer thread loop, run in this thread
+        for item in resources + [_STOP]:
+            writer._queue.put(item)
+        writer._run()
+        with self.assertRaises(ValueError):
+            writer.close()
+
+    def test_abort(self):
+        resource = fake_resource("arn:aws:ec2:us-east-1:123456789012:instance/i-1")
+        resource.json_dump.side_effect = ValueError("not serializable")
+        writer = ResourceWriter(self.tmp.name, workers=2)
+        writer.write(resource)
+        writer.abort()
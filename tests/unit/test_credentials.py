@@ -0,0 +1,131 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import mock
+
+from skew.boto.credentials import CredentialsCache, get_refreshable_credentials
+from skew.boto.utility import get_session
+from skew.config import get_accounts, get_credentials, prefetch_credentials
+
+ORGANIZATION_ACCOUNTS = [
+    {"Id": "123456789012", "Status": "ACTIVE"},
+    {"Id": "234567890123", "Status": "ACTIVE"},
+    {"Id": "345678901234", "Status": "ACTIVE"},
+]
+
+
+def fake_assume_role(role_arn, profile_name=None, external_id=None, lifetime=3600):
+    expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=lifetime)
+    return {"aws_access_key_id": role_arn, "aws_secret_access_key": "secret", "aws_session_token": "token"}, expiration
+
+
+class TestCredentialsCache(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch("skew.boto.credentials._assume_role", side_effect=fake_assume_role)
+        self.assume_role = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cached(self):
+        cache = CredentialsCache()
+        credentials = cache.get("arn:aws:iam::123456789012:role/foo")
+        self.assertEqual(credentials["aws_access_key_id"], "arn:aws:iam::123456789012:role/foo")
+        cache.get("arn:aws:iam::123456789012:role/foo")
+        self.assertEqual(self.assume_role.call_count, 1)
+
+    def test_assumed_again_before_expiration(self):
+        self.assume_role.side_effect = lambda *args, **kwargs: fake_assume_role(*args, lifetime=200, **kwargs)
+        cache = CredentialsCache(refresh_margin=300)
+        cache.get("arn:aws:iam::123456789012:role/foo")
+        cache.get("arn:aws:iam::123456789012:role/foo")
+        self.assertEqual(self.assume_role.call_count, 2)
+
+    def test_get_many(self):
+        def assume_role(role_arn, **kwargs):
+            if "bad" in role_arn:
+                raise Exception("AccessDenied")
+            return fake_assume_role(role_arn, **kwargs)
+
+        self.assume_role.side_effect = assume_role
+        cache = CredentialsCache()
+        roles = [("arn:aws:iam::%012d:role/foo" % i, None, None) for i in range(20)]
+        roles.append(("arn:aws:iam::123456789012:role/bad", None, None))
+        result = cache.get_many(roles + roles[:5], workers=4)
+        self.assertEqual(len(result), 20)
+        self.assertEqual(self.assume_role.call_count, 21)
+
+    def test_disk_cache(self):
+        with tempfile.TemporaryDirectory() as path:
+            CredentialsCache(path=path, refresh_interval=None).get("arn:aws:iam::123456789012:role/foo")
+            credentials = CredentialsCache(path=path, refresh_interval=None).get("arn:aws:iam::123456789012:role/foo")
+            self.assertEqual(credentials["aws_access_key_id"], "arn:aws:iam::123456789012:role/foo")
+            self.assertEqual(self.assume_role.call_count, 1)
+            for filename in os.listdir(path):
+                self.assertEqual(os.stat(os.path.join(path, filename)).st_mode & 0o777, 0o600)
+
+    def test_refresh(self):
+        self.assume_role.side_effect = lambda *args, **kwargs: fake_assume_role(*args, lifetime=1000, **kwargs)
+        cache = CredentialsCache(refresh_interval=None)
+        cache.get("arn:aws:iam::123456789012:role/foo")
+        cache.refresh()
+        self.assertEqual(self.assume_role.call_count, 1)
+        cache.refresh(within=200)
+        self.assertEqual(self.assume_role.call_count, 2)
+
+    def test_idle_roles_not_refreshed(self):
+        self.assume_role.side_effect = lambda *args, **kwargs: fake_assume_role(*args, lifetime=1000, **kwargs)
+        cache = CredentialsCache(refresh_interval=None, idle_timeout=600)
+        cache.get("arn:aws:iam::123456789012:role/foo")
+        used = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=700)
+        with mock.patch.dict(cache._used, {("arn:aws:iam::123456789012:role/foo", None, None): used}):
+            cache.refresh(within=200)
+        self.assertEqual(self.assume_role.call_count, 1)
+        cache.refresh(within=200)
+        self.assertEqual(self.assume_role.call_count, 2)
+
+    def test_session_credentials(self):
+        with mock.patch("skew.boto.credentials._cache", CredentialsCache(refresh_interval=None)):
+            session = get_session(role_arn="arn:aws:iam::123456789012:role/foo")
+            self.assertEqual(self.assume_role.call_count, 0)
+            credentials = session.get_credentials()
+        self.assertEqual(credentials.get_frozen_credentials().access_key, "arn:aws:iam::123456789012:role/foo")
+
+    def test_refreshable_credentials(self):
+        with mock.patch("skew.boto.credentials._cache", CredentialsCache(refresh_interval=None)):
+            credentials = get_refreshable_credentials("arn:aws:iam::123456789012:role/foo").get_frozen_credentials()
+        self.assertEqual(credentials.access_key, "arn:aws:iam::123456789012:role/foo")
+        self.assertEqual(credentials.token, "token")
+
+
+class TestOrganizationAccounts(unittest.TestCase):
+    def setUp(self):
+        config_path = os.path.join(os.path.dirname(__file__), "cfg", "skew_organizations.yml")
+        mock.patch("os.environ", {"SKEW_CONFIG": config_path}).start()
+        mock.patch("skew.config._config", None).start()
+        mock.patch("skew.config.list_organization_accounts", return_value=ORGANIZATION_ACCOUNTS).start()
+        mock.patch("skew.boto.credentials._cache", CredentialsCache()).start()
+        self.assume_role = mock.patch("skew.boto.credentials._assume_role", side_effect=fake_assume_role).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_accounts(self):
+        accounts = get_accounts()
+        self.assertEqual(len(accounts), 3)
+        self.assertEqual(accounts["123456789012"], {"profile": "foo"})
+        self.assertEqual(
+            accounts["234567890123"],
+            {
+                "role_arn": "arn:aws:iam::234567890123:role/OrganizationAccountAccessRole",
+                "source_profile": "management",
+            },
+        )
+
+    def test_credentials(self):
+        self.assertIsNone(get_credentials("123456789012"))
+        prefetch_credentials(["123456789012", "234567890123", "345678901234"])
+        self.assertEqual(self.assume_role.call_count, 2)
+        credentials = get_credentials("345678901234")
+        self.assertEqual(
+            credentials["aws_access_key_id"], "arn:aws:iam::345678901234:role/OrganizationAccountAccessRole"
+        )
+        self.assertEqual(self.assume_role.call_count, 2)
@@ -0,0 +1,126 @@
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from skew.cli import ResourceWriter
+from skew.diff import (
+    ADDED,
+    ARNS_FILE,
+    CHANGED,
+    REMOVED,
+    FieldChange,
+    diff,
+    diff_data,
+    diff_snapshots,
+    read_directory,
+    write_arns,
+)
+
+ASG = "arn:aws:autoscaling:us-east-1:123456789012:autoScalingGroup:uuid:autoScalingGroupName/web"
+
+
+def records(*items):
+    return [(arn, data, None) for arn, data in items]
+
+
+class TestDiff(unittest.TestCase):
+    def test_diff_data(self):
+        old = {"State": {"Name": "running"}, "Tags": [{"Key": "a", "Value": "1"}], "Old": 1}
+        new = {"State": {"Name": "stopped"}, "Tags": [{"Key": "a", "Value": "2"}], "New": 2}
+        self.assertEqual(
+            diff_data(old, new),
+            [
+                FieldChange("New", None, 2),
+                FieldChange("Old", 1, None),
+                FieldChange("State.Name", "running", "stopped"),
+                FieldChange("Tags[0].Value", "1", "2"),
+            ],
+        )
+        self.assertEqual(diff_data({"L": [1]}, {"L": [1, 2]}), [FieldChange("L", [1], [1, 2])])
+
+    def test_merge(self):
+        old = records(
+            ("arn:aws:ec2:us-east-1:123456789012:instance/i-1", {"a": 1}),
+            ("arn:aws:ec2:us-east-1:123456789012:instance/i-2", {"a": 1}),
+            ("arn:aws:ec2:us-east-1:123456789012:volume/v-1", {"a": 1}),
+        )
+        new = records(
+            ("arn:aws:ec2:us-east-1:123456789012:instance/i-2", {"a": 2}),
+            ("arn:aws:ec2:us-east-1:123456789012:instance/i-3", {"a": 1}),
+            ("arn:aws:ec2:us-east-1:123456789012:volume/v-1", {"a": 1}),
+        )
+        changes = [(c.kind, c.arn.split(":")[-1]) for c in diff(old, new)]
+        self.assertEqual(changes, [(REMOVED, "instance/i-1"), (CHANGED, "instance/i-2"), (ADDED, "instance/i-3")])
+
+    def test_same_hash(self):
+        old = [("arn:aws:sns:us-east-1:123456789012:topic", {"a": 1}, "h1")]
+        new = [("arn:aws:sns:us-east-1:123456789012:topic", {"a": 2}, "h1")]
+        self.assertEqual(list(diff(old, new)), [])
+
+    def test_sleek(self):
+        old = records((ASG, {"EnabledMetrics": [{"Metric": "b"}, {"Metric": "a"}], "SuspendedProcesses": []}))
+        new = records((ASG, {"EnabledMetrics": [{"Metric": "a"}, {"Metric": "b"}], "SuspendedProcesses": []}))
+        self.assertEqual(list(diff(old, new)), [])
+        old = records(("arn:aws:rds:us-east-1:123456789012:db:main", {"LatestRestorableTime": "10:00"}))
+        new = records(("arn:aws:rds:us-east-1:123456789012:db:main", {"LatestRestorableTime": "11:00"}))
+        self.assertEqual(list(diff(old, new)), [])
+
+    def test_sleek_normalized(self):
+        old = records((ASG, {"enabled_metrics": [{"metric": "b"}, {"metric": "a"}], "suspended_processes": []}))
+        new = records((ASG, {"enabled_metrics": [{"metric": "a"}, {"metric": "b"}], "suspended_processes": []}))
+        self.assertEqual(list(diff(old, new)), [])
+        efs = "arn:aws:elasticfilesystem:us-east-1:123456789012:file-system-id/fs-1"
+        old = records((efs, {"size_in_bytes": {"value": 1}, "name": "a"}))
+        new = records((efs, {"size_in_bytes": {"value": 2}, "name": "b"}))
+        self.assertEqual([c.fields for c in diff(old, new)], [[FieldChange("name", "a", "b")]])
+        rds = "arn:aws:rds:us-east-1:123456789012:db:main"
+        old = records((rds, {"latest_restorable_time": "10:00"}))
+        new = records((rds, {"latest_restorable_time": "11:00"}))
+        self.assertEqual(list(diff(old, new)), [])
+
+    def test_volatile(self):
+        table = "arn:aws:dynamodb:us-east-1:123456789012:table/orders"
+        old = records((table, {"item_count": 10, "table_status": "ACTIVE"}))
+        new = records((table, {"item_count": 12, "table_status": "ACTIVE"}))
+        self.assertEqual(list(diff(old, new)), [])
+
+    def test_snapshots(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            arns = [
+                "arn:aws:ec2:us-east-1:123456789012:instance/i-1",
+                "arn:aws:ec2:us-east-1:123456789012:instance/i-2",
+                "arn:aws:sns:us-east-1:123456789012:topic",
+            ]
+            others = [
+                "arn:aws:iam::123456789012:role/admin",
+                "arn:aws:rds:us-east-1:123456789012:db:main",
+                "arn:aws:s3:::my-bucket",
+            ]
+            writer = ResourceWriter(os.path.join(tmp, "old"), workers=0)
+            for i, arn in enumerate(arns + others):
+                resource = mock.Mock(arn=arn)
+                resource.json_dump.return_value = json.dumps({"i": i})
+                writer.write(resource)
+            writer.close()
+            self.assertEqual(
+                [r[0] for r in read_directory(os.path.join(tmp, "old"))],
+                [arns[0], arns[1], others[0], others[1], others[2], arns[2]],
+            )
+
+            with open(os.path.join(tmp, "new.jsonl"), "w") as f:
+                f.write(json.dumps({"arn": arns[1], "data": {"i": 1}}) + "\n")
+                for i, arn in enumerate(others, len(arns)):
+                    f.write(json.dumps({"arn": arn, "data": {"i": i}}) + "\n")
+                f.write(json.dumps({"arn": arns[2], "data": {"i": 3}}) + "\n")
+            changes = list(diff_snapshots(os.path.join(tmp, "old"), os.path.join(tmp, "new.jsonl")))
+            self.assertEqual([(c.kind, c.arn) for c in changes], [(REMOVED, arns[0]), (CHANGED, arns[2])])
+            self.assertEqual(changes[1].fields, [FieldChange("i", 2, 3)])
+
+    def test_arns_file_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with mock.patch("skew.store._UMASK", 0o022):
+                write_arns(tmp, {"ec2/instance/i-1.json": "arn:aws:ec2:us-east-1:123456789012:instance/i-1"})
+            self.assertEqual(os.stat(os.path.join(tmp, ARNS_FILE)).st_mode & 0o777, 0o644)
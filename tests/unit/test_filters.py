@@ -0,0 +1,96 @@
+import unittest
+
+import mock
+
+from skew.resources.aws import AWSResource
+from skew.resources.filters import id_prefix, is_id_pattern, match_tags, tag_filters
+
+
+class FakeClient(object):
+    service_name = "foo"
+    region_name = "us-east-1"
+    account_id = "123456789012"
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, op_name, query=None, **kwargs):
+        self.calls.append((op_name, kwargs))
+        return [{"FooId": "foo-1"}, {"FooId": "foo-2"}, {"FooId": "bar-1"}]
+
+
+class FooResource(AWSResource):
+    client = None
+
+    class Meta(object):
+        service = "foo"
+        type = "foo"
+        enum_spec = ("describe_foos", "Foos", None)
+        id = "FooId"
+        filter_name = "FooIds"
+        filter_type = "list"
+        prefix_filter_name = "FooIdPrefix"
+        tag_filter_name = "Filters"
+
+    @classmethod
+    def get_awsclient(cls, region_name, account_id, **kwargs):
+        return cls.client
+
+    @property
+    def tags(self):
+        return {"env": "prod" if self.id.endswith("1") else "dev"}
+
+
+class TestFilters(unittest.TestCase):
+    def setUp(self):
+        FooResource.client = FakeClient()
+        self.arn = mock.Mock(query=None)
+
+    def _enumerate(self, resource_id, **kwargs):
+        return list(FooResource.enumerate(self.arn, "us-east-1", "123456789012", resource_id, **kwargs))
+
+    def test_id_pattern(self):
+        self.assertFalse(is_id_pattern("*"))
+        self.assertFalse(is_id_pattern("i-123456"))
+        self.assertTrue(is_id_pattern("i-12*"))
+        self.assertEqual(id_prefix("i-12*"), "i-12")
+        self.assertIsNone(id_prefix("i-*-12*"))
+        self.assertIsNone(id_prefix("*-12"))
+
+    def test_tag_filters(self):
+        self.assertEqual(
+            tag_filters({"env": "prod", "team": ["a", "b"], "owner": None}),
+            [
+                {"Name": "tag:env", "Values": ["prod"]},
+                {"Name": "tag:team", "Values": ["a", "b"]},
+                {"Name": "tag-key", "Values": ["owner"]},
+            ],
+        )
+
+    def test_match_tags(self):
+        self.assertTrue(match_tags({"env": "prod", "team": "a"}, {"env": "prod"}))
+        self.assertTrue(match_tags({"env": "prod"}, {"env": ["dev", "pr*"]}))
+        self.assertTrue(match_tags({"env": "prod"}, {"env": None}))
+        self.assertFalse(match_tags({"env": "prod"}, {"env": "dev"}))
+        self.assertFalse(match_tags({}, {"env": None}))
+
+    def test_prefix_pushdown(self):
+        resources = self._enumerate("foo-*")
+        self.assertEqual(FooResource.client.calls, [("describe_foos", {"FooIdPrefix": "foo-"})])
+        self.assertEqual([r.id for r in resources], ["foo-1", "foo-2"])
+
+    def test_pattern(self):
+        resources = self._enumerate("*-1")
+        self.assertEqual(FooResource.client.calls, [("describe_foos", {})])
+        self.assertEqual([r.id for r in resources], ["foo-1", "bar-1"])
+
+    def test_tags_pushdown(self):
+        resources = self._enumerate("*", tags={"env": "prod"})
+        self.assertEqual(
+            FooResource.client.calls, [("describe_foos", {"Filters": [{"Name": "tag:env", "Values": ["prod"]}]})]
+        )
+        self.assertEqual([r.id for r in resources], ["foo-1", "bar-1"])
+
+    def test_exact_id(self):
+        self._enumerate("foo-1")
+        self.assertEqual(FooResource.client.calls, [("describe_foos", {"FooIds": ["foo-1"]})])
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from skew.graph import BOTH, INCOMING, OUTGOING, RelationGraph
+from skew.resources.aws.autoscaling import AutoScalingGroup
+from skew.resources.aws.ec2 import Instance, NetworkInterface
+
+PREFIX = "arn:aws:ec2:us-east-1:123456789012:"
+TG_ARN = "arn:aws:elasticloadbalancing:us-east-1:123456789012:targetgroup/tg/1"
+ASG_ARN = "arn:aws:autoscaling:us-east-1:123456789012:autoScalingGroup:1:autoScalingGroupName/asg"
+
+
+def build_graph():
+    graph = RelationGraph()
+    graph.add_node(PREFIX + "vpc/vpc-1", "ec2", "vpc", "vpc-1")
+    graph.add_node(PREFIX + "subnet/subnet-1", "ec2", "subnet", "subnet-1", [("ec2", "vpc", "vpc-1")])
+    graph.add_node(
+        PREFIX + "instance/i-1",
+        "ec2",
+        "instance",
+        "i-1",
+        [("ec2", "subnet", "subnet-1"), ("ec2", "vpc", "vpc-1"), ("ec2", "image", "ami-unknown")],
+    )
+    graph.add_node(TG_ARN, "elbv2", "targetgroup", TG_ARN, [("ec2", "vpc", "vpc-1")])
+    asg_relations = [("elbv2", "targetgroup", TG_ARN), ("ec2", "instance", "i-1")]
+    graph.add_node(ASG_ARN, "autoscaling", "autoScalingGroup", "asg", asg_relations)
+    # same identifier in another region
+    graph.add_node(
+        "arn:aws:ec2:eu-west-1:123456789012:subnet/subnet-2", "ec2", "subnet", "subnet-2", [("ec2", "vpc", "vpc-1")]
+    )
+    return graph
+
+
+class TestRelations(unittest.TestCase):
+    def test_relations_data(self):
+        data = {"ImageId": "ami-1", "VpcId": "vpc-1", "SecurityGroups": [{"GroupId": "sg-1"}]}
+        self.assertEqual(
+            list(Instance.relations_data(data)),
+            [("ec2", "image", "ami-1"), ("ec2", "vpc", "vpc-1"), ("ec2", "security-group", "sg-1")],
+        )
+        self.assertEqual(
+            list(NetworkInterface.relations_data({"Attachment": {"InstanceId": "i-1"}})),
+            [("ec2", "instance", "i-1")],
+        )
+        data = {"LaunchTemplate": {"LaunchTemplateId": "lt-1"}, "VPCZoneIdentifier": "s-1,s-2"}
+        self.assertEqual(
+            list(AutoScalingGroup.relations_data(data)),
+            [("ec2", "launch-template", "lt-1"), ("ec2", "subnet", "s-1"), ("ec2", "subnet", "s-2")],
+        )
+
+
+class TestRelationGraph(unittest.TestCase):
+    def test_graph(self):
+        graph = build_graph()
+        self.assertEqual(len(graph), 6)
+        # unknown image and the vpc of another region are not resolved
+        self.assertEqual(graph.edge_count, 6)
+        instance = graph.node(PREFIX + "instance/i-1")
+        vpc, subnet = graph.node(PREFIX + "vpc/vpc-1"), graph.node(PREFIX + "subnet/subnet-1")
+        self.assertEqual(sorted(graph.successors(instance)), sorted([vpc, subnet]))
+        self.assertEqual(len(graph.predecessors(instance)), 1)
+
+    def test_reachable(self):
+        graph = build_graph()
+        blast = graph.reachable(PREFIX + "vpc/vpc-1")
+        self.assertEqual(len(blast), 4)
+        self.assertEqual(blast[-1], ASG_ARN)
+        self.assertEqual(
+            sorted(graph.reachable(PREFIX + "vpc/vpc-1", max_depth=1)),
+            [PREFIX + "instance/i-1", PREFIX + "subnet/subnet-1", TG_ARN],
+        )
+        self.assertEqual(graph.reachable(PREFIX + "subnet/subnet-1", direction=OUTGOING), [PREFIX + "vpc/vpc-1"])
+        self.assertEqual(len(graph.reachable(PREFIX + "subnet/subnet-1", direction=BOTH)), 4)
+
+    def test_save_load(self):
+        graph = build_graph()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "graph.bin")
+            graph.save(path)
+            loaded = RelationGraph.load(path)
+        self.assertEqual(loaded.arns, graph.arns)
+        self.assertEqual(loaded.edge_count, graph.edge_count)
+        self.assertEqual(
+            loaded.reachable(PREFIX + "vpc/vpc-1", direction=INCOMING), graph.reachable(PREFIX + "vpc/vpc-1")
+        )
+        with self.assertRaises(ValueError):
+            loaded.add_node(PREFIX + "vpc/vpc-2", "ec2", "vpc", "vpc-2")
@@ -0,0 +1,101 @@
+import threading
+import unittest
+
+import jmespath
+
+from skew.resources.aws import AWSResource
+from skew.resources.hydration import hydrate, iter_hydrated
+
+
+class FakeClient(object):
+    service_name = "foo"
+    region_name = "us-east-1"
+    account_id = "123456789012"
+
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+        self.fail = False
+
+    def call(self, op_name, query=None, **kwargs):
+        self.calls.append((op_name, kwargs))
+        if self.fail and op_name == "get_foo_policy":
+            raise RuntimeError("throttled")
+        self.threads.add(threading.current_thread().name)
+        if op_name == "describe_foo":
+            data = {"Foo": {"FooId": kwargs["FooId"], "Size": 42}, "ResponseMetadata": {}}
+        else:
+            data = {"Policy": "policy-%s" % kwargs["FooId"]}
+        return jmespath.search(query, data) if query else data
+
+
+class FooResource(AWSResource):
+    class Meta(object):
+        service = "foo"
+        type = "foo"
+        id = "FooId"
+        hydrate = [
+            (None, ("describe_foo", "Foo", "FooId", "id")),
+            ("Policy", ("get_foo_policy", "Policy", "FooId", "id")),
+        ]
+
+
+class TestHydration(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+
+    def _resources(self, count, query=None):
+        return [FooResource(self.client, {"FooId": "foo-%d" % i}, query) for i in range(count)]
+
+    def test_build_does_not_call(self):
+        self._resources(3)
+        self.assertEqual(self.client.calls, [])
+
+    def test_hydrate(self):
+        resources = hydrate(self._resources(10), workers=4)
+        self.assertEqual(len(self.client.calls), 20)
+        self.assertEqual(resources[3].data, {"FooId": "foo-3", "Size": 42, "Policy": "policy-foo-3"})
+        # hydrated once
+        hydrate(resources)
+        self.assertEqual(len(self.client.calls), 20)
+
+    def test_hydrate_in_calling_thread(self):
+        hydrate(self._resources(3), workers=1)
+        self.assertEqual(self.client.threads, {threading.current_thread().name})
+
+    def test_iter_hydrated(self):
+        resources = list(iter_hydrated(iter(self._resources(5)), chunk_size=2))
+        self.assertEqual([r.id for r in resources], ["foo-%d" % i for i in range(5)])
+        self.assertEqual(resources[4].data["Size"], 42)
+
+    def test_lazy_hydration(self):
+        resource = self._resources(1)[0]
+        self.assertEqual(resource.data["Policy"], "policy-foo-0")
+        self.assertEqual(len(self.client.calls), 2)
+
+    def test_query_on_hydrated_data(self):
+        resources = hydrate(self._resources(1, query=jmespath.compile("Size")))
+        self.assertEqual(resources[0].filtered_data, 42)
+
+    def test_fields(self):
+        resources = self._resources(2)
+        resources[0].set_fields(["FooId"])
+        hydrate(resources)
+        self.assertNotIn("Policy", resources[0].data)
+        self.assertEqual(resources[1].data["Policy"], "policy-foo-1")
+        self.assertEqual(len(self.client.calls), 3)
+
+    def test_query_fields(self):
+        resource = self._resources(1, query=jmespath.compile("Policy"))[0]
+        resource.set_fields(["Size"])
+        hydrate([resource])
+        self.assertEqual(resource.filtered_data, "policy-foo-0")
+
+    def test_failed_hydration_is_retried(self):
+        self.client.fail = True
+        resources = self._resources(2)
+        with self.assertRaises(RuntimeError):
+            hydrate(resources, workers=2)
+        self.assertEqual(resources[0]._data, {"FooId": "foo-0"})
+        self.client.fail = False
+        self.assertEqual(resources[0].data, {"FooId": "foo-0", "Size": 42, "Policy": "policy-foo-0"})
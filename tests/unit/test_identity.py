@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+
+import mock
+from botocore.credentials import Credentials, RefreshableCredentials
+
+from skew.arn import ARN
+from skew.boto.identity import clear_identity_cache, credentials_fingerprint, get_caller_identity_account_id
+
+
+def fake_session(access_key="AKIDEXAMPLE"):
+    session = mock.Mock(profile_name="default")
+    session.get_credentials.return_value = Credentials(access_key, "secret", method="env")
+    return session
+
+
+def fake_refreshable_session(access_key):
+    def metadata():
+        return {
+            "access_key": access_key,
+            "secret_key": "secret",
+            "token": "token",
+            "expiry_time": "2100-01-01T00:00:00Z",
+        }
+
+    session = mock.Mock(profile_name="default")
+    session.get_credentials.return_value = RefreshableCredentials.create_from_metadata(
+        metadata(), refresh_using=metadata, method="iam-role"
+    )
+    return session
+
+
+class TestIdentity(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        mock.patch.dict("os.environ", {"SKEW_CACHE_DIR": self.tmp.name}).start()
+        self.get_client = mock.patch("skew.boto.identity.get_client").start()
+        self.get_client.return_value.get_caller_identity.return_value = {"Account": "123456789012"}
+        clear_identity_cache()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(clear_identity_cache)
+
+    def test_fingerprint(self):
+        self.assertEqual(credentials_fingerprint(fake_session()), credentials_fingerprint(fake_session()))
+        self.assertNotEqual(credentials_fingerprint(fake_session()), credentials_fingerprint(fake_session("AKID2")))
+        self.assertNotIn("AKIDEXAMPLE", credentials_fingerprint(fake_session()))
+
+    def test_cached(self):
+        self.assertEqual(get_caller_identity_account_id(fake_session()), "123456789012")
+        self.assertEqual(get_caller_identity_account_id(fake_session()), "123456789012")
+        self.assertEqual(self.get_client.call_count, 1)
+        # on disk for the next runs
+        clear_identity_cache()
+        self.assertEqual(get_caller_identity_account_id(fake_session()), "123456789012")
+        self.assertEqual(self.get_client.call_count, 1)
+        # other credentials
+        get_caller_identity_account_id(fake_session("AKID2"))
+        self.assertEqual(self.get_client.call_count, 2)
+
+    def test_refreshable_credentials(self):
+        # instance profiles of different accounts, with the default profile
+        self.assertNotEqual(
+            credentials_fingerprint(fake_refreshable_session("ASIA1")),
+            credentials_fingerprint(fake_refreshable_session("ASIA2")),
+        )
+        self.get_client.return_value.get_caller_identity.side_effect = [{"Account": "111111111111"}]
+        self.assertEqual(get_caller_identity_account_id(fake_refreshable_session("ASIA1")), "111111111111")
+        self.assertEqual(get_caller_identity_account_id(fake_refreshable_session("ASIA1")), "111111111111")
+        # not on disk
+        clear_identity_cache()
+        self.get_client.return_value.get_caller_identity.side_effect = [{"Account": "222222222222"}]
+        self.assertEqual(get_caller_identity_account_id(fake_refreshable_session("ASIA1")), "222222222222")
+        self.assertEqual(self.get_client.return_value.get_caller_identity.call_count, 2)
+
+    def test_disk_cache_disabled(self):
+        with mock.patch.dict("os.environ", {"SKEW_IDENTITY_CACHE": "0"}):
+            get_caller_identity_account_id(fake_session())
+            clear_identity_cache()
+            get_caller_identity_account_id(fake_session())
+        self.assertEqual(self.get_client.call_count, 2)
+
+    def test_arn_without_network(self):
+        with mock.patch("skew.config._config", None), mock.patch.dict("os.environ", {"SKEW_CONFIG": "/nonexistent"}):
+            arn = ARN("arn:aws:ec2:us-east-1:*:instance/*")
+            self.assertEqual(str(arn), "arn:aws:ec2:us-east-1:*:instance/*")
+        self.assertEqual(self.get_client.call_count, 0)
@@ -0,0 +1,58 @@
+import unittest
+
+from skew.inventory import Inventory
+
+
+class FakeResource(object):
+    def __init__(self, service, resource_type, region, resource_id, parent=None, tags=None, account="123456789012"):
+        self.Meta = type("Meta", (object,), {"service": service, "type": resource_type})
+        self.resourcetype = resource_type
+        self.id = resource_id
+        self.parent = parent
+        self.tags = tags or {}
+        self.arn = f"arn:aws:{service}:{region}:{account}:{resource_type}/{resource_id}"
+
+    def __repr__(self):
+        return self.id
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.image = FakeResource("ec2", "image", "us-east-1", "ami-1")
+        self.instance = FakeResource("ec2", "instance", "us-east-1", "i-1", parent="ami-1", tags={"env": "prod"})
+        self.other = FakeResource("ec2", "instance", "eu-west-1", "i-2", parent="ami-1", tags={"env": "dev"})
+        self.volume = FakeResource("ec2", "volume", "us-east-1", "vol-1", parent="i-1", tags={"env": "prod"})
+        self.topic = FakeResource("sns", "topic", "us-east-1", "t", account="210987654321")
+        self.inventory = Inventory([self.image, self.instance, self.other, self.volume, self.topic])
+
+    def test_indexes(self):
+        self.assertEqual(len(self.inventory), 5)
+        self.assertIs(self.inventory.get(self.instance.arn), self.instance)
+        self.assertEqual(self.inventory.by_type("ec2", "instance"), [self.instance, self.other])
+        self.assertEqual(self.inventory.by_region("eu-west-1"), [self.other])
+        self.assertEqual(self.inventory.by_account("210987654321"), [self.topic])
+        self.assertEqual(self.inventory.by_tag("env"), [self.instance, self.other, self.volume])
+        self.assertEqual(self.inventory.by_tag("env", "prod"), [self.instance, self.volume])
+        self.assertEqual(self.inventory.by_tag("missing"), [])
+        self.assertEqual(self.inventory.find(region="us-east-1", tags={"env": "prod"}), [self.instance, self.volume])
+        self.assertEqual(self.inventory.find(service="ec2", resource_type="volume", tags={"env": None}), [self.volume])
+
+    def test_parent(self):
+        self.assertEqual(self.inventory.children(self.image.arn), [self.instance])
+        self.assertEqual(self.inventory.children(self.instance.arn), [self.volume])
+        self.assertIs(self.inventory.parent(self.volume.arn), self.instance)
+        # parent ids are resolved in the region of the child
+        self.assertIsNone(self.inventory.parent(self.other.arn))
+        self.assertIsNone(self.inventory.parent(self.image.arn))
+
+    def test_remove(self):
+        self.inventory.remove(self.instance.arn)
+        self.assertNotIn(self.instance.arn, self.inventory)
+        self.assertEqual(self.inventory.by_tag("env", "prod"), [self.volume])
+        self.assertEqual(self.inventory.children(self.image.arn), [])
+        self.assertIsNone(self.inventory.parent(self.volume.arn))
+        # replaced resources are reindexed
+        self.volume.tags = {"env": "dev"}
+        self.inventory.add(self.volume)
+        self.assertEqual(self.inventory.by_tag("env", "dev"), [self.other, self.volume])
+        self.assertEqual(len(self.inventory), 4)
@@ -0,0 +1,114 @@
+import copy
+import datetime
+import json
+import unittest
+
+from skew.resources.json_dump import (
+    _SERIALIZERS,
+    _normalize,
+    camel_to_snake,
+    content_hash,
+    get_serializer,
+    json_dump,
+    json_dump_hash,
+    register_serializer,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class TestJsonDump(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "InstanceId": "i-123456",
+            "LaunchTime": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+            "Tags": [{"Key": "Name", "Value": "web"}],
+            "BlockDeviceMappings": [{"DeviceName": "/dev/sda1", "Ebs": {"VolumeId": "vol-123456"}}],
+            "SecurityGroups": [],
+            "snake_case": {"already_snake": [1, 2, [{"NestedKey": None}]]},
+        }
+
+    def test_camel_to_snake(self):
+        self.assertEqual(camel_to_snake("InstanceId"), "instance_id")
+        self.assertEqual(camel_to_snake("SSHPublicKeys"), "ssh_public_keys")
+        self.assertEqual(camel_to_snake("logGroupName"), "log_group_name")
+        # cached value
+        self.assertEqual(camel_to_snake("InstanceId"), "instance_id")
+
+    def test_normalize(self):
+        normalized = _normalize(self.data)
+        self.assertEqual(normalized["instance_id"], "i-123456")
+        self.assertEqual(normalized["tags"], [{"key": "Name", "value": "web"}])
+        self.assertEqual(normalized["block_device_mappings"][0]["ebs"]["volume_id"], "vol-123456")
+        self.assertEqual(normalized["snake_case"]["already_snake"][2], [{"nested_key": None}])
+
+    def test_normalize_does_not_modify_data(self):
+        origin = copy.deepcopy(self.data)
+        _normalize(self.data)
+        self.assertEqual(self.data, origin)
+
+    def test_normalize_keeps_unchanged_structures(self):
+        normalized = _normalize(self.data)
+        self.assertIs(normalized["security_groups"], self.data["SecurityGroups"])
+        unchanged = {"already_snake": [1, {"a": "b"}]}
+        self.assertIs(_normalize(unchanged), unchanged)
+
+    def test_normalize_deep_data(self):
+        data = value = {}
+        for _ in range(5000):
+            value["Child"] = {}
+            value = value["Child"]
+        normalized = _normalize(data)
+        self.assertIn("child", normalized)
+
+    def test_json_dump(self):
+        dump = json_dump(self.data, normalize=True)
+        self.assertIn('"instance_id": "i-123456"', dump)
+        self.assertIn('"launch_time": "2020-01-01T00:00:00+00:00"', dump)
+        self.assertIn('"InstanceId": "i-123456"', json_dump(self.data, normalize=False))
+
+    def test_json_dump_hash(self):
+        for normalize in (True, False):
+            dump, digest = json_dump_hash(self.data, normalize=normalize, serializer="json")
+            self.assertEqual(dump, json_dump(self.data, normalize=normalize, serializer="json"))
+            self.assertEqual(digest, content_hash(self.data, normalize=normalize))
+        self.assertEqual(json_dump_hash([1, 2])[0], json_dump([1, 2]))
+        register_serializer("compact", lambda data: json.dumps(data, sort_keys=True, default=str))
+        self.addCleanup(_SERIALIZERS.pop, "compact", None)
+        self.assertEqual(json_dump_hash(self.data, serializer="compact")[1], content_hash(self.data))
+
+    def test_content_hash(self):
+        changed = copy.deepcopy(self.data)
+        changed["LaunchTime"] = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        self.assertNotEqual(content_hash(self.data), content_hash(changed))
+        self.assertEqual(
+            content_hash(self.data, volatile=["LaunchTime"]), content_hash(changed, volatile=["LaunchTime"])
+        )
+        self.assertEqual(
+            content_hash(self.data, normalize=False, volatile=["LaunchTime"]),
+            content_hash(changed, normalize=False, volatile=["LaunchTime"]),
+        )
+
+    def test_unknown_serializer(self):
+        with self.assertRaises(ValueError):
+            json_dump(self.data, serializer="foo")
+
+    def test_register_serializer(self):
+        register_serializer("compact", lambda data: json.dumps(data, sort_keys=True, default=str))
+        self.addCleanup(_SERIALIZERS.pop, "compact", None)
+        self.assertEqual(json_dump({"B": 1, "A": 2}, normalize=False, serializer="compact"), '{"A": 2, "B": 1}')
+
+    def test_auto_serializer(self):
+        self.assertIs(get_serializer("auto"), get_serializer("orjson" if orjson else "json"))
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson_serializer(self):
+        self.data["Secret"] = b"bytes"
+        dump = json_dump(self.data, serializer="orjson")
+        self.assertEqual(json.loads(dump), json.loads(json_dump(self.data, serializer="json")))
+        self.assertIn('"launch_time": "2020-01-01T00:00:00+00:00"', dump)
+        keys = list(json.loads(dump).keys())
+        self.assertEqual(keys, sorted(keys))
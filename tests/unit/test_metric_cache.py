@@ -0,0 +1,96 @@
+import datetime
+import shutil
+import tempfile
+import unittest
+
+from botocore.utils import parse_timestamp
+
+from skew.metrics.cache import MetricCache
+
+DIMENSIONS = [{"Name": "InstanceId", "Value": "i-123456"}]
+
+
+class FakeCloudWatch(object):
+    """Return one datapoint per period, valued with its epoch."""
+
+    def __init__(self):
+        self.calls = []
+
+    def call(self, op_name, query=None, **kwargs):
+        start = int(parse_timestamp(kwargs["StartTime"]).timestamp())
+        end = int(parse_timestamp(kwargs["EndTime"]).timestamp())
+        self.calls.append((start, end, kwargs["Statistics"]))
+        return [
+            {
+                "Timestamp": datetime.datetime.fromtimestamp(t, tz=datetime.timezone.utc),
+                "Unit": "Percent",
+                **{s: float(t) for s in kwargs["Statistics"]},
+            }
+            for t in range(start, end, kwargs["Period"])
+        ]
+
+
+class TestMetricCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.cloudwatch = FakeCloudWatch()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def _get(self, cache, start, end, statistics=("Average",)):
+        return cache.get_metric_statistics(
+            self.cloudwatch,
+            start,
+            end,
+            dimensions=DIMENSIONS,
+            namespace="AWS/EC2",
+            metric_name="CPUUtilization",
+            statistics=list(statistics),
+            period=60,
+            now=end,
+        )
+
+    def test_fetch_only_missing_range(self):
+        cache = MetricCache(path=self.path, settle=0)
+        datapoints = self._get(cache, 0, 600)
+        self.assertEqual(len(datapoints), 10)
+        self.assertEqual(self.cloudwatch.calls, [(0, 600, ["Average"])])
+
+        datapoints = self._get(cache, 300, 900)
+        self.assertEqual(self.cloudwatch.calls[-1], (600, 900, ["Average"]))
+        self.assertEqual([d["Average"] for d in datapoints], [float(t) for t in range(300, 900, 60)])
+        self.assertEqual(datapoints[0]["Unit"], "Percent")
+
+        # fully cached window
+        self._get(cache, 300, 900)
+        self.assertEqual(len(self.cloudwatch.calls), 2)
+
+    def test_persistent(self):
+        self._get(MetricCache(path=self.path, settle=0), 0, 600)
+        self._get(MetricCache(path=self.path, settle=0), 0, 600)
+        self.assertEqual(len(self.cloudwatch.calls), 1)
+
+    def test_settle_window_is_fetched_again(self):
+        cache = MetricCache(path=self.path, settle=120)
+        self._get(cache, 0, 600)
+        self._get(cache, 0, 600)
+        self.assertEqual(self.cloudwatch.calls[-1], (480, 600, ["Average"]))
+
+    def test_statistics_are_cached_separately(self):
+        cache = MetricCache(path=self.path, settle=0)
+        self._get(cache, 0, 600, statistics=["Average"])
+        datapoints = self._get(cache, 0, 600, statistics=["Average", "Maximum"])
+        self.assertEqual(self.cloudwatch.calls[-1], (0, 600, ["Maximum"]))
+        self.assertEqual(datapoints[1]["Maximum"], 60.0)
+        self.assertEqual(datapoints[1]["Average"], 60.0)
+
+    def test_cached_entry_not_modified(self):
+        cache = MetricCache(path=self.path, settle=0)
+        self._get(cache, 0, 600)
+        key = MetricCache.key(DIMENSIONS, "AWS/EC2", "CPUUtilization", "Average", 60)
+        entry = cache.load(key)
+        self._get(cache, 300, 900)
+        self.assertEqual((entry["start"], entry["end"], len(entry["points"])), (0, 600, 10))
+        self.assertIsNot(cache.load(key), entry)
+        self.assertEqual(cache.load(key)["end"], 900)
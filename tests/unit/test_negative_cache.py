@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+import mock
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from skew.arn.negative_cache import NegativeCache
+from skew.arn.resource import Resource
+from skew.boto.client import AWSClient
+
+CONTEXT = ["arn", "aws", "ec2", "us-east-1", "123456789012"]
+
+
+class TestNegativeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "negative.jsonl")
+
+    def test_persistent(self):
+        key = NegativeCache.key("123456789012", "us-east-1", "ec2", "instance")
+        cache = NegativeCache(path=self.path)
+        self.assertIsNone(cache.get(key))
+        cache.add(key, "empty")
+        cache.add(NegativeCache.key("123456789012", "us-east-1", "ec2", "volume"), "AccessDenied")
+        self.assertEqual(cache.get(key), "empty")
+        cache.discard(key)
+        cache = NegativeCache(path=self.path)
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.get("123456789012:us-east-1:ec2:volume"), "AccessDenied")
+        # journal is compacted on load
+        with open(self.path) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_ttl(self):
+        cache = NegativeCache(path=self.path, ttl=60)
+        cache.add("key", "empty")
+        with mock.patch("time.time", return_value=os.path.getmtime(self.path) + 120):
+            self.assertIsNone(cache.get("key"))
+            self.assertIsNone(NegativeCache(path=self.path, ttl=60).get("key"))
+
+
+class TestResourceUnits(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = NegativeCache(path=os.path.join(self.tmp.name, "negative.jsonl"))
+        self.resource_cls = mock.Mock()
+        patcher = mock.patch("skew.arn.resource.find_resource_class", return_value=self.resource_cls)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _enumerate(self, pattern="instance/*", **kwargs):
+        return list(Resource(pattern, mock.Mock()).enumerate(list(CONTEXT), negative_cache=self.cache, **kwargs))
+
+    def test_empty_unit_skipped(self):
+        self.resource_cls.enumerate.return_value = []
+        self.assertEqual(self._enumerate(), [])
+        self.assertEqual(self._enumerate(), [])
+        self.assertEqual(self.resource_cls.enumerate.call_count, 1)
+        self.assertEqual(self.cache.get("123456789012:us-east-1:ec2:instance"), "empty")
+
+    def test_filtered_unit_not_recorded(self):
+        self.resource_cls.enumerate.return_value = []
+        self._enumerate(pattern="instance/i-1234")
+        self._enumerate(tags={"env": "prod"})
+        self.assertIsNone(self.cache.get("123456789012:us-east-1:ec2:instance"))
+
+    def test_denied_unit(self):
+        error = ClientError({"Error": {"Code": "UnauthorizedOperation", "Message": ""}}, "DescribeInstances")
+        self.resource_cls.enumerate.side_effect = error
+        with self.assertRaises(ClientError):
+            self._enumerate()
+        self.assertEqual(self._enumerate(), [])
+        self.assertEqual(self.cache.get("123456789012:us-east-1:ec2:instance"), "UnauthorizedOperation")
+
+    def test_credentials_error_not_recorded(self):
+        error = ClientError({"Error": {"Code": "InvalidClientTokenId", "Message": ""}}, "DescribeInstances")
+        self.resource_cls.enumerate.side_effect = error
+        with self.assertRaises(ClientError):
+            self._enumerate()
+        self.assertIsNone(self.cache.get("123456789012:us-east-1:ec2:instance"))
+
+    def test_failed_call_not_recorded(self):
+        with mock.patch("skew.boto.client.get_session"), mock.patch("skew.boto.client.get_client"):
+            client = AWSClient("ec2", "123456789012", "us-east-1")
+        client._client.can_paginate.return_value = False
+        client._client.describe_instances.side_effect = EndpointConnectionError(endpoint_url="https://ec2")
+        # the enumeration gets no data from the failed call
+        self.resource_cls.enumerate.side_effect = lambda **kwargs: client.call("describe_instances") or []
+        self.assertEqual(self._enumerate(), [])
+        self.assertIsNone(self.cache.get("123456789012:us-east-1:ec2:instance"))
@@ -0,0 +1,27 @@
+import unittest
+
+import jmespath
+
+from skew.boto.query import compile_query, query_fields, search
+
+
+class TestQuery(unittest.TestCase):
+    def test_compile_once(self):
+        query = compile_query("Foo.Bar")
+        self.assertIs(compile_query("Foo.Bar"), query)
+        self.assertIs(compile_query(query), query)
+
+    def test_search(self):
+        data = {"Foo": {"Bar": [1, 2]}}
+        self.assertEqual(search("Foo.Bar", data), [1, 2])
+        self.assertEqual(search(jmespath.compile("Foo.Bar[0]"), data), 1)
+        self.assertIsNone(search("Missing", data))
+
+    def test_query_fields(self):
+        self.assertEqual(query_fields("InstanceType"), {"InstanceType"})
+        self.assertEqual(query_fields("{a: Acl.Grants, b: Policy}"), {"Acl", "Policy"})
+        self.assertEqual(query_fields("Tags[?Key=='Name'].Value | [0]"), {"Tags"})
+        self.assertEqual(query_fields("sort_by(Rules, &Id)[0]"), {"Rules"})
+        self.assertEqual(query_fields("[Foo, length(Bar)]"), {"Foo", "Bar"})
+        self.assertIsNone(query_fields("@"))
+        self.assertIsNone(query_fields("*.Status"))
@@ -0,0 +1,69 @@
+import unittest
+
+import mock
+
+from skew.arn.account import Account
+from skew.arn.region import Region
+from skew.boto.regions import clear_enabled_regions, get_enabled_regions, get_service_regions
+
+
+class TestServiceRegions(unittest.TestCase):
+    def test_service_regions(self):
+        regions = get_service_regions("ec2")
+        self.assertIn("us-east-1", regions)
+        self.assertIn("cn-north-1", regions)
+        self.assertNotIn("us-gov-west-1", regions)
+        self.assertIn("us-east-1", get_service_regions("states"))
+        self.assertEqual(get_service_regions("iam"), [])
+
+    def test_region_choices(self):
+        region = Region("*", None)
+        self.assertEqual(region.choices(["arn", "aws", "iam"]), [""])
+        self.assertEqual(region.choices(["arn", "aws", "ec2"]), get_service_regions("ec2"))
+        self.assertEqual(region.choices(["arn", "aws", "opsworks"]), Region._service_region_map["opsworks"])
+
+
+class TestEnabledRegions(unittest.TestCase):
+    def setUp(self):
+        clear_enabled_regions()
+        self.addCleanup(clear_enabled_regions)
+
+    def test_cached_per_account(self):
+        client = mock.Mock()
+        client.call.return_value = ["us-east-1", "eu-west-1"]
+        factory = mock.Mock(return_value=client)
+        self.assertEqual(get_enabled_regions("123456789012", factory), {"us-east-1", "eu-west-1"})
+        get_enabled_regions("123456789012", factory)
+        self.assertEqual(client.call.call_count, 1)
+        # the client is only built on a cache miss
+        self.assertEqual(factory.call_count, 1)
+
+    def test_failure_not_cached(self):
+        client = mock.Mock()
+        client.call.side_effect = Exception("AccessDenied")
+        self.assertIsNone(get_enabled_regions("234567890123", lambda: client))
+        # AWSClient.call returns no data on error
+        client.call.side_effect = None
+        client.call.return_value = {}
+        self.assertIsNone(get_enabled_regions("234567890123", lambda: client))
+        client.call.return_value = ["us-east-1"]
+        self.assertEqual(get_enabled_regions("234567890123", lambda: client), {"us-east-1"})
+        self.assertEqual(client.call.call_count, 3)
+
+    def test_account_skips_disabled_regions(self):
+        client = mock.Mock()
+        client.call.return_value = ["us-east-1"]
+        arn = mock.Mock()
+        arn.resource.enumerate.side_effect = lambda context, **kwargs: [context[-1]]
+        with mock.patch("skew.arn.account.get_accounts", return_value={"123456789012": {}}), mock.patch(
+            "skew.arn.account.prefetch_credentials"
+        ), mock.patch("skew.arn.account.get_awsclient", return_value=client) as get_awsclient:
+            account = Account("*", arn)
+            self.assertEqual(list(account.enumerate(["arn", "aws", "ec2", "us-east-1"])), ["123456789012"])
+            self.assertEqual(list(account.enumerate(["arn", "aws", "ec2", "af-south-1"])), [])
+            self.assertEqual(
+                list(account.enumerate(["arn", "aws", "ec2", "af-south-1"], check_regions=False)), ["123456789012"]
+            )
+            self.assertEqual(list(account.enumerate(["arn", "aws", "iam", ""])), ["123456789012"])
+            # regions are listed once per account
+            self.assertEqual(get_awsclient.call_count, 1)
@@ -17,6 +17,7 @@ import mock
 
 import skew.awsclient
 import skew.resources
+from skew.resources.aws.ec2 import Instance
 from skew.resources.definition import _RESOURCE_TYPES, find_resource_class
 from skew.resources.resource import Resource
 
@@ -28,6 +29,16 @@ class FooResource(Resource):
         id = 'bar'
 
 
+class HashedFooResource(FooResource):
+    class Meta(FooResource.Meta):
+        volatile = ('Counter',)
+
+    @classmethod
+    def sleek_data(cls, data):
+        data.get('Items', []).sort()
+        return data
+
+
 class TestResource(unittest.TestCase):
     def setUp(self):
         self.environ = {}
@@ -49,6 +60,36 @@ class TestResource(unittest.TestCase):
         self.assertEqual(resource.metrics, [])
         self.assertEqual(resource.find_metric('foobar'), None)
 
+    def test_content_hash(self):
+        client = skew.awsclient.get_awsclient(service_name='ec2', region_name='us-east-1', account_id='123456789012')
+        resource = HashedFooResource(client, data={'bar': 'bar', 'Items': [2, 1], 'Counter': 1})
+        other = HashedFooResource(client, data={'bar': 'bar', 'Items': [1, 2], 'Counter': 2})
+        self.assertEqual(resource.content_hash(), other.content_hash())
+        dump, digest = resource.json_dump_hash()
+        self.assertEqual(digest, resource.content_hash())
+        self.assertEqual(dump, resource.json_dump())
+        # data is not canonicalized in place
+        self.assertEqual(resource.data['Items'], [2, 1])
+        self.assertIn('"counter": 1', dump)
+
+    def test_compact_resource(self):
+        client = skew.awsclient.get_awsclient(service_name='ec2', region_name='us-east-1', account_id='123456789012')
+        data = {'InstanceId': 'i-123'}
+        resource = Instance(client, data=data)
+        self.assertFalse(hasattr(resource, '__dict__'))
+        compact = resource.compact()
+        self.assertFalse(hasattr(compact, '__dict__'))
+        self.assertEqual(compact.arn, 'arn:aws:ec2:us-east-1:123456789012:instance/i-123')
+        self.assertEqual(compact.region, 'us-east-1')
+        self.assertIs(compact.account, client.account_id)
+        self.assertEqual(compact.data, data)
+
+    def test_resource_classes_are_slotted(self):
+        for resource_type in _RESOURCE_TYPES:
+            cls = find_resource_class(resource_type)
+            for klass in cls.__mro__[:-1]:
+                self.assertIn('__slots__', vars(klass), '%s (%s)' % (klass.__name__, resource_type))
+
     def test_all_providers(self):
         all_providers = skew.resources.all_providers()
         self.assertEqual(len(all_providers), 1)
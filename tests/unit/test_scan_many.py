@@ -0,0 +1,68 @@
+import unittest
+
+import mock
+
+import skew
+from skew.arn import ARN
+from skew.arn.multi import WorkUnit, work_units
+
+PREFIX = "arn:aws:ec2:us-east-1:123456789012:"
+
+
+def fake_resource(resource_id):
+    return mock.Mock(id=resource_id, data={"InstanceId": resource_id, "State": "running"}, filtered_data=None)
+
+
+class TestScanMany(unittest.TestCase):
+    def setUp(self):
+        self.resource_cls = mock.Mock()
+        self.resource_cls.enumerate.side_effect = self._enumerate
+        self.calls = []
+        for target, value in (
+            ("skew.arn.resource.find_resource_class", self.resource_cls),
+            ("skew.arn.account.get_accounts", {"123456789012": {}}),
+            ("skew.arn.multi.prefetch_credentials", None),
+        ):
+            patcher = mock.patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _enumerate(self, arn, region, account, resource_id=None, **kwargs):
+        self.calls.append((str(arn), resource_id))
+        if not str(arn).endswith(":instance/" + resource_id):
+            return []
+        instances = [fake_resource(i) for i in ("i-1", "i-2", "j-3")]
+        return [i for i in instances if resource_id == "*" or i.id == resource_id]
+
+    def test_work_units(self):
+        units = list(work_units(ARN(PREFIX + "*/*")))
+        self.assertIn(WorkUnit("aws", "ec2", "us-east-1", "123456789012", "instance"), units)
+        self.assertIn(WorkUnit("aws", "ec2", "us-east-1", "123456789012", "volume"), units)
+
+    def test_units_enumerated_once(self):
+        patterns = [PREFIX + "instance/*", PREFIX + "instance/i-*|InstanceId", PREFIX + "*/*"]
+        results = list(skew.scan_many(patterns, check_regions=False))
+        # one enumeration per unit, with all resources
+        self.assertEqual(len(self.calls), len(list(work_units(ARN(PREFIX + "*/*")))))
+        self.assertEqual(self.calls.count((PREFIX + "instance/*", "*")), 1)
+        selected = [(r.pattern, r.resource.id, r.data) for r in results]
+        self.assertEqual(
+            selected,
+            [
+                (patterns[0], "i-1", None),
+                (patterns[1], "i-1", "i-1"),
+                (patterns[2], "i-1", None),
+                (patterns[0], "i-2", None),
+                (patterns[1], "i-2", "i-2"),
+                (patterns[2], "i-2", None),
+                (patterns[0], "j-3", None),
+                (patterns[2], "j-3", None),
+            ],
+        )
+
+    def test_shared_resource_id(self):
+        patterns = [PREFIX + "instance/i-2", PREFIX + "instance/i-2|State"]
+        results = list(skew.scan_many(patterns, check_regions=False))
+        # the resource id is pushed down
+        self.assertEqual(self.calls, [(PREFIX + "instance/i-2", "i-2")])
+        self.assertEqual([(r.pattern, r.data) for r in results], [(patterns[0], None), (patterns[1], "running")])
@@ -0,0 +1,22 @@
+import unittest
+
+from skew.boto.utility import get_botocore_session, get_session, get_shared_loader
+
+CREDENTIALS = {"aws_access_key_id": "AKIDEXAMPLE", "aws_secret_access_key": "secret"}
+
+
+class TestSharedLoader(unittest.TestCase):
+    def test_sessions_share_loader(self):
+        loader = get_shared_loader()
+        self.assertIs(get_botocore_session().get_component("data_loader"), loader)
+        sessions = [get_session(region_name="us-east-1", aws_creds=CREDENTIALS) for _ in range(3)]
+        for session in sessions:
+            self.assertIs(session._session.get_component("data_loader"), loader)
+        # boto3 data path is added once
+        self.assertEqual(len(loader.search_paths), len(set(loader.search_paths)))
+
+    def test_client(self):
+        session = get_session(region_name="eu-west-1", aws_creds=CREDENTIALS)
+        client = session.client("ec2")
+        self.assertEqual(client.meta.region_name, "eu-west-1")
+        self.assertEqual(session.get_credentials().access_key, "AKIDEXAMPLE")
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from skew.cli import ResourceWriter
+from skew.diff import ADDED, CHANGED, REMOVED, diff_snapshots
+from skew.store import ObjectStore, SnapshotStore, read_manifest
+
+ARN = "arn:aws:ec2:us-east-1:123456789012:instance/i-{:04d}"
+
+
+def fake_resource(index, value):
+    data = {"InstanceId": f"i-{index:04d}", "Value": value}
+    resource = mock.Mock(arn=ARN.format(index))
+    text = json.dumps(data)
+    resource.json_dump_hash.return_value = (text, hashlib.md5(text.encode()).hexdigest())
+    return resource
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _scan(self, name, values, workers=2):
+        store = SnapshotStore(self.tmp.name, name=name)
+        writer = ResourceWriter(None, workers=workers, store=store)
+        for index, value in values.items():
+            writer.write(fake_resource(index, value))
+        writer.close()
+        return store
+
+    def test_unchanged_resources_written_once(self):
+        first = self._scan("first", {i: "a" for i in range(20)})
+        self.assertEqual(first.written, 20)
+        second = self._scan("second", {i: "b" if i == 3 else "a" for i in range(20)})
+        self.assertEqual(second.written, 1)
+        entries = list(read_manifest(second.manifest_path))
+        self.assertEqual([arn for arn, _ in entries], [ARN.format(i) for i in range(20)])
+        self.assertEqual(ObjectStore(self.tmp.name).get(entries[3][1]), {"InstanceId": "i-0003", "Value": "b"})
+
+    def test_diff_manifests(self):
+        first = self._scan("first", {1: "a", 2: "a", 3: "a"})
+        second = self._scan("second", {2: "a", 3: "b", 4: "a"}, workers=0)
+        with mock.patch.object(ObjectStore, "get", wraps=ObjectStore(self.tmp.name).get) as get:
+            changes = list(diff_snapshots(first.manifest_path, second.manifest_path))
+        self.assertEqual(
+            [(c.kind, c.arn) for c in changes],
+            [(REMOVED, ARN.format(1)), (CHANGED, ARN.format(3)), (ADDED, ARN.format(4))],
+        )
+        self.assertEqual(changes[1].fields[0].path, "Value")
+        # objects are only read for changed resources
+        self.assertEqual(get.call_count, 2)
+
+    def test_existing_object(self):
+        objects = ObjectStore(self.tmp.name)
+        self.assertTrue(objects.put("ab" * 16, "{}"))
+        self.assertFalse(objects.put("ab" * 16, "{}"))
+        self.assertFalse(ObjectStore(self.tmp.name).put("ab" * 16, "{}"))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "objects", "ab", "ab" * 16 + ".json")))
+
+    def test_file_mode(self):
+        with mock.patch("skew.store._UMASK", 0o022):
+            ObjectStore(self.tmp.name).put("ab" * 16, "{}")
+            store = self._scan("first", {1: "a"})
+        for path in (os.path.join(self.tmp.name, "objects", "ab", "ab" * 16 + ".json"), store.manifest_path):
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o644)
@@ -0,0 +1,157 @@
+import unittest
+
+import mock
+from botocore.exceptions import ClientError
+
+from skew.resources.aws import AWSResource
+from skew.resources.tag_index import tag_index_filters, tagging_resource_type, tagging_service
+
+TAGGED = [
+    {"ResourceARN": "arn:aws:ec2:us-east-1:123456789012:instance/i-1", "Tags": [{"Key": "team", "Value": "payments"}]},
+    {"ResourceARN": "arn:aws:ec2:us-east-1:123456789012:instance/i-2", "Tags": [{"Key": "team", "Value": "payroll"}]},
+    {"ResourceARN": "arn:aws:ec2:us-east-1:123456789012:volume/vol-1", "Tags": [{"Key": "team", "Value": "payments"}]},
+]
+
+
+class FakeClient(object):
+    service_name = "ec2"
+    region_name = "us-east-1"
+    account_id = "123456789012"
+
+    def __init__(self):
+        self.calls = []
+        self.tagged = TAGGED
+
+    def call(self, op_name, query=None, **kwargs):
+        self.calls.append((op_name, kwargs))
+        if op_name == "get_resources":
+            return self.tagged
+        ids = kwargs.get("InstanceIds", ["i-1", "i-2", "i-3"])
+        if "i-gone" in ids:
+            error = {"Error": {"Code": "InvalidInstanceID.NotFound", "Message": "i-gone does not exist"}}
+            raise ClientError(error, op_name)
+        return [{"InstanceId": i} for i in ids]
+
+
+class Instance(AWSResource):
+    client = None
+
+    class Meta(object):
+        service = "ec2"
+        type = "instance"
+        enum_spec = ("describe_instances", "Reservations[].Instances[]", None)
+        id = "InstanceId"
+        filter_name = "InstanceIds"
+        filter_type = "list"
+
+    @classmethod
+    def get_awsclient(cls, region_name, account_id, **kwargs):
+        return cls.client
+
+
+class UnfilteredInstance(Instance):
+    class Meta(Instance.Meta):
+        filter_name = None
+
+
+class ClassicLoadBalancer(Instance):
+    class Meta(Instance.Meta):
+        service = "elb"
+        type = "loadbalancer"
+
+
+class LoadBalancerV2(Instance):
+    class Meta(Instance.Meta):
+        service = "elbv2"
+        type = "loadbalancer"
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.client = Instance.client = FakeClient()
+        self.arn = mock.Mock(query=None)
+        patcher = mock.patch("skew.resources.tag_index.get_awsclient", return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tag_index_filters(self):
+        self.assertEqual(
+            tag_index_filters({"team": "payments", "env": ["prod", "dev"], "owner": None, "app": "web*"}),
+            [
+                {"Key": "team", "Values": ["payments"]},
+                {"Key": "env", "Values": ["prod", "dev"]},
+                {"Key": "owner"},
+                {"Key": "app"},
+            ],
+        )
+
+    def test_tagging_service(self):
+        self.assertEqual(tagging_service("elbv2"), "elasticloadbalancing")
+        self.assertEqual(tagging_service("ec2"), "ec2")
+
+    def test_tagging_resource_type(self):
+        self.assertEqual(tagging_resource_type("ec2", "instance"), "ec2:instance")
+        self.assertEqual(tagging_resource_type("efs", "filesystem"), "elasticfilesystem:file-system")
+        self.assertEqual(tagging_resource_type("elbv2", "loadbalancer"), "elasticloadbalancing:loadbalancer")
+        self.assertEqual(tagging_resource_type("sns", "topic"), "sns")
+
+    def test_enumerate_by_ids(self):
+        resources = list(
+            Instance.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "payments"})
+        )
+        self.assertEqual([r.id for r in resources], ["i-1"])
+        self.assertEqual(self.client.calls[0][1]["ResourceTypeFilters"], ["ec2:instance"])
+        self.assertEqual(self.client.calls[1], ("describe_instances", {"InstanceIds": ["i-1"]}))
+
+    def test_enumerate_and_select(self):
+        resources = list(
+            UnfilteredInstance.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "pay*"})
+        )
+        self.assertEqual([r.id for r in resources], ["i-1", "i-2"])
+        self.assertEqual(self.client.calls[1], ("describe_instances", {}))
+
+    def test_nothing_tagged(self):
+        resources = list(
+            Instance.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "other"})
+        )
+        self.assertEqual(resources, [])
+        self.assertEqual(len(self.client.calls), 1)
+
+    def test_enumerate_by_ids_not_found(self):
+        gone = {"ResourceARN": "arn:aws:ec2:us-east-1:123456789012:instance/i-gone", "Tags": TAGGED[0]["Tags"]}
+        self.client.tagged = TAGGED + [gone]
+        resources = list(
+            Instance.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "payments"})
+        )
+        self.assertEqual([r.id for r in resources], ["i-1"])
+        self.assertEqual(
+            self.client.calls[1:],
+            [
+                ("describe_instances", {"InstanceIds": ["i-1", "i-gone"]}),
+                ("describe_instances", {"InstanceIds": ["i-1"]}),
+                ("describe_instances", {"InstanceIds": ["i-gone"]}),
+            ],
+        )
+
+    def test_untyped_arn(self):
+        untyped = {"ResourceARN": "arn:aws:ec2:us-east-1:123456789012:i-3", "Tags": TAGGED[0]["Tags"]}
+        self.client.tagged = TAGGED + [untyped]
+        resources = list(
+            Instance.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "payments"})
+        )
+        self.assertEqual([r.id for r in resources], ["i-1"])
+
+    def test_load_balancers(self):
+        # classic and application load balancers have the same arn type
+        arn = "arn:aws:elasticloadbalancing:us-east-1:123456789012:"
+        self.client.tagged = [
+            {"ResourceARN": arn + resource, "Tags": TAGGED[0]["Tags"]}
+            for resource in ("loadbalancer/i-1", "loadbalancer/app/i-2/50dc6c495c0c9188")
+        ]
+        for cls, ids in ((ClassicLoadBalancer, ["i-1"]), (LoadBalancerV2, ["i-2"])):
+            self.client.calls = []
+            resources = list(
+                cls.enumerate_tagged(self.arn, "us-east-1", "123456789012", "*", tags={"team": "payments"})
+            )
+            self.assertEqual([r.id for r in resources], ids)
+            self.assertEqual(self.client.calls[0][1]["ResourceTypeFilters"], ["elasticloadbalancing:loadbalancer"])
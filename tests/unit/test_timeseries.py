@@ -0,0 +1,72 @@
+import datetime
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from skew.resources.aws import MetricData
+
+
+def _datapoint(minute, average, maximum=None):
+    data = {
+        "Timestamp": datetime.datetime(2020, 1, 1, 0, minute, tzinfo=datetime.timezone.utc),
+        "Average": average,
+        "Unit": "Percent",
+    }
+    if maximum is not None:
+        data["Maximum"] = maximum
+    return data
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMetricTimeSeries(unittest.TestCase):
+    def setUp(self):
+        # CloudWatch does not return datapoints in order
+        self.data = MetricData(
+            [_datapoint(3, 30.0, 35.0), _datapoint(0, 0.0, 5.0), _datapoint(1, 10.0, 15.0), _datapoint(5, 50.0, 55.0)],
+            60,
+        )
+
+    def test_from_datapoints(self):
+        series = self.data.to_timeseries()
+        self.assertEqual(len(series), 4)
+        self.assertEqual(series.statistics, ["Average", "Maximum"])
+        self.assertEqual(series.unit, "Percent")
+        self.assertEqual(series["Average"].tolist(), [0.0, 10.0, 30.0, 50.0])
+        self.assertTrue(np.all(np.diff(series.epochs) > 0))
+
+    def test_iso_timestamps(self):
+        series = MetricData([{"Timestamp": "2014-09-29T14:04:00Z", "Average": 0.134}], 60).to_timeseries()
+        self.assertEqual(str(series.timestamps[0]), "2014-09-29T14:04:00")
+
+    def test_resample(self):
+        series = self.data.to_timeseries().resample(120)
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series["Average"].tolist(), [5.0, 30.0, 50.0])
+        self.assertEqual(series["Maximum"].tolist(), [15.0, 35.0, 55.0])
+        self.assertEqual(series.resample(120, how="sum")["Average"].tolist(), [5.0, 30.0, 50.0])
+
+    def test_fill_gaps(self):
+        series = self.data.to_timeseries()
+        self.assertTrue(np.isnan(series.fill_gaps()["Average"][2]))
+        self.assertEqual(series.fill_gaps(method="value")["Average"].tolist(), [0.0, 10.0, 0.0, 30.0, 0.0, 50.0])
+        self.assertEqual(series.fill_gaps(method="ffill")["Average"].tolist(), [0.0, 10.0, 10.0, 30.0, 30.0, 50.0])
+        self.assertEqual(
+            series.fill_gaps(method="interpolate")["Average"].tolist(), [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+        )
+
+    def test_percentile(self):
+        series = self.data.to_timeseries()
+        self.assertEqual(series.percentile(50), 20.0)
+        self.assertEqual(series.percentile(100, statistic="Maximum"), 55.0)
+
+    def test_stack(self):
+        from skew.metrics.timeseries import stack
+
+        other = MetricData([_datapoint(2, 1.0)], 60).to_timeseries()
+        timestamps, matrix = stack([self.data.to_timeseries(), other], method="value")
+        self.assertEqual(matrix.shape, (2, 6))
+        self.assertEqual(len(timestamps), 6)
+        self.assertEqual(matrix[1].tolist(), [0.0, 0.0, 1.0, 0.0, 0.0, 0.0])
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 
 
@@ -6,3 +9,12 @@ class TestVersion(unittest.TestCase):
         from skew import __version__
 
         self.assertIsNotNone(__version__)
+
+    def test_lazy_import(self):
+        # a fresh interpreter: importing skew does not load boto3, yaml nor resource classes
+        statement = "import sys, skew; print(' '.join(m for m in ('boto3', 'yaml', 'skew.arn') if m in sys.modules))"
+        import skew
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(skew.__file__)))
+        output = subprocess.check_output([sys.executable, "-c", statement], cwd=root)
+        self.assertEqual(output.decode().strip(), "")